@@ -0,0 +1,57 @@
+# app/views/__init__.py
+"""
+Uma página por módulo, importada só quando é aberta pela primeira vez no
+processo: quem está no Kanban não paga o import do plotly nem do calendário.
+O tempo da primeira importação de cada página vai para as métricas (kind='import').
+"""
+import importlib
+import sys
+import time
+import streamlit as st
+from utils import metrics
+
+# (rótulo do menu, ícone bootstrap, módulo em app/views)
+PAGES = [
+    ("Dashboard Executivo", "speedometer2", "dashboard"),
+    ("Novo projeto", "rocket-takeoff", "new_project"),
+    ("Projetos Ativos", "folder-fill", "projects"),
+    ("Tarefas", "list-check", "tasks"),
+    ("Cronograma (Gantt)", "bar-chart-line", "gantt"),
+    ("Carga da Equipe", "people-fill", "workload"),
+    ("Riscos", "exclamation-triangle", "risks"),
+    ("Docs & Gaps", "folder2-open", "docs"),
+    ("Agenda / Calendário", "calendar-event", "agenda"),
+    ("Histórico / Arquivados", "archive", "archive"),
+    ("Config & Export", "gear-wide-connected", "config"),
+]
+_MODULES = {label: module for label, _, module in PAGES}
+
+def load_page(label):
+    """Módulo da página (com render(ctx)); a primeira importação é medida"""
+    name = f"{__name__}.{_MODULES[label]}"
+    module = sys.modules.get(name)
+    if module is None:
+        t0 = time.perf_counter()
+        module = importlib.import_module(name)
+        metrics.record("import", name, time.perf_counter() - t0)
+    return module
+
+class PageContext:
+    """Dados carregados no início de todo rerun e compartilhados pelas páginas"""
+    def __init__(self, df_active, areas, gaps, index):
+        self.df_active = df_active
+        self.areas = areas
+        self.gaps = gaps
+        self.index = index
+        self.projects_at_risk = df_active[df_active['status'] == 'Em Risco']
+
+    def show_risk_alert(self, project_id):
+        info = self.index.get(project_id)
+        if not info: return
+        if info['status'] == 'Em Risco':
+            st.error("🔥 **ALERTA DE STATUS:** Projeto em risco!", icon="🔥")
+        if info['gaps']:
+            st.error(f"⛔ **PROJETO TRAVADO (GAP):** {info['gaps'][0]}", icon="🛑")
+        high = info['risks'].get('Alta', 0)
+        if high:
+            st.warning(f"⚠️ {high} risco(s) com probabilidade **Alta** cadastrados.", icon="🎯")
@@ -0,0 +1,89 @@
+# app/views/agenda.py
+"""Agenda: eventos da janela visível do calendário."""
+import streamlit as st
+from datetime import date, timedelta
+from streamlit_calendar import calendar
+from utils import db, logic, metrics
+
+def render(ctx):
+    st.title("📆 Agenda de Projetos")
+
+    cal_colors = {"Em andamento": "#3B82F6", "Em Risco": "#EF4444", "Concluído": "#10B981", "Backlog": "#6B7280"}
+
+    today = date.today()
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    # Janela visível do calendário (atualizada pelo callback datesSet ao navegar)
+    if 'agenda_view' not in st.session_state:
+        st.session_state['agenda_view'] = {"start": month_start.isoformat(), "end": next_month.isoformat(),
+                                           "current": month_start.isoformat(), "type": "dayGridMonth"}
+    view = st.session_state['agenda_view']
+
+    # Indicadores do mês atual: mesma consulta por janela (cacheada)
+    df_month = db.load_calendar_events(month_start, next_month, include_tasks=False)
+    m_start = df_month['start_date'].dt.date
+    m_end = df_month['end_date'].dt.date
+
+    m1, m2, m3 = st.columns(3)
+    with m1: st.metric("📅 Mês Atual", today.strftime("%B / %Y"))
+    with m2: st.metric("🚀 Inícios este mês", int(((m_start >= month_start) & (m_start < next_month)).sum()))
+    with m3: st.metric("🏁 Entregas este mês", int((m_end < next_month).sum()), delta_color="inverse")
+
+    st.divider()
+
+    col_cal, col_list = st.columns([2, 1])
+
+    with col_cal:
+        show_tasks = st.toggle("Mostrar prazos de tarefas", value=True)
+        df_events = db.load_calendar_events(view['start'], view['end'], include_tasks=show_tasks)
+        with metrics.timer("compute", "agenda.events"):
+            events = logic.calendar_events(df_events, cal_colors)
+
+        calendar_options = {
+            "headerToolbar": {"left": "today prev,next", "center": "title", "right": "dayGridMonth,listMonth"},
+            "initialView": view['type'],
+            "initialDate": view['current'],
+            "height": 550
+        }
+        state = calendar(events=events, options=calendar_options, callbacks=["datesSet"], key="agenda_calendar")
+        dates_set = (state or {}).get("datesSet") if isinstance(state, dict) else None
+        if dates_set:
+            new_view = {
+                "start": str(dates_set.get("start", view['start']))[:10],
+                "end": str(dates_set.get("end", view['end']))[:10],
+                "current": str(dates_set.get("view", {}).get("currentStart", dates_set.get("start", view['current'])))[:10],
+                "type": dates_set.get("view", {}).get("type", view['type']),
+            }
+            if new_view != view:
+                # Navegou: busca só os eventos da nova janela
+                st.session_state['agenda_view'] = new_view
+                st.rerun()
+        if len(df_events) >= db.MAX_CALENDAR_EVENTS:
+            st.caption(f"Mostrando os primeiros {db.MAX_CALENDAR_EVENTS} eventos do período.")
+        st.caption("Legenda: 🔵 Em andamento | 🔴 Em Risco | 🟢 Concluído | ⚫ Backlog | 🟣 Prazo de tarefa")
+
+    with col_list:
+        st.subheader("🔔 Próximas Entregas")
+        upcoming = ctx.df_active[ctx.df_active['status'] != 'Concluído'].sort_values('end_date').head(5)
+
+        if not upcoming.empty:
+            for _, proj in upcoming.iterrows():
+                try:
+                    ddate = proj['end_date'].date()
+                    days_left = (ddate - today).days
+                except:
+                    days_left = 0
+
+                if days_left < 0: icon="🚨"; msg=f"Atrasado há {abs(days_left)} dias"; bg="#FEF2F2"
+                elif days_left <= 7: icon="🔥"; msg=f"Vence em {days_left} dias"; bg="#FFF7ED"
+                else: icon="📅"; msg=f"Faltam {days_left} dias"; bg="#F3F4F6"
+
+                st.markdown(f"""
+                <div style='background-color: {bg}; padding: 12px; border-radius: 8px; margin-bottom: 10px; border: 1px solid #E5E7EB;'>
+                    <div style='font-weight: bold; color: #1F2937; font-size: 14px;'>{icon} {proj['name']}</div>
+                    <div style='font-size: 12px; color: #6B7280; margin-top: 4px;'>👤 Gerente: {proj['manager']}</div>
+                    <div style='font-size: 13px; font-weight: 600; color: #374151; margin-top: 6px;'>{msg} <br><span style='font-weight:400'>({logic.fmt_date(proj['end_date'])})</span></div>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.info("Nenhuma entrega próxima encontrada.")
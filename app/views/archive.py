@@ -0,0 +1,26 @@
+# app/views/archive.py
+"""Projetos arquivados."""
+import streamlit as st
+from utils import db, logic
+from app.views.common import fragment, local_rows, drop_rows
+
+ARCHIVE_TABLES = ("projects",)
+
+def _restore(project_id):
+    written = db.execute_command("UPDATE projects SET archived = 0 WHERE id = ?", (project_id,))
+    drop_rows("archived_rows", ARCHIVE_TABLES, written, [project_id])
+
+@fragment
+def render_archived():
+    df_archived = local_rows("archived_rows", None, ARCHIVE_TABLES, db.load_archived_projects)
+    if df_archived.empty: st.info("Nada arquivado.")
+    else:
+        for _, row in df_archived.iterrows():
+            with st.expander(f"{row['name']} (Fim: {logic.fmt_date(row['end_date'])})"):
+                st.write(f"**Gerente:** {row['manager']}")
+                st.write(f"**Resultados:** {row['results_text']}")
+                st.button("Restaurar", key=f"rest_{row['id']}", on_click=_restore, args=(row['id'],))
+
+def render(ctx):
+    st.title("🏛️ Arquivo Morto")
+    render_archived()
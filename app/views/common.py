@@ -0,0 +1,70 @@
+# app/views/common.py
+"""Constantes, cálculos cacheados e fragmentos compartilhados entre páginas."""
+import streamlit as st
+from utils import db, schedule
+
+# Avanço padrão ao mover uma tarefa no Kanban
+KANBAN_PROGRESS = {"A fazer": 0, "Fazendo": 10, "Bloqueado": 50, "Feito": 100}
+
+# Mapa de Cores
+COLOR_MAP = {
+    "Concluído": "#22C55E", "Feito": "#22C55E", "🟢 Saudável": "#22C55E",
+    "Em andamento": "#F59E0B", "Fazendo": "#3B82F6", "🟡 Atenção": "#F59E0B",
+    "Em Risco": "#EF4444", "Bloqueado": "#EF4444", "🔴 Crítico": "#EF4444",
+    "Backlog": "#9CA3AF", "A fazer": "#9CA3AF", "Cancelado": "#4B5563"
+}
+
+def load_schedule(**scope):
+    """db.load_schedule(**scope) ou None (com o erro na tela) se houver ciclo"""
+    try:
+        return db.load_schedule(**scope)
+    except schedule.CycleError as e:
+        st.error(f"Cronograma previsto indisponível: {e}")
+        return None
+
+@st.cache_resource(show_spinner=False, max_entries=4, ttl=300)
+def project_schedule(version, with_dependencies=False):
+    """
+    Caminho crítico das tarefas ativas, uma vez por versão dos dados (None se
+    houver ciclo). `with_dependencies`: só os projetos que têm dependências.
+    """
+    return load_schedule(with_dependencies=with_dependencies)
+
+# =========================================================
+# FRAGMENTOS E CÓPIA LOCAL DAS LINHAS
+# =========================================================
+# Uma área decorada com @fragment reexecuta sozinha quando um widget dela é
+# usado: mover um card não recarrega o boot, os gráficos nem o resto da página.
+# As ações usam on_click (rodam antes do rerun do fragmento) em vez de st.rerun().
+# Sem suporte (Streamlit < 1.33) a função roda normalmente e cada clique é um rerun completo.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+def local_rows(key, ident, tables, loader):
+    """
+    Linhas exibidas por um fragmento, guardadas na sessão. Só consulta o banco
+    quando muda o alvo (`ident`, ex: o projeto) ou a versão das `tables`
+    (escrita de outra sessão/página). Um slot por `key`.
+    """
+    version = db.data_version(*tables)
+    slot = st.session_state.get(key)
+    if slot is None or slot[0] != ident or slot[1] != version:
+        slot = st.session_state[key] = (ident, version, loader())
+    return slot[2]
+
+def patch_rows(key, tables, written, update):
+    """
+    Depois de uma escrita, aplica `update(df) -> df` à cópia local e a marca
+    com a versão atual: o próximo rerun não reconsulta. `written` = retorno de
+    execute_command; se a escrita falhou (None) ou não afetou nenhuma linha, a
+    cópia é descartada e o próximo rerun relê do banco.
+    """
+    slot = st.session_state.get(key)
+    if slot is None:
+        return
+    if not written:
+        del st.session_state[key]
+        return
+    st.session_state[key] = (slot[0], db.data_version(*tables), update(slot[2]))
+
+def drop_rows(key, tables, written, ids):
+    patch_rows(key, tables, written, lambda df: df[~df['id'].isin(ids)])
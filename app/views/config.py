@@ -0,0 +1,137 @@
+# app/views/config.py
+"""Configurações: equipe, áreas, importação/exportação, diagnóstico e reset."""
+import streamlit as st
+import pandas as pd
+import os
+from utils import db, bulk, metrics
+from app.views.common import fragment, local_rows, patch_rows
+
+TEAM_TABLES = ("team_members",)
+AREA_TABLES = ("sponsors",)
+
+def _delete_member(name):
+    written = db.execute_command("DELETE FROM team_members WHERE name=?", (name,))
+    patch_rows("team_rows", TEAM_TABLES, written, lambda df: df[df['name'] != name])
+
+def _add_area():
+    name = st.session_state["new_area"]
+    if name:
+        written = db.execute_command("INSERT INTO sponsors (name) VALUES (?)", (name,))
+        patch_rows("area_rows", AREA_TABLES, written, lambda areas: sorted(areas + [name]))
+        if written:
+            st.session_state["new_area"] = ""
+
+@fragment
+def render_team(areas):
+    st.subheader("Equipe")
+    with st.form("add_member", clear_on_submit=True):
+        c1, c2 = st.columns(2)
+        nome = c1.text_input("Nome")
+        cargo = c1.text_input("Cargo")
+        area = c2.selectbox("Área", areas)
+        email = c2.text_input("Email")
+        cap = c1.number_input("Capacidade semanal (esforço)", min_value=0, value=40)
+        if st.form_submit_button("Cadastrar"):
+            if nome:
+                if db.execute_command("INSERT INTO team_members (name, role, area, email, phone, weekly_capacity) VALUES (?,?,?,?,?,?)", (nome, cargo, area, email, "", int(cap))) is not None:
+                    st.success("Cadastrado!")
+
+    st.divider()
+    # Depois de um cadastro a versão mudou: relê só a equipe
+    df_team = local_rows("team_rows", None, TEAM_TABLES, db.load_team)
+    if not df_team.empty:
+        st.dataframe(df_team, hide_index=True)
+        p_del = st.selectbox("Excluir Membro", df_team['name'])
+        st.button("Apagar Membro", on_click=_delete_member, args=(p_del,))
+
+@fragment
+def render_areas():
+    st.subheader("Áreas")
+    areas = local_rows("area_rows", None, AREA_TABLES, db.load_sponsors)
+    st.write(", ".join(areas or ["Geral"]))
+    st.text_input("Nova Área", key="new_area")
+    st.button("Adicionar Área", on_click=_add_area)
+
+@fragment
+def render_diagnostics():
+    st.subheader("Diagnóstico de desempenho (este processo)")
+    on = st.toggle("Coletar métricas", value=metrics.enabled())
+    if on != metrics.enabled():
+        metrics.set_enabled(on)
+
+    pool, qcache = db.pool_stats(), db.get_query_cache().stats()
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Conexões em uso", f"{pool.get('in_use', 0)} / {pool.get('maxconn', 0)}")
+    k2.metric("Pico de uso", pool.get('peak_in_use', 0))
+    k3.metric("Esperas / timeouts", f"{pool.get('waits', 0)} / {pool.get('timeouts', 0)}")
+    k4.metric("Cache (acerto)", f"{qcache['hit_rate']:.0%}", f"{qcache['entries']} entradas", delta_color="off")
+    if not db.is_sqlite():
+        prep = db.get_statement_registry().stats()
+        st.caption(f"Statements preparados: {prep['prepares']} PREPARE · {prep['prepared_executes']} EXECUTE · {prep['unpreparable']} não preparáveis · {prep['lost']} perdidos no backend (limite: {prep['threshold']} execuções; 0 = desligado)")
+
+    diag = pd.DataFrame(metrics.snapshot())
+    if diag.empty:
+        st.info("Nenhuma métrica coletada ainda.")
+    else:
+        for kind, title in [("page", "Páginas"), ("compute", "Cálculos (pandas)"), ("query", "Consultas SQL"), ("import", "Importações (primeira visita)")]:
+            part = diag[diag['kind'] == kind].drop(columns='kind')
+            if part.empty: continue
+            st.markdown(f"**{title}**")
+            st.dataframe(part, hide_index=True, use_container_width=True,
+                         column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ['p50_ms', 'p95_ms', 'p99_ms']})
+
+    d1, d2 = st.columns(2)
+    d1.download_button("⬇️ Exportar (Prometheus)", metrics.prometheus_text(), file_name="metrics.prom", mime="text/plain")
+    d2.button("Zerar métricas", on_click=metrics.reset)
+
+def render(ctx):
+    st.title("⚙️ Configurações Gerais")
+    tab_team, tab_areas, tab_bulk, tab_diag, tab_db = st.tabs(["👥 Equipe", "🏢 Áreas", "📦 Importar / Exportar", "📈 Diagnostics", "⚠️ Sistema"])
+
+    with tab_team:
+        render_team(ctx.areas)
+
+    with tab_areas:
+        render_areas()
+
+    with tab_bulk:
+        st.subheader("Importação em massa")
+        st.caption("CSV ou Parquet. Tarefas e riscos usam a coluna 'project' (nome ou código do projeto) ou 'project_id'. Se houver qualquer erro, nada é gravado.")
+        ent = st.selectbox("Tabela de destino", list(bulk.ENTITIES.keys()), format_func=lambda k: bulk.ENTITIES[k]['label'])
+        st.caption("Colunas aceitas: " + ", ".join(['project'] + bulk.ENTITIES[ent]['columns'] if ent != 'projects' else bulk.ENTITIES[ent]['columns']))
+        up = st.file_uploader("Arquivo", type=["csv", "parquet"])
+        b1, b2 = st.columns(2)
+        validate_only = b1.button("Validar")
+        do_import = b2.button("Importar", type="primary")
+        if up is not None and (validate_only or do_import):
+            try:
+                res = bulk.import_file(up, up.name, ent, dry_run=validate_only)
+                if res['errors']:
+                    st.error(f"{len(res['errors'])} erro(s) encontrados. Nada foi importado.")
+                    st.code("\n".join(res['errors']))
+                elif res['imported']:
+                    st.success(f"✅ {res['rows']} linhas importadas!")
+                else:
+                    st.success(f"✅ {res['rows']} linhas válidas.")
+            except Exception as e:
+                st.error(f"Erro na importação: {e}")
+
+        st.divider()
+        st.subheader("Exportar portfólio")
+        if st.button("Gerar arquivo (ZIP com um CSV por tabela)"):
+            try:
+                st.download_button("⬇️ Baixar portfolio.zip", bulk.export_portfolio(), file_name="portfolio.zip", mime="application/zip")
+            except Exception as e:
+                st.error(f"Erro na exportação: {e}")
+
+    with tab_diag:
+        render_diagnostics()
+
+    with tab_db:
+        st.subheader("Reset")
+        st.warning("Clique aqui para apagar o banco antigo e corrigir o erro de 'coluna faltando'.")
+        if st.button("RESETAR BANCO DE DADOS (Zerar Tudo)"):
+            if os.path.exists("project_management_v2.db"): 
+                os.remove("project_management_v2.db")
+                for key in list(st.session_state.keys()): del st.session_state[key]
+                st.rerun()
@@ -0,0 +1,84 @@
+# app/views/dashboard.py
+"""Dashboard executivo: KPIs do snapshot project_health, saúde e eficiência."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from utils import db, logic, metrics, styles
+from app.views.common import COLOR_MAP, project_schedule
+
+def render(ctx):
+    if not ctx.gaps.empty:
+        with st.container(border=True):
+            st.markdown("### ⛔ Painel de Impeditivos (GAPs)")
+            for _, row in ctx.gaps.iterrows():
+                p_name = ctx.index[row['project_id']]['name']
+                st.error(f"**PROJETO:** {p_name} | 🛑 **TRAVA:** {row['description']}", icon="🚫")
+        st.divider()
+
+    if not ctx.projects_at_risk.empty:
+        st.warning(f"🔥 Existem {len(ctx.projects_at_risk)} projetos 'Em Risco'.")
+
+    st.title("📊 Dashboard Executivo")
+
+    # Agregados calculados no banco: uma linha por projeto ativo
+    df_kpis = db.load_project_kpis()
+    df_view = df_kpis.rename(columns={'project_id': 'id'})
+    if not df_view.empty and 'sponsor' in df_view.columns:
+        df_view['sponsor'] = df_view['sponsor'].fillna("Geral").replace("", "Geral")
+    late_count = int(df_view['late_tasks'].sum()) if not df_view.empty else 0
+
+    col_f1, col_f2 = st.columns(2)
+    with col_f1:
+        existing_sponsors = list(df_view['sponsor'].unique()) if 'sponsor' in df_view.columns else []
+        combined_options = sorted(list(set(ctx.areas + existing_sponsors)))
+        options = ["Todos"] + combined_options
+        f_sponsor = st.selectbox("Filtrar por Área", options)
+
+    if f_sponsor != "Todos":
+        df_view = df_view[df_view['sponsor'] == f_sponsor]
+
+    total = len(df_view)
+    if not df_view.empty:
+        with metrics.timer("compute", "dashboard.health"):
+            # Sem dependências nada empurra as tarefas (vencidas já estão em
+            # late_tasks): o CPM roda só nos projetos que têm alguma
+            sched = project_schedule(db.data_version("projects", "tasks", "task_dependencies"), True)
+            projected = df_view['id'].map(sched.project_finish()) if sched is not None else None
+            df_view['health'] = logic.health_from_kpis(df_view, projected)
+        crit = len(df_view[df_view['health'].str.contains("Crítico")])
+        ok = len(df_view[df_view['health'].str.contains("Saudável")])
+    else: crit = 0; ok = 0
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1: styles.card_component("Projetos Ativos", total, "Em execução", "neutral")
+    with c2: styles.card_component("Projetos Críticos", crit, "Atenção Imediata", "danger" if crit > 0 else "success")
+    with c3: styles.card_component("Tarefas Atrasadas", late_count, "Impactando Prazos", "danger" if late_count > 0 else "success")
+    with c4: styles.card_component("Saudáveis", ok, "Dentro do previsto", "success")
+
+    g1, g2 = st.columns([1, 2])
+    with g1:
+        st.markdown('<div class="magalog-card">', unsafe_allow_html=True)
+        st.subheader("Status")
+        if not df_view.empty:
+            fig = px.pie(df_view, names='status', hole=0.6, color='status', color_discrete_map=COLOR_MAP)
+            fig.update_layout(showlegend=True, legend=dict(orientation="h", y=-0.2), margin=dict(t=0, b=0, l=0, r=0), height=300)
+            st.plotly_chart(fig, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with g2:
+        st.markdown('<div class="magalog-card">', unsafe_allow_html=True)
+        st.subheader("Eficiência: Físico vs Tempo")
+        if not df_view.empty:
+            with metrics.timer("compute", "dashboard.time_pct"):
+                time_pct = logic.time_elapsed_pct(df_view)
+            proj_metrics = {"Nome": df_view['name'], "Avanço Real (%)": df_view['progress'], "Tempo Decorrido (%)": time_pct, "Saúde": df_view['health']}
+
+            df_m = pd.DataFrame(proj_metrics).sort_values('Avanço Real (%)')
+            if not df_m.empty:
+                fig_combo = go.Figure()
+                fig_combo.add_trace(go.Bar(y=df_m['Nome'], x=df_m['Avanço Real (%)'], name='Entrega Real', orientation='h', marker_color=[COLOR_MAP.get(h, "#ccc") for h in df_m['Saúde']], text=df_m['Avanço Real (%)'].apply(lambda x: f"{x:.0f}%"), textposition='auto'))
+                fig_combo.add_trace(go.Scatter(y=df_m['Nome'], x=df_m['Tempo Decorrido (%)'], name='Tempo Gasto', mode='markers', marker=dict(symbol='line-ns-open', size=30, color='#2E2E2E', line=dict(width=4))))
+                fig_combo.update_layout(height=400, xaxis=dict(range=[0, 105]), legend=dict(orientation="h", y=1.1))
+                st.plotly_chart(fig_combo, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,28 @@
+# app/views/docs.py
+"""Documentos e gaps (impeditivos) do projeto."""
+import streamlit as st
+from utils import db
+from app.views.common import fragment, local_rows, drop_rows
+
+NOTE_TABLES = ("project_notes",)
+
+def _remove_note(note_id):
+    written = db.execute_command("DELETE FROM project_notes WHERE id=?", (note_id,))
+    drop_rows("notes_rows", NOTE_TABLES, written, [note_id])
+
+@fragment
+def render_notes(project_id):
+    nv = local_rows("notes_rows", project_id, NOTE_TABLES,
+                    lambda: db.load_notes(project_id, columns=['id', 'category', 'description']))
+    for _, n in nv.iterrows():
+        st.write(f"**{n['category']}**: {n['description']}")
+        st.button("Remover", key=f"dn_{n['id']}", on_click=_remove_note, args=(n['id'],))
+
+def render(ctx):
+    st.title("📂 Docs & Gaps")
+    opts = dict(zip(ctx.df_active['name'], ctx.df_active['id']))
+    if opts:
+        sel_nm = st.selectbox("Projeto:", list(opts.keys()))
+        sel_id = opts[sel_nm]
+        ctx.show_risk_alert(sel_id)
+        render_notes(sel_id)
@@ -0,0 +1,82 @@
+# app/views/gantt.py
+"""Cronograma: uma barra agregada por projeto, expansível até as tarefas."""
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from datetime import date, timedelta
+from utils import db, logic, metrics
+from app.views.common import COLOR_MAP, load_schedule
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=300)
+def gantt_figure(version, start, end, page, expanded):
+    """Figura do Gantt montada uma vez por (versão dos dados, janela, página, expandidos)"""
+    projects = db.load_gantt_projects(start, end, offset=page * db.MAX_GANTT_BARS)
+    tasks = db.load_gantt_tasks(expanded, start, end) if expanded else None
+    with metrics.timer("compute", "gantt.rows"):
+        rows = logic.gantt_rows(projects, tasks)
+    fig = go.Figure()
+    # Caminho crítico só dos projetos desta página (os expandidos estão entre eles);
+    # a figura já é cacheada por versão/janela/página
+    with metrics.timer("compute", "gantt.schedule"):
+        sched = load_schedule(project_ids=projects['project_id'].tolist()) if not projects.empty else None
+    # Um trace por status (cor/legenda), barras horizontais: base = início, x = duração
+    for status, part in rows.groupby('status', sort=False):
+        fig.add_trace(go.Bar(
+            name=status, orientation='h', y=part['key'], base=part['start'],
+            x=(part['end'] - part['start']).dt.total_seconds() * 1000,
+            marker_color=COLOR_MAP.get(status, "#3B82F6"),
+            marker_opacity=part['level'].map({0: 1.0, 1: 0.6}),
+            text=part['progress'].round().astype(int).astype(str) + "%", textposition="inside",
+            customdata=part[['label']].assign(s=part['start'].dt.strftime("%d/%m/%Y"), e=part['end'].dt.strftime("%d/%m/%Y")).to_numpy(),
+            hovertemplate="%{customdata[0]}<br>%{customdata[1]} → %{customdata[2]}<br>%{text}<extra></extra>",
+        ))
+    if sched is not None and not rows.empty:
+        # Término previsto (dependências + tarefas vencidas) quando passa do planejado
+        by_key = pd.concat([
+            sched.project_finish().rename(lambda pid: f"p{pid}"),
+            sched.frame()['projected_end'].rename(lambda tid: f"t{tid}"),
+        ])
+        proj = rows['key'].map(by_key)
+        slip = rows[proj > rows['end']].assign(projected=proj)
+        if not slip.empty:
+            fig.add_trace(go.Scatter(
+                name="Término previsto", mode='markers', y=slip['key'], x=slip['projected'],
+                marker=dict(symbol='diamond', size=10, color="#111827"),
+                customdata=slip['projected'].dt.strftime("%d/%m/%Y"),
+                hovertemplate="Previsto: %{customdata}<extra></extra>",
+            ))
+    fig.update_layout(
+        barmode='overlay', height=max(300, 26 * len(rows) + 120), legend_title_text="Status",
+        xaxis=dict(type='date'),
+        yaxis=dict(autorange='reversed', categoryorder='array', categoryarray=rows['key'].tolist(),
+                   tickmode='array', tickvals=rows['key'].tolist(), ticktext=rows['label'].tolist()),
+    )
+    return fig
+
+def render(ctx):
+    st.title("📅 Gantt")
+    GANTT_WINDOWS = {"3 meses": 90, "6 meses": 182, "12 meses": 365, "Tudo": None}
+    g1, g2 = st.columns([3, 1])
+    win = g1.radio("Janela", list(GANTT_WINDOWS), index=1, horizontal=True)
+    days = GANTT_WINDOWS[win]
+    g_start = (date.today() - timedelta(days=30)).isoformat() if days else None
+    g_end = (date.today() + timedelta(days=days)).isoformat() if days else None
+
+    page = 0
+    gp = db.load_gantt_projects(g_start, g_end)
+    total = int(gp['total'].iloc[0]) if not gp.empty else 0
+    if total > db.MAX_GANTT_BARS:
+        n_pages = -(-total // db.MAX_GANTT_BARS)
+        page = g2.number_input(f"Página (de {n_pages})", min_value=1, max_value=n_pages, value=1) - 1
+        if page:
+            gp = db.load_gantt_projects(g_start, g_end, offset=page * db.MAX_GANTT_BARS)
+
+    if gp.empty:
+        st.info("Nenhum projeto ativo na janela selecionada.")
+    else:
+        names = dict(zip(gp['name'], gp['project_id']))
+        expand = st.multiselect("Expandir projetos (tarefas)", list(names), max_selections=10)
+        expanded = tuple(sorted(int(names[n]) for n in expand))
+        fig = gantt_figure(db.data_version("projects", "tasks", "task_dependencies"), g_start, g_end, page, expanded)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(gp)} de {total} projetos na janela · barra = menor início / maior fim das tarefas, % ponderado pelo esforço")
@@ -0,0 +1,102 @@
+# app/views/new_project.py
+"""Cadastro central: projeto, tarefa, risco, membro e gap/doc."""
+import streamlit as st
+from datetime import date, timedelta
+from utils import db
+
+def render(ctx):
+    st.title("Novo projeto")
+    st.markdown("Crie tudo o que precisa em um só lugar.")
+
+    t_proj, t_task, t_risk, t_memb, t_gap = st.tabs(["🚀 Novo Projeto", "✅ Nova Tarefa", "🎯 Novo Risco", "👥 Novo Membro", "📂 Novo Gap/Doc"])
+
+    # --- PROJETO ---
+    with t_proj:
+        with st.form("nw_p_cent", clear_on_submit=True):
+            st.markdown("**Nome do Projeto**")
+            nm = st.text_input("", label_visibility="collapsed", placeholder="Digite o nome do projeto...")
+
+            st.markdown("**Gerente do Projeto**")
+            mg = st.text_input("", label_visibility="collapsed", placeholder="Quem será o responsável?")
+
+            st.markdown("**Área / Sponsor**")
+            sp = st.selectbox("", ctx.areas, label_visibility="collapsed")
+
+            c1, c2 = st.columns(2)
+            with c1: 
+                st.markdown("**Início**")
+                d1 = st.date_input("", label_visibility="collapsed")
+            with c2: 
+                st.markdown("**Fim**")
+                d2 = st.date_input("", value=date.today()+timedelta(days=30), label_visibility="collapsed")
+
+            # --- NOVO CAMPO: ANOTAÇÕES ---
+            st.markdown("**Anotações / Observações**")
+            obs = st.text_area("", label_visibility="collapsed", height=100, placeholder="Descreva mais detalhes sobre o projeto...")
+
+            st.markdown("") 
+            if st.form_submit_button("Criar Projeto"):
+                if nm:
+                    # Incluído o campo obs (notes)
+                    db.execute_command("INSERT INTO projects (name, manager, sponsor, start_date, end_date, status, date_changes, archived, notes) VALUES (?,?,?,?,?,?,0,0,?)", (nm, mg, sp, d1, d2, "Backlog", obs))
+                    st.success(f"✅ Projeto '{nm}' criado com sucesso!")
+                else: st.warning("Nome obrigatório.")
+
+    # --- TAREFA ---
+    with t_task:
+        if ctx.df_active.empty: st.warning("Crie um projeto antes.")
+        else:
+            with st.form("nw_t_cent", clear_on_submit=True):
+                p_sel = st.selectbox("Projeto", ctx.df_active['name'])
+                tt = st.text_input("Título da Tarefa")
+                ow = st.text_input("Responsável (Dono)")
+                dd = st.date_input("Prazo de Entrega")
+                if st.form_submit_button("Criar Tarefa"):
+                    pid = ctx.df_active[ctx.df_active['name'] == p_sel]['id'].values[0]
+                    if tt:
+                        db.execute_command("INSERT INTO tasks (project_id, title, owner, start_date, end_date, status, progress) VALUES (?,?,?,?,?,?,?)", (int(pid), tt, ow, date.today(), dd, "A fazer", 0))
+                        st.success("✅ Tarefa Criada!")
+                    else: st.warning("Título obrigatório.")
+
+    # --- RISCO ---
+    with t_risk:
+        if ctx.df_active.empty: st.warning("Crie um projeto antes.")
+        else:
+            with st.form("nw_r_cent", clear_on_submit=True):
+                p_sel = st.selectbox("Projeto ", ctx.df_active['name'], key="risc_proj")
+                d = st.text_input("Descrição do Risco")
+                c1, c2 = st.columns(2)
+                p = c1.select_slider("Probabilidade", ["Baixa","Média","Alta"])
+                i = c2.select_slider("Impacto", ["Baixo","Médio","Alto"])
+                pl = st.text_area("Plano de Mitigação")
+                if st.form_submit_button("Criar Risco"):
+                    pid = ctx.df_active[ctx.df_active['name'] == p_sel]['id'].values[0]
+                    db.execute_command("INSERT INTO risks (project_id, description, probability, impact, mitigation_plan) VALUES (?,?,?,?,?)", (int(pid), d, p, i, pl))
+                    st.success("✅ Risco Salvo!")
+
+    # --- MEMBRO ---
+    with t_memb:
+        with st.form("nw_m_cent", clear_on_submit=True):
+            c1, c2 = st.columns(2)
+            nome = c1.text_input("Nome Completo")
+            cargo = c1.text_input("Cargo")
+            area = c2.selectbox("Área", ctx.areas, key="memb_area")
+            email = c2.text_input("Email")
+            if st.form_submit_button("Cadastrar Membro"):
+                if nome:
+                    db.execute_command("INSERT INTO team_members (name, role, area, email, phone) VALUES (?,?,?,?,?)", (nome, cargo, area, email, ""))
+                    st.success(f"✅ {nome} cadastrado!")
+                else: st.warning("Nome obrigatório.")
+
+    # --- GAP ---
+    with t_gap:
+        if ctx.df_active.empty: st.warning("Crie um projeto antes.")
+        else:
+            with st.form("nw_g_cent", clear_on_submit=True):
+                p_sel = st.selectbox("Projeto", ctx.df_active['name'], key="gap_proj")
+                d = st.text_area("Descrição do Gap ou Link")
+                t = st.radio("Tipo", ["Gap (Impeditivo)", "Link/Doc"])
+                if st.form_submit_button("Salvar"):
+                    pid = ctx.df_active[ctx.df_active['name'] == p_sel]['id'].values[0]
+                    db.execute_command("INSERT INTO project_notes (project_id, category, description, created_at) VALUES (?,?,?,?)", (int(pid), t, d, date.today()))
+                    st.success("✅ Salvo com sucesso!")
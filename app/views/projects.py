@@ -0,0 +1,85 @@
+# app/views/projects.py
+"""Lista de projetos ativos e edição (com anotações)."""
+import streamlit as st
+import pandas as pd
+from datetime import date
+from utils import db
+
+def render(ctx):
+    st.title("📁 Projetos em Andamento")
+
+    if not ctx.df_active.empty:
+        d = ctx.df_active.copy()
+        gap_ids = [pid for pid, info in ctx.index.items() if info['gaps']]
+        d['gap_indicador'] = d['id'].isin(gap_ids).map({True: "⛔ TRAVADO", False: "OK"})
+        d['status_icon'] = d['status'].apply(lambda x: "🔥" if x == "Em Risco" else "🟢")
+
+        d['end_date'] = d['end_date'].dt.date
+        d_display = d[['status_icon', 'gap_indicador', 'name', 'manager', 'status', 'end_date']].rename(columns={
+            'status_icon': 'Sinal', 'gap_indicador': 'Impeditivo?', 'name': 'Nome do Projeto',
+            'manager': 'Gerente', 'status': 'Status Atual', 'end_date': 'Entrega'
+        })
+        st.dataframe(d_display, hide_index=True, use_container_width=True)
+        st.caption("Legenda: 🔥 = Risco de Prazo | ⛔ = Travado por Impeditivo (GAP)")
+
+        st.divider()
+        st.markdown("### ✏️ Editar Detalhes")
+
+        sel = st.selectbox("Selecione o Projeto para editar:", ctx.df_active['name'])
+
+        # Registro completo (com anotações) só do projeto em edição
+        curr = db.load_project(ctx.df_active.loc[ctx.df_active['name'] == sel, 'id'].iloc[0]) if sel else None
+
+        if curr is not None:
+            changes_count = curr['date_changes'] if 'date_changes' in curr and pd.notnull(curr['date_changes']) else 0
+
+            with st.form("ed_p_adv"):
+                if changes_count > 0:
+                    st.warning(f"📅 Atenção: A data de entrega já foi alterada **{int(changes_count)}** vezes.", icon="⚠️")
+
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.markdown("**Gerente**")
+                    new_manager = st.text_input("", value=curr['manager'], label_visibility="collapsed")
+
+                    st.markdown("**Status**")
+                    status_options = ["Backlog", "Em andamento", "Em Risco", "Concluído", "Cancelado"]
+                    try:
+                        idx = status_options.index(curr['status'])
+                    except ValueError:
+                        idx = 0 
+                    new_status = st.selectbox("", status_options, index=idx, label_visibility="collapsed")
+
+                with c2:
+                    st.markdown("**Nova Data de Entrega**")
+                    try:
+                        current_date_obj = curr['end_date'].date() if pd.notnull(curr['end_date']) else date.today()
+                    except:
+                        current_date_obj = date.today()
+
+                    new_end_date = st.date_input("", value=current_date_obj, label_visibility="collapsed")
+
+                    st.markdown("")
+                    arq = st.checkbox("Arquivar Projeto", value=bool(curr['archived']))
+
+                # --- NOVO CAMPO: ANOTAÇÕES NA EDIÇÃO ---
+                st.markdown("**Anotações / Observações**")
+                # Recupera o valor atual do banco, se existir
+                curr_notes = curr['notes'] if 'notes' in curr and pd.notnull(curr['notes']) else ""
+                new_obs = st.text_area("", value=curr_notes, label_visibility="collapsed", height=100)
+
+                if st.form_submit_button("💾 Salvar Alterações"):
+                    final_changes = int(changes_count)
+                    if str(new_end_date) != str(current_date_obj):
+                        final_changes += 1
+                        st.toast(f"Data alterada! Contador subiu para {final_changes}.", icon="📈")
+
+                    # Atualiza no banco incluindo as notas
+                    db.execute_command(
+                        "UPDATE projects SET manager=?, end_date=?, status=?, archived=?, date_changes=?, notes=? WHERE id=?", 
+                        (new_manager, new_end_date, new_status, 1 if arq else 0, final_changes, new_obs, int(curr['id']))
+                    )
+                    st.success("Projeto atualizado!")
+                    st.rerun()
+    else:
+        st.info("Nenhum projeto ativo. Vá em 'Novo projeto' para criar um.")
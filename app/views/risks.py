@@ -0,0 +1,53 @@
+# app/views/risks.py
+"""Matriz de riscos 3x3 do portfólio e por projeto."""
+import streamlit as st
+import plotly.graph_objects as go
+from utils import db, logic, metrics
+
+def render_risk_matrix(sponsor=None, project_id=None, key="risk"):
+    """Matriz 3x3 (contagens agregadas no banco) + drill-down da célula escolhida"""
+    counts = db.load_risk_matrix(sponsor=sponsor, project_id=project_id)
+    with metrics.timer("compute", "risks.grid"):
+        grid = logic.risk_grid(counts)
+    if not grid.values.any():
+        st.info("Sem riscos cadastrados.")
+        return
+    # Cor pela severidade (probabilidade x impacto); texto = quantidade de riscos
+    severity = [[p * i for i in (1, 2, 3)] for p in (3, 2, 1)]
+    fig = go.Figure(go.Heatmap(
+        z=severity, x=list(grid.columns), y=list(grid.index), text=grid.values,
+        texttemplate="%{text}", textfont={"size": 20}, showscale=False,
+        colorscale=[[0, "#22C55E"], [0.5, "#F59E0B"], [1, "#EF4444"]],
+        hovertemplate="Probabilidade %{y} × Impacto %{x}<br>%{text} risco(s)<extra></extra>",
+    ))
+    fig.update_layout(title="Matriz de Riscos", height=400, xaxis_title="Impacto", yaxis_title="Probabilidade")
+    st.plotly_chart(fig, use_container_width=True)
+
+    cells = {f"{p} × {i} ({grid.loc[p, i]})": (pl, il)
+             for pl, p in sorted(logic.RISK_PROB_LABELS.items(), reverse=True)
+             for il, i in logic.RISK_IMPACT_LABELS.items() if grid.loc[p, i]}
+    cell = st.selectbox("Detalhar célula (probabilidade × impacto):", list(cells), key=f"{key}_cell")
+    if cell:
+        detail = db.load_risk_cell(*cells[cell], sponsor=sponsor, project_id=project_id)
+        st.dataframe(detail[['name', 'description', 'owner', 'mitigation_plan']], hide_index=True, use_container_width=True,
+                     column_config={"name": "Projeto", "description": "Risco", "owner": "Responsável", "mitigation_plan": "Plano"})
+
+def render(ctx):
+    st.title("🎯 Riscos")
+    tab_port, tab_proj = st.tabs(["🌐 Portfólio", "📁 Por projeto"])
+
+    with tab_port:
+        area = st.selectbox("Área (sponsor):", ["Todas"] + ctx.areas)
+        render_risk_matrix(sponsor=None if area == "Todas" else area, key="port")
+
+    with tab_proj:
+        opts = dict(zip(ctx.df_active['name'], ctx.df_active['id']))
+        if opts:
+            sel_nm = st.selectbox("Projeto:", list(opts.keys()))
+            sel_id = opts[sel_nm]
+            ctx.show_risk_alert(sel_id)
+            rv = db.load_risks(sel_id)
+            if not rv.empty:
+                render_risk_matrix(project_id=sel_id, key="proj")
+                st.dataframe(rv[['description', 'probability', 'impact', 'mitigation_plan']], hide_index=True)
+            else: st.info("Sem riscos cadastrados.")
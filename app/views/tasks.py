@@ -0,0 +1,172 @@
+# app/views/tasks.py
+"""Kanban do projeto, movimentação em lote e dependências/caminho crítico."""
+import streamlit as st
+import pandas as pd
+from datetime import date
+from utils import db, logic, metrics, schedule
+from app.views.common import KANBAN_PROGRESS, fragment, local_rows, patch_rows
+
+TASK_TABLES = ("tasks",)
+
+def _move(task_ids, status, progress):
+    """Grava a movimentação e atualiza os cards da sessão sem reconsultar o projeto"""
+    written = db.move_tasks(task_ids, status, progress)
+    def update(df):
+        df = df.copy()
+        hit = df['id'].isin(task_ids)
+        # status vem categórico do banco: o novo valor pode não estar entre as categorias
+        df['status'] = df['status'].astype(object).where(~hit, status)
+        if progress is not None:
+            df.loc[hit, 'progress'] = progress
+        return df
+    patch_rows("kanban_rows", TASK_TABLES, written, update)
+
+def _move_from_form(task_id):
+    op = st.session_state[f"sel_{task_id}"]
+    status = "Feito" if op == "Concluir" else "Bloqueado" if op == "Bloquear" else "A fazer"
+    _move([task_id], status, 100 if op == "Concluir" else 50 if op == "Bloquear" else 0)
+
+def _move_selected():
+    chosen = st.session_state["bulk_chosen"]
+    if not chosen:
+        st.session_state["bulk_empty"] = True
+        return
+    target = st.session_state["bulk_target"]
+    _move(chosen, target, None if st.session_state["bulk_keep"] else KANBAN_PROGRESS[target])
+
+@fragment
+def render_dependencies(project_id):
+    """Cadastro de dependências, caminho crítico e reprogramação com propagação do deslize"""
+    tasks = db.load_schedule_tasks(project_id)
+    if tasks.empty:
+        st.info("Sem tarefas neste projeto.")
+        return
+    titles = dict(zip(tasks['id'].astype(int), tasks['title']))
+    label = lambda tid: f"#{tid} {titles.get(tid, '?')}"
+
+    # O formulário é tratado antes de ler as dependências: a tabela abaixo já sai atualizada
+    with st.form("add_dep", clear_on_submit=True):
+        d1, d2, d3 = st.columns([2, 2, 1])
+        pred = d1.selectbox("Predecessora (termina antes)", list(titles), format_func=label)
+        succ = d2.selectbox("Sucessora (começa depois)", list(titles), format_func=label)
+        lag = d3.number_input("Folga (dias)", min_value=0, value=0)
+        if st.form_submit_button("Adicionar dependência"):
+            try:
+                db.add_dependency(pred, succ, lag)
+            except ValueError as e:
+                st.error(str(e))
+    deps = db.load_dependencies(project_id)
+
+    try:
+        with metrics.timer("compute", "tasks.schedule"):
+            sched = schedule.Schedule(tasks, deps)
+    except schedule.CycleError as e:
+        st.error(str(e))
+        return
+    plan = sched.frame().join(tasks.set_index('id')[['title', 'owner', 'end_date']])
+    critical = sched.critical_path(project_id)
+    finish = sched.project_finish().get(project_id)
+    st.markdown(f"**Término previsto:** {logic.fmt_date(finish, '%d/%m/%Y')} · **Caminho crítico:** " +
+                (" → ".join(label(t) for t in critical) if critical else "—"))
+    st.dataframe(
+        plan.sort_values(['es', 'slack'])[['title', 'owner', 'es', 'ef', 'end_date', 'slack', 'critical']],
+        use_container_width=True,
+        column_config={"title": "Tarefa", "owner": "Responsável",
+                       "es": st.column_config.DateColumn("Início previsto", format="DD/MM/YYYY"),
+                       "ef": st.column_config.DateColumn("Término previsto", format="DD/MM/YYYY"),
+                       "end_date": st.column_config.DateColumn("Término planejado", format="DD/MM/YYYY"),
+                       "slack": "Folga (dias)", "critical": "Crítica"})
+
+    if not deps.empty:
+        dep_labels = {int(r.id): f"{label(int(r.predecessor_id))} → {label(int(r.successor_id))}" for r in deps.itertuples()}
+        r1, r2 = st.columns([3, 1])
+        dep_del = r1.selectbox("Remover dependência", list(dep_labels), format_func=dep_labels.get)
+        r2.button("Remover", key="dep_del", on_click=db.remove_dependency, args=(dep_del,))
+
+    st.markdown("##### 📅 Reprogramar tarefa")
+    s1, s2 = st.columns([2, 1])
+    moved = s1.selectbox("Tarefa", list(titles), format_func=label, key="resched_task")
+    cur_end = plan.loc[moved, 'end_date']
+    new_end = s2.date_input("Novo término", value=cur_end.date() if pd.notna(cur_end) else date.today(), key="resched_end")
+    # Prévia: propaga o deslize só pelos sucessores afetados
+    changed = sched.shift(moved, end=new_end)
+    shifted = sched.frame().loc[changed, ['es', 'ef']].join(plan[['title', 'es', 'ef']], rsuffix='_old')
+    pushed = shifted[(shifted['es'] > shifted['es_old']) & (shifted.index != moved)]
+    if pushed.empty:
+        st.caption("Nenhuma tarefa dependente é afetada.")
+    else:
+        st.warning(f"{len(pushed)} tarefa(s) dependente(s) seriam empurradas; término previsto do projeto: "
+                   f"{logic.fmt_date(sched.project_finish().get(project_id), '%d/%m/%Y')}")
+        st.dataframe(pushed[['title', 'es_old', 'es', 'ef']], use_container_width=True,
+                     column_config={"title": "Tarefa",
+                                    "es_old": st.column_config.DateColumn("Início atual", format="DD/MM/YYYY"),
+                                    "es": st.column_config.DateColumn("Novo início", format="DD/MM/YYYY"),
+                                    "ef": st.column_config.DateColumn("Novo término", format="DD/MM/YYYY")})
+    # Aplica exatamente a prévia exibida
+    start = tasks.set_index('id').loc[moved, 'start_date']
+    changes = [(moved, start if pd.notna(start) else new_end, new_end)]
+    # Sucessoras mantêm a duração planejada
+    changes += [(tid, row['es'], row['es'] + pd.Timedelta(days=sched.duration[sched.index[tid]] - 1))
+                for tid, row in pushed.iterrows()]
+    st.button("Aplicar reprogramação", key="resched_apply", on_click=db.reschedule_tasks, args=(changes,))
+
+@fragment
+def render_kanban(project_id):
+    """Quadro do projeto: cada ação reexecuta só este fragmento, com os cards da sessão já atualizados"""
+    tv = local_rows("kanban_rows", project_id, TASK_TABLES, lambda: db.load_tasks(project_id))
+
+    # --- MOVIMENTAÇÃO EM LOTE (um UPDATE) ---
+    if not tv.empty:
+        with st.expander("📦 Mover várias tarefas"):
+            with st.form("bulk_move"):
+                labels = {int(r['id']): f"{r['title']} ({r['status']})" for _, r in tv.iterrows()}
+                st.multiselect("Tarefas", list(labels.keys()), format_func=lambda i: labels[i], key="bulk_chosen")
+                b1, b2 = st.columns(2)
+                b1.selectbox("Novo status", list(KANBAN_PROGRESS.keys()), key="bulk_target")
+                b2.checkbox("Manter % de avanço atual", key="bulk_keep")
+                st.form_submit_button("Mover selecionadas", on_click=_move_selected)
+                if st.session_state.pop("bulk_empty", False):
+                    st.warning("Selecione ao menos uma tarefa.")
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        st.markdown("### 📝 A fazer"); st.markdown("---")
+        for _, t in tv[tv['status'] == "A fazer"].iterrows():
+            with st.container(border=True):
+                st.markdown(f"**{t['title']}**"); st.caption(f"👤 {t['owner']}")
+                with st.expander("✏️ Editar"):
+                    with st.form(f"f1_{t['id']}"):
+                        st.form_submit_button("Mover > Fazendo", on_click=_move, args=([t['id']], "Fazendo", 10))
+    with c2:
+        st.markdown("### 🔨 Fazendo"); st.markdown("---")
+        for _, t in tv[tv['status'] == "Fazendo"].iterrows():
+            st.warning(f"**{t['title']}**\n\n👤 {t['owner']}", icon="🏗️")
+            with st.expander("⚙️ Ações"):
+                    with st.form(f"f2_{t['id']}"):
+                        st.selectbox("Mover:", ["Concluir", "Bloquear", "Voltar"], key=f"sel_{t['id']}")
+                        st.form_submit_button("Atualizar", on_click=_move_from_form, args=(t['id'],))
+    with c3:
+        st.markdown("### 🚫 Bloqueado"); st.markdown("---")
+        for _, t in tv[tv['status'] == "Bloqueado"].iterrows():
+            st.error(f"**{t['title']}**", icon="🚨")
+            st.button("Desbloquear", key=f"unb_{t['id']}", on_click=_move, args=([t['id']], "Fazendo", None))
+    with c4:
+        st.markdown("### ✅ Feito"); st.markdown("---")
+        for _, t in tv[tv['status'] == "Feito"].iterrows():
+            st.success(f"**{t['title']}**", icon="🎉")
+
+def render(ctx):
+    st.title("✅ Tarefas (Visual Kanban)")
+    opts = dict(zip(ctx.df_active['name'], ctx.df_active['id']))
+    if not opts:
+        st.warning("Sem projetos ativos.")
+    else:
+        sel_nm = st.selectbox("Selecione o Projeto:", list(opts.keys()))
+        sel_id = opts[sel_nm]
+        ctx.show_risk_alert(sel_id)
+
+        # --- DEPENDÊNCIAS E CAMINHO CRÍTICO ---
+        with st.expander("🔗 Dependências e caminho crítico"):
+            render_dependencies(sel_id)
+
+        render_kanban(sel_id)
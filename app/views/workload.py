@@ -0,0 +1,66 @@
+# app/views/workload.py
+"""Carga semanal por responsável comparada à capacidade."""
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from datetime import date
+from utils import db, logic, metrics, styles
+
+@st.cache_resource(show_spinner=False, max_entries=16, ttl=300)
+def team_workload(version, start, n_weeks):
+    """Carga semanal por responsável, uma vez por (versão dos dados, início, horizonte)"""
+    end = (pd.Timestamp(start) + pd.Timedelta(weeks=n_weeks)).date().isoformat()
+    tasks, team = db.load_workload_tasks(start, end), db.load_team()
+    with metrics.timer("compute", "workload.matrix"):
+        load = logic.workload_matrix(tasks, start, n_weeks)
+        util, capacity = logic.utilization(load, team)
+    return load, util, capacity
+
+def render(ctx):
+    st.title("👥 Carga da Equipe")
+    st.caption("Esforço das tarefas abertas distribuído por igual entre os dias de cada tarefa, somado por responsável e semana, comparado à capacidade semanal do membro (Config → Equipe).")
+    horizon = st.radio("Horizonte", [8, 12, 26, 52], index=1, horizontal=True, format_func=lambda w: f"{w} semanas")
+    w_start = logic.week_start(date.today())
+    load, util, capacity = team_workload(db.data_version("tasks", "projects", "team_members"), w_start.date().isoformat(), horizon)
+
+    if load.empty:
+        st.info("Nenhuma tarefa aberta com responsável e esforço no período.")
+    else:
+        over = util > 1
+        summary = pd.DataFrame({
+            'capacity': capacity,
+            'peak_load': load.max(axis=1),
+            'peak_pct': util.max(axis=1) * 100,
+            'weeks_over': over.sum(axis=1),
+            'first_over': over.idxmax(axis=1).where(over.any(axis=1)),
+        }).sort_values('peak_pct', ascending=False)
+        overloaded = summary[summary['weeks_over'] > 0]
+
+        k1, k2, k3 = st.columns(3)
+        with k1: styles.card_component("Sobrecarregados", len(overloaded), f"de {len(summary)} responsáveis", "danger" if len(overloaded) else "neutral")
+        with k2: styles.card_component("Pico de alocação", f"{summary['peak_pct'].max():.0f}%", "maior semana", "neutral")
+        with k3: styles.card_component("Semanas acima de 100%", int(over.values.sum()), f"em {horizon} semanas", "neutral")
+
+        # Heatmap O(responsáveis x semanas): mais carregados no topo
+        top = summary.index[:60]
+        fig = go.Figure(go.Heatmap(
+            z=(util.loc[top] * 100).round(), x=[w.strftime("%d/%m") for w in util.columns], y=list(top),
+            zmin=0, zmax=150, colorscale=[[0, "#E5E7EB"], [0.5, "#22C55E"], [0.67, "#F59E0B"], [1, "#EF4444"]],
+            colorbar=dict(title="% cap."),
+            hovertemplate="%{y}<br>semana %{x}: %{z:.0f}%<extra></extra>",
+        ))
+        fig.update_layout(height=max(300, 22 * len(top) + 120), yaxis=dict(autorange='reversed'), xaxis_title="Semana (segunda-feira)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("⚠️ Sobrealocação")
+        if overloaded.empty:
+            st.success("Ninguém acima da capacidade no período.")
+        else:
+            st.dataframe(
+                overloaded.reset_index(), hide_index=True, use_container_width=True,
+                column_config={
+                    "owner": "Responsável", "capacity": st.column_config.NumberColumn("Capacidade/sem", format="%.0f"),
+                    "peak_load": st.column_config.NumberColumn("Pico (esforço)", format="%.1f"),
+                    "peak_pct": st.column_config.NumberColumn("Pico %", format="%.0f%%"),
+                    "weeks_over": "Semanas > 100%", "first_over": st.column_config.DateColumn("Primeira semana", format="DD/MM/YYYY"),
+                })
@@ -0,0 +1,91 @@
+# bench/generator.py
+"""
+Gerador de portfólio sintético (determinístico pela seed).
+
+Os tamanhos são derivados do número de tarefas: ~20 tarefas por projeto,
+3 riscos e 2 notas por projeto (10% das notas são GAP), 50 membros e
+dependências em cadeia entre tarefas consecutivas do mesmo projeto.
+"""
+import random
+from datetime import date, timedelta
+import pandas as pd
+
+PROJECT_STATUS = ["Backlog", "Em andamento", "Em andamento", "Em Risco", "Concluído"]
+TASK_STATUS = ["A fazer", "Fazendo", "Bloqueado", "Feito"]
+PROBABILITY = ["Baixa", "Média", "Alta"]
+IMPACT = ["Baixo", "Médio", "Alto"]
+AREAS = ["Geral", "TI", "RH", "Financeiro", "Marketing", "Operações", "Comercial", "Logística"]
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+def generate_portfolio(n_tasks=10_000, tasks_per_project=20, n_members=50, seed=42, today=None):
+    """Retorna {tabela: DataFrame} com ids explícitos, pronto para gravar"""
+    rnd = random.Random(seed)
+    today = today or date.today()
+    n_projects = max(1, n_tasks // tasks_per_project)
+    members = [f"Membro {i}" for i in range(1, n_members + 1)]
+
+    projects = []
+    for pid in range(1, n_projects + 1):
+        start = today - timedelta(days=rnd.randint(0, 365))
+        end = start + timedelta(days=rnd.randint(30, 540))
+        projects.append({
+            "id": pid, "name": f"Projeto {pid:06d}", "code": f"P{pid:06d}",
+            "sponsor": rnd.choice(AREAS), "manager": rnd.choice(members),
+            "start_date": start.isoformat(), "end_date": end.isoformat(),
+            "status": rnd.choice(PROJECT_STATUS), "priority": rnd.choice(["Baixa", "Média", "Alta"]),
+            "scope": "Escopo " * 20, "results_text": "", "date_changes": rnd.randint(0, 3),
+            "archived": 1 if rnd.random() < 0.1 else 0, "notes": "Anotação " * 10,
+        })
+
+    tasks = []
+    for tid in range(1, n_tasks + 1):
+        p = projects[rnd.randrange(n_projects)]
+        p_start = date.fromisoformat(p["start_date"])
+        p_days = (date.fromisoformat(p["end_date"]) - p_start).days
+        start = p_start + timedelta(days=rnd.randint(0, max(0, p_days - 1)))
+        end = start + timedelta(days=rnd.randint(1, 60))
+        status = rnd.choice(TASK_STATUS)
+        tasks.append({
+            "id": tid, "project_id": p["id"], "title": f"Tarefa {tid}",
+            "owner": rnd.choice(members), "start_date": start.isoformat(), "end_date": end.isoformat(),
+            "status": status, "priority": rnd.choice(["Baixa", "Média", "Alta"]),
+            "effort": rnd.choice([0, 1, 2, 3, 5, 8, 13]),
+            "progress": 100 if status == "Feito" else rnd.choice([0, 10, 25, 50, 75]),
+        })
+
+    # Cadeias por projeto: tarefa seguinte (por início) depende da anterior
+    # quando o plano já é consistente (fim antes do início), em ~50% dos pares
+    deps, by_project = [], {}
+    for t in sorted(tasks, key=lambda t: (t["project_id"], t["start_date"], t["id"])):
+        prev = by_project.get(t["project_id"])
+        if prev and prev["end_date"] < t["start_date"] and rnd.random() < 0.5:
+            deps.append({"id": len(deps) + 1, "project_id": t["project_id"],
+                         "predecessor_id": prev["id"], "successor_id": t["id"], "lag_days": 0})
+        by_project[t["project_id"]] = t
+
+    risks = [{
+        "id": rid, "project_id": rnd.randint(1, n_projects), "description": f"Risco {rid}",
+        "probability": rnd.choice(PROBABILITY), "impact": rnd.choice(IMPACT),
+        "mitigation_plan": "Plano " * 15, "owner": rnd.choice(members), "status": "Ativo",
+    } for rid in range(1, n_projects * 3 + 1)]
+
+    notes = [{
+        "id": nid, "project_id": rnd.randint(1, n_projects),
+        "category": "Gap (Impeditivo)" if rnd.random() < 0.1 else "Link/Doc",
+        "description": f"Nota {nid}", "link_url": "", "created_at": today.isoformat(),
+    } for nid in range(1, n_projects * 2 + 1)]
+
+    team = [{
+        "id": i, "name": name, "role": "Analista", "area": rnd.choice(AREAS),
+        "email": f"membro{i}@example.com", "phone": "",
+    } for i, name in enumerate(members, start=1)]
+
+    return {
+        "projects": pd.DataFrame(projects),
+        "tasks": pd.DataFrame(tasks),
+        "task_dependencies": pd.DataFrame(deps, columns=["id", "project_id", "predecessor_id", "successor_id", "lag_days"]),
+        "risks": pd.DataFrame(risks),
+        "project_notes": pd.DataFrame(notes),
+        "team_members": pd.DataFrame(team),
+    }
@@ -0,0 +1,103 @@
+# bench/imports.py
+"""
+Perfil de importação (cold start) do app e de cada página.
+
+Uso:
+    python -m bench.imports --out imports.json
+    python -m bench.imports --top 5 --only gantt agenda
+
+Cada alvo roda num interpretador novo com `python -X importtime` (nada em
+cache no processo). Para cada um sai o tempo total de importação e os pacotes
+mais caros (tempo próprio somado por pacote). `startup` = o que o main.py
+importa antes de abrir qualquer página; `marginal_ms` = o que abrir a página
+acrescenta depois disso. Dentro do app a primeira importação de cada página
+também é registrada (Diagnostics, kind='import').
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench.run import _git_commit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STARTUP = "streamlit, streamlit_option_menu, utils.db, utils.styles, utils.logic, utils.metrics, app.views"
+
+# "import time:       123 |       4567 |   package.module"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def parse_importtime(stderr):
+    """Lista de (módulo, self_us, cumulativo_us, profundidade) na ordem do -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return rows
+
+def profile(modules, python=sys.executable):
+    """Importa `modules` num processo novo e resume o -X importtime"""
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {modules}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    # Tempo próprio somado por pacote de primeiro nível: pandas, plotly... e não
+    # quem os importou primeiro (o cumulativo de utils.db incluiria o pandas)
+    packages = {}
+    for name, self_us, _, _ in rows:
+        pkg = name.split(".")[0]
+        packages[pkg] = packages.get(pkg, 0) + self_us
+    return {
+        "total_ms": round(sum(c for _, _, c, d in rows if d == 0) / 1000, 1),
+        "modules": len(rows),
+        "cumulative_ms": {name: round(c / 1000, 1) for name, _, c, d in rows if d == 0},
+        "packages": {k: round(v / 1000, 1) for k, v in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)},
+    }
+
+def main(argv=None):
+    from app.views import PAGES
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--top", type=int, default=8, help="pacotes mais caros por alvo")
+    ap.add_argument("--only", nargs="*", help="só estas páginas (nome do módulo em app/views)")
+    ap.add_argument("--out", help="arquivo JSON de saída (padrão: stdout)")
+    args = ap.parse_args(argv)
+
+    targets = {"startup": STARTUP}
+    targets.update({module: f"{STARTUP}, app.views.{module}" for _, _, module in PAGES
+                    if not args.only or module in args.only})
+    results = {}
+    for name, modules in targets.items():
+        r = profile(modules)
+        cumulative = r.pop("cumulative_ms")
+        r["packages"] = dict(list(r["packages"].items())[:args.top])
+        if name != "startup":
+            # A página é importada por último: o cumulativo dela é o custo marginal
+            r["marginal_ms"] = cumulative.get(f"app.views.{name}", 0.0)
+        results[name] = r
+        print(f"{name:14s} total {r['total_ms']:9.1f} ms  marginal {r.get('marginal_ms', 0):9.1f} ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+        },
+        "imports": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
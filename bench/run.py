@@ -0,0 +1,191 @@
+# bench/run.py
+"""
+Benchmark reprodutível dos caminhos de dados de cada página.
+
+Uso:
+    python -m bench.run --size 10k --out bench.json
+    DATABASE_URL=postgresql://... python -m bench.run --size 1k --reset
+
+Sem DATABASE_URL usa um SQLite temporário. Em Postgres o banco precisa estar
+vazio (ou use --reset, que APAGA os dados). Cada cenário roda com o cache de
+consultas limpo ("frio"); o resultado sai em JSON para comparar entre commits.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from bench.generator import SIZES, generate_portfolio
+
+LOAD_ORDER = ["projects", "tasks", "task_dependencies", "risks", "project_notes", "team_members"]
+
+def load_portfolio(db, bulk, frames, reset=False):
+    """Grava o portfólio sintético no banco configurado"""
+    db.bootstrap()
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT count(*) FROM tasks")
+        if c.fetchone()[0] and not reset:
+            raise SystemExit("Banco com dados: use --reset para apagar e recarregar.")
+        for table in reversed(LOAD_ORDER + ["project_health"]):
+            c.execute(f"DELETE FROM {table}")
+        for table in LOAD_ORDER:
+            bulk.write_frame(c, table, frames[table])
+        if not db.is_sqlite():
+            # ids explícitos: acerta as sequences do SERIAL
+            for table in LOAD_ORDER:
+                c.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))")
+        conn.commit()
+        c.close()
+    db.refresh_project_health()
+    db.invalidate_cache()
+
+def scenarios(db, logic, frames):
+    """Cenários = o que cada página faz com os dados (sem renderizar)"""
+    tasks = frames["tasks"]
+    busiest = int(tasks["project_id"].value_counts().idxmax())
+    today = date.today()
+
+    def dashboard():
+        # Mesmo caminho da página: snapshot de KPIs + término previsto dos
+        # projetos com dependências (common.project_schedule, sem o cache)
+        k = db.load_project_kpis()
+        sched = db.load_schedule(with_dependencies=True)
+        logic.health_from_kpis(k, k['project_id'].map(sched.project_finish()))
+        logic.time_elapsed_pct(k)
+
+    def startup_loads():
+        db.load_many(active=db.load_projects, sponsors=db.load_sponsors,
+                     gaps=db.load_active_gaps, risks=db.load_risk_summary)
+
+    def gantt():
+        gp = db.load_gantt_projects(today - pd.Timedelta(days=30), today + pd.Timedelta(days=182))
+        logic.gantt_rows(gp, db.load_gantt_tasks(gp["project_id"].head(3).tolist()))
+        # Término previsto só dos projetos da página (gantt.gantt_figure)
+        db.load_schedule(project_ids=gp["project_id"].tolist()).project_finish()
+
+    def kanban():
+        tv = db.load_tasks(busiest)
+        for s in ["A fazer", "Fazendo", "Bloqueado", "Feito"]:
+            tv[tv["status"] == s]
+
+    month_start = today.replace(day=1)
+
+    def calendar_events():
+        ev = db.load_calendar_events(month_start, month_start + pd.DateOffset(months=1))
+        logic.calendar_events(ev, {"Em andamento": "#3B82F6"})
+
+    def risk_matrix():
+        logic.risk_grid(db.load_risk_matrix())
+        db.load_risk_cell(3, 3)
+
+    def workload():
+        start = logic.week_start(today)
+        load = logic.workload_matrix(db.load_workload_tasks(start, start + pd.Timedelta(weeks=104)), start, 104)
+        logic.utilization(load, db.load_team())
+
+    def schedule():
+        db.load_schedule().project_finish()
+
+    def search():
+        db.search("tarefa 1")
+        db.search("risc")
+
+    return {
+        "startup_loads": startup_loads,
+        "dashboard": dashboard,
+        "gantt": gantt,
+        "kanban": kanban,
+        "calendar_events": calendar_events,
+        "risk_matrix": risk_matrix,
+        "workload": workload,
+        "schedule": schedule,
+        "search": search,
+    }
+
+def time_scenario(db, fn, repeat):
+    fn()  # aquecimento (pool, recálculo diário do snapshot)
+    samples = []
+    for _ in range(repeat):
+        db.invalidate_cache()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "n": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", default="10k", help="1k, 10k, 100k ou número de tarefas")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--only", nargs="*", help="roda só estes cenários")
+    ap.add_argument("--reset", action="store_true", help="apaga os dados do banco antes de carregar")
+    ap.add_argument("--out", help="arquivo JSON de saída (padrão: stdout)")
+    args = ap.parse_args(argv)
+
+    n_tasks = SIZES.get(args.size) or int(args.size)
+    tmpdir = None
+    if not os.environ.get("DATABASE_URL"):
+        tmpdir = tempfile.mkdtemp(prefix="bench_")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        args.reset = True
+
+    from utils import db, logic, bulk
+
+    frames = generate_portfolio(n_tasks=n_tasks, seed=args.seed)
+    t0 = time.perf_counter()
+    load_portfolio(db, bulk, frames, reset=args.reset)
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    results = {}
+    for name, fn in scenarios(db, logic, frames).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = time_scenario(db, fn, args.repeat)
+        print(f"{name:28s} median {results[name]['median_ms']:10.2f} ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "backend": "sqlite" if db.is_sqlite() else "postgres",
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "seed": args.seed,
+            "rows": {t: len(df) for t, df in frames.items()},
+            "load_ms": round(load_ms, 1),
+        },
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# tests/conftest.py
+"""
+Os testes rodam contra um SQLite temporário (o mesmo stand-in do bench),
+nunca contra o banco configurado nos segredos do Streamlit.
+
+Uso:
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_TMPDIR = tempfile.mkdtemp(prefix="tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMPDIR, 'test.db')}"
+
+from utils import db
+
+# Mesmo com .streamlit/secrets.toml presente, usa o SQLite acima
+db._db_config = lambda: {"url": os.environ["DATABASE_URL"]}
+
+# Ordem de apagar (filhas antes de projects)
+RESET_TABLES = ["task_dependencies", "tasks", "risks", "project_notes", "project_health", "team_members", "projects"]
+
+@pytest.fixture
+def database():
+    """Banco migrado e vazio (sem o projeto exemplo), com o cache de consultas limpo"""
+    db.bootstrap()
+    with db.connection() as conn:
+        c = conn.cursor()
+        for table in RESET_TABLES:
+            c.execute(f"DELETE FROM {table}")
+        conn.commit()
+        c.close()
+    db.invalidate_cache()
+    return db
+
+@pytest.fixture
+def add_project(database):
+    """add_project(name, **colunas) -> id"""
+    def add(name="Projeto", start_date="2026-01-01", end_date="2026-12-31", status="Em andamento", **cols):
+        values = {"name": name, "start_date": start_date, "end_date": end_date, "status": status,
+                  "date_changes": 0, "archived": 0, **cols}
+        database.execute_command(
+            f"INSERT INTO projects ({', '.join(values)}) VALUES ({', '.join('?' for _ in values)})",
+            tuple(values.values()))
+        return int(database.run_query("SELECT MAX(id) AS id FROM projects", cache=False)['id'].iloc[0])
+    return add
+
+@pytest.fixture
+def add_task(database):
+    """add_task(project_id, **colunas) -> id"""
+    def add(project_id, title="Tarefa", start_date="2026-01-05", end_date="2026-01-09", status="A fazer", **cols):
+        values = {"project_id": int(project_id), "title": title, "start_date": start_date,
+                  "end_date": end_date, "status": status, **cols}
+        database.execute_command(
+            f"INSERT INTO tasks ({', '.join(values)}) VALUES ({', '.join('?' for _ in values)})",
+            tuple(values.values()))
+        return int(database.run_query("SELECT MAX(id) AS id FROM tasks", cache=False)['id'].iloc[0])
+    return add
@@ -0,0 +1,74 @@
+# tests/test_bulk.py
+import io
+
+import pandas as pd
+
+from utils import bulk
+
+LOOKUP = ({"alpha": 1, "beta": 2}, {"b-01": 1}, {1, 2})
+
+def _chunk(**cols):
+    return pd.DataFrame(cols, dtype=object)
+
+def test_project_resolved_by_code_before_name():
+    out, errors = bulk.validate_chunk(_chunk(project=["B-01", "beta", "gama"], title=["a", "b", "c"]), "tasks", LOOKUP)
+    assert out["project_id"].tolist()[:2] == [1, 2]
+    assert errors == ["linha 4: projeto não encontrado"]
+
+def test_unknown_project_id_is_reported():
+    out, errors = bulk.validate_chunk(_chunk(project_id=["1", "99"], title=["a", "b"]), "tasks", LOOKUP)
+    assert errors == ["linha 3: projeto não encontrado"]
+
+def test_missing_project_column():
+    _, errors = bulk.validate_chunk(_chunk(title=["a"]), "tasks", LOOKUP)
+    assert errors == ["coluna 'project' (nome ou código) ou 'project_id' obrigatória"]
+
+def test_defaults_and_types():
+    out, errors = bulk.validate_chunk(_chunk(project_id=["2"], title=["a"], effort=["3.6"], start_date=["2026-01-05"]),
+                                      "tasks", LOOKUP)
+    assert errors == []
+    row = out.iloc[0]
+    assert row["status"] == "A fazer" and row["progress"] == 0 and row["effort"] == 4
+    assert row["start_date"] == "2026-01-05" and row["end_date"] is None
+
+def test_row_errors_use_file_line_numbers():
+    chunk = _chunk(project_id=["1"] * 5,
+                   title=["ok", "", "c", "d", "e"],
+                   start_date=["2026-01-05", "2026-01-05", "ontem", "2026-01-09", "2026-01-05"],
+                   end_date=["2026-01-06", "2026-01-06", None, "2026-01-05", "2026-01-06"],
+                   status=["Feito", "A fazer", "A fazer", "A fazer", "Pronto"],
+                   progress=["100", "0", "x", "0", "120"])
+    _, errors = bulk.validate_chunk(chunk, "tasks", LOOKUP, first_row=10)
+    assert sorted(errors) == sorted([
+        "linha 13: 'title' obrigatório",
+        "linha 14: data inválida em 'start_date'",
+        "linha 14: número inválido em 'progress'",
+        "linha 15: 'start_date' depois de 'end_date'",
+        f"linha 16: 'status' deve ser um de {bulk.TASK_STATUS}",
+        "linha 16: 'progress' deve estar entre 0 e 100",
+    ])
+
+def test_projects_get_fixed_columns():
+    out, errors = bulk.validate_chunk(_chunk(name=["Novo"]), "projects")
+    assert errors == []
+    assert out.iloc[0][["status", "archived", "date_changes"]].tolist() == ["Backlog", 0, 0]
+
+def test_import_is_all_or_nothing(database, add_project):
+    pid = add_project("Alpha", code="A-1")
+    bad = io.BytesIO("project,title\nA-1,ok\nnope,falha\n".encode())
+    result = bulk.import_file(bad, "tarefas.csv", "tasks")
+    assert not result["imported"] and result["errors"] == ["linha 3: projeto não encontrado"]
+    assert database.run_query("SELECT COUNT(*) AS n FROM tasks", cache=False)['n'].iloc[0] == 0
+
+    good = io.BytesIO(f"project_id,title,effort\n{pid},a,2\n{pid},b,\n".encode())
+    result = bulk.import_file(good, "tarefas.csv", "tasks")
+    assert result == {"rows": 2, "errors": [], "imported": True}
+    tasks = database.load_tasks(pid, ['id', 'title', 'effort', 'status'])
+    assert tasks['title'].tolist() == ["a", "b"]
+    assert tasks['effort'].isna().tolist() == [False, True]
+
+def test_dry_run_writes_nothing(database, add_project):
+    pid = add_project("Alpha")
+    result = bulk.import_file(io.BytesIO(f"project_id,title\n{pid},a\n".encode()), "t.csv", "tasks", dry_run=True)
+    assert result["rows"] == 1 and not result["imported"]
+    assert database.load_tasks(pid).empty
@@ -0,0 +1,71 @@
+# tests/test_cache.py
+from utils.cache import QueryCache, normalize_sql, tables_in
+
+def test_normalize_and_tables():
+    assert normalize_sql("SELECT *\n   FROM tasks;") == "SELECT * FROM tasks"
+    assert tables_in("SELECT * FROM tasks t JOIN projects p ON p.id = t.project_id") == {"tasks", "projects"}
+    assert tables_in("UPDATE Tasks SET status = ?") == {"tasks"}
+    assert tables_in("INSERT INTO risks (a) VALUES (?)") == {"risks"}
+
+def test_key_ignores_formatting_and_freezes_lists():
+    assert QueryCache.make_key("SELECT *  FROM t", (1,)) == QueryCache.make_key("SELECT * FROM t", (1,))
+    assert QueryCache.make_key("SELECT * FROM t", ([1, 2],)) == ("SELECT * FROM t", ((1, 2),))
+
+def test_get_set_and_lru_eviction():
+    cache = QueryCache(maxsize=2, ttl=60)
+    a, b, c = (QueryCache.make_key(f"SELECT * FROM {t}") for t in "abc")
+    cache.set(a, "A")
+    cache.set(b, "B")
+    assert cache.get(a) == "A"      # a passa a ser o mais recente
+    cache.set(c, "C")               # b sai
+    assert cache.get(b) is None
+    assert cache.get(a) == "A" and cache.get(c) == "C"
+
+def test_ttl_expiry():
+    cache = QueryCache(ttl=-1)
+    key = QueryCache.make_key("SELECT * FROM tasks")
+    cache.set(key, "x")
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+def test_invalidate_only_dependent_entries():
+    cache = QueryCache()
+    tasks = QueryCache.make_key("SELECT * FROM tasks")
+    joined = QueryCache.make_key("SELECT * FROM tasks JOIN projects ON 1 = 1")
+    risks = QueryCache.make_key("SELECT * FROM risks")
+    for key in (tasks, joined, risks):
+        cache.set(key, key[0])
+    assert cache.invalidate_tables(["projects"]) == 1
+    assert cache.get(joined) is None
+    assert cache.get(tasks) is not None and cache.get(risks) is not None
+
+def test_version_changes_on_write_and_clear():
+    cache = QueryCache()
+    v0 = cache.version({"tasks"})
+    cache.invalidate_tables(["risks"])
+    assert cache.version({"tasks"}) == v0
+    cache.invalidate_tables(["tasks"])
+    v1 = cache.version({"tasks"})
+    assert v1 != v0
+    cache.clear()
+    assert cache.version({"tasks"}) != v1
+
+def test_set_skips_result_that_overlapped_a_write():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT * FROM tasks")
+    version = cache.version({"tasks"})     # lido antes da consulta
+    cache.invalidate_tables(["tasks"])      # escrita termina durante a leitura
+    assert cache.set(key, "antigo", {"tasks"}, version) is False
+    assert cache.get(key) is None
+    assert cache.set(key, "novo", {"tasks"}, cache.version({"tasks"})) is True
+    assert cache.get(key) == "novo"
+
+def test_placeholder_in_lists_share_one_series():
+    a = normalize_sql("UPDATE tasks SET status = ? WHERE id IN (?, ?)")
+    b = normalize_sql("UPDATE tasks SET status = ? WHERE id IN (?,?,?, ?)")
+    assert a == b == "UPDATE tasks SET status = ? WHERE id IN (...)"
+    # Listas literais fazem parte do SQL: continuam distintas
+    assert normalize_sql("SELECT * FROM t WHERE s IN ('a', 'b')") != normalize_sql("SELECT * FROM t WHERE s IN ('a')")
+    # Parâmetros diferentes continuam em chaves de cache diferentes
+    assert QueryCache.make_key("SELECT * FROM t WHERE id IN (?, ?)", (1, 2)) != \
+        QueryCache.make_key("SELECT * FROM t WHERE id IN (?, ?, ?)", (1, 2, 3))
@@ -0,0 +1,34 @@
+# tests/test_db.py
+import pytest
+
+from utils import db
+
+def _missing_config():
+    raise KeyError("connections")
+
+@pytest.mark.parametrize("fetch, empty", [(True, True), (False, None)])
+def test_missing_config_shows_connection_error(monkeypatch, fetch, empty):
+    errors = []
+    monkeypatch.setattr(db.st, "error", errors.append)
+    monkeypatch.setattr(db, "_db_config", _missing_config)
+    result = db.run_query("SELECT 1", fetch=fetch)
+    assert (result.empty if fetch else result) == empty
+    assert errors == ["Erro de Conexão com o Banco: 'connections'"]
+
+def test_query_error_is_shown(database, monkeypatch):
+    errors = []
+    monkeypatch.setattr(db.st, "error", errors.append)
+    assert db.run_query("SELECT * FROM no_such_table").empty
+    assert db.execute_command("UPDATE no_such_table SET a = 1") is None
+    assert len(errors) == 2 and all(e.startswith("Erro na Query:") for e in errors)
+
+def test_execute_command_returns_rowcount(database, add_project):
+    pid = add_project()
+    assert db.execute_command("UPDATE projects SET status = ? WHERE id = ?", ("Backlog", pid)) == 1
+    assert db.execute_command("UPDATE projects SET status = ? WHERE id = ?", ("Backlog", -1)) == 0
+
+def test_write_invalidates_cached_reads(database, add_project):
+    pid = add_project("Antes")
+    assert db.load_project(pid)['name'] == "Antes"
+    db.execute_command("UPDATE projects SET name = ? WHERE id = ?", ("Depois", pid))
+    assert db.load_project(pid)['name'] == "Depois"
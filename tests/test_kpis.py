@@ -0,0 +1,51 @@
+# tests/test_kpis.py
+"""Paridade dos agregados do banco (project_kpis / project_health) com o cálculo em Python"""
+import random
+
+import pandas as pd
+
+from utils import logic, migrations
+
+def _progress_by_project(database):
+    kpis = database.load_project_kpis()
+    return dict(zip(kpis['project_id'].tolist(), kpis['progress'].tolist()))
+
+def _expected(database, pid):
+    tasks = database.load_tasks(pid, ['id', 'effort', 'progress'])
+    return round(float(logic.calculate_progress(tasks)), 1)
+
+def test_tie_rounds_like_calculate_progress(database, add_project, add_task):
+    pid = add_project()
+    for effort, progress in ((5, 50), (3, 0), (0, 33)):
+        add_task(pid, effort=effort, progress=progress)
+    tasks = database.load_tasks(pid, ['effort', 'progress'])
+    assert logic.calculate_progress(tasks) == 31.2
+    assert _progress_by_project(database)[pid] == 31.2
+
+def test_progress_parity_with_calculate_progress(database, add_project, add_task):
+    rng = random.Random(7)
+    pids = [add_project(f"P{i}") for i in range(40)]
+    for pid in pids:
+        for _ in range(rng.randint(0, 6)):
+            add_task(pid, effort=rng.choice([None, 0, 1, 2, 3, 5, 8]), progress=rng.choice([None, 0, 10, 25, 33, 50, 75, 100]))
+    got = _progress_by_project(database)
+    assert {pid: got[pid] for pid in pids} == {pid: _expected(database, pid) for pid in pids}
+
+def test_snapshot_follows_writes(database, add_project, add_task):
+    pid = add_project()
+    tid = add_task(pid, effort=4, progress=0)
+    add_task(pid, effort=4, progress=25)
+    assert _progress_by_project(database)[pid] == 12.5
+    database.execute_command("UPDATE tasks SET progress = 100 WHERE id = ?", (tid,))
+    assert _progress_by_project(database)[pid] == _expected(database, pid) == 62.5
+
+def test_snapshot_matches_view(database, add_project, add_task):
+    pid = add_project()
+    add_task(pid, effort=3, progress=10, end_date="2099-01-01")
+    add_task(pid, effort=6, progress=20, status="Bloqueado", end_date="2020-01-01")
+    view = database.run_query(migrations.kpi_select(), cache=False, floats=('progress',)).set_index('project_id')
+    kpis = database.load_project_kpis().set_index('project_id')
+    for col in migrations.HEALTH_COLUMNS:
+        expected = logic.round_progress(view[col]) if col == 'progress' else view[col]
+        pd.testing.assert_series_equal(kpis[col], expected, check_dtype=False, check_names=False)
+    assert kpis.loc[pid, 'late_tasks'] == 1 and kpis.loc[pid, 'tasks_blocked'] == 1
@@ -0,0 +1,104 @@
+# tests/test_logic.py
+import random
+from datetime import date
+
+import pandas as pd
+
+from utils import logic
+
+def _work(*rows):
+    """(owner, início, fim, esforço)"""
+    return pd.DataFrame(rows, columns=['owner', 'start_date', 'end_date', 'effort'])
+
+def test_workload_spreads_effort_over_days():
+    load = logic.workload_matrix(_work(("Ana", "2026-01-05", "2026-01-09", 10),
+                                       ("Ana", "2026-01-05", "2026-01-18", 14),
+                                       ("Bia", "2026-01-12", "2026-01-12", 3)),
+                                 "2026-01-07", 2)
+    assert list(load.columns) == [pd.Timestamp("2026-01-05"), pd.Timestamp("2026-01-12")]
+    assert load.loc["Ana"].tolist() == [17.0, 7.0]
+    assert load.loc["Bia"].tolist() == [0.0, 3.0]
+
+def test_workload_clips_to_window_and_skips_invalid_rows():
+    load = logic.workload_matrix(_work(("Ana", "2025-12-29", "2026-01-11", 14),   # metade antes da janela
+                                       ("Ana", "2026-01-05", "2026-01-05", 0),    # sem esforço
+                                       ("Ana", "2026-01-09", "2026-01-05", 5),    # fim antes do início
+                                       (None, "2026-01-05", "2026-01-05", 5)),    # sem responsável
+                                 "2026-01-05", 1)
+    assert load.index.tolist() == ["Ana"]
+    assert load.loc["Ana"].tolist() == [7.0]
+
+def test_workload_single_date_uses_the_other():
+    load = logic.workload_matrix(_work(("Ana", None, "2026-01-06", 4)), "2026-01-05", 1)
+    assert load.loc["Ana"].tolist() == [4.0]
+
+def test_workload_matches_naive_sum():
+    tasks = _work(("Ana", "2026-01-03", "2026-01-20", 9), ("Bia", "2026-01-08", "2026-02-02", 13),
+                  ("Ana", "2026-01-14", "2026-01-14", 2))
+    load = logic.workload_matrix(tasks, "2026-01-05", 3)
+    for owner, start, end, effort in tasks.itertuples(index=False):
+        days = pd.date_range(start, end)
+        for week in load.columns:
+            in_week = ((days >= week) & (days < week + pd.Timedelta(days=7))).sum()
+            load.loc[owner, week] -= effort * in_week / len(days)
+    assert (load.abs() < 1e-9).all().all()
+
+def test_workload_empty():
+    load = logic.workload_matrix(_work(), "2026-01-05", 2)
+    assert load.empty and len(load.columns) == 2
+
+def _portfolio(seed=3, n=60):
+    """Projetos/riscos/GAPs aleatórios cobrindo atraso leve, crítico, concluído e sem riscos"""
+    rng = random.Random(seed)
+    today = pd.Timestamp(date.today())
+    projects = pd.DataFrame({
+        'id': range(1, n + 1),
+        'status': [rng.choice(["Em andamento", "Backlog", "Concluído", "Cancelado", "Em Risco"]) for _ in range(n)],
+        'end_date': [(today + pd.Timedelta(days=rng.randint(-20, 20))).date().isoformat() for _ in range(n)],
+    })
+    risks = pd.DataFrame([(rng.randint(1, n), rng.choice(["Alta", "Média", "Baixa", "Outra"])) for _ in range(n)],
+                         columns=['project_id', 'probability'])
+    gaps = pd.DataFrame({'project_id': rng.sample(range(1, n + 1), n // 6)})
+    return projects, risks, gaps
+
+def test_compute_health_frame_matches_row_rules():
+    projects, risks, gaps = _portfolio()
+    frame = logic.compute_health_frame(projects, None, risks, gaps)
+    expected = [
+        "🔴 Crítico" if pid in set(gaps['project_id']) else logic.calculate_project_health(row, None, risks)
+        for pid, (_, row) in zip(projects['id'], projects.iterrows())
+    ]
+    assert frame['health'].tolist() == expected
+    assert frame.index.equals(projects.index)
+
+def test_compute_health_frame_matches_kpi_path():
+    projects, risks, gaps = _portfolio(seed=11)
+    frame = logic.compute_health_frame(projects, None, risks, None)
+    level = risks['probability'].map({"Alta": 3, "Média": 2, "Baixa": 1}).fillna(0).groupby(risks['project_id']).max()
+    kpis = projects.assign(max_risk_level=projects['id'].map(level).fillna(0), has_gap=0)
+    assert frame['health'].tolist() == logic.health_from_kpis(kpis).tolist()
+
+def test_compute_health_frame_empty():
+    frame = logic.compute_health_frame(pd.DataFrame(columns=['id', 'status', 'end_date']), None, None)
+    assert frame.empty and 'health' in frame.columns
+
+def test_progress_frame_matches_calculate_progress():
+    rng = random.Random(5)
+    projects = pd.DataFrame({'id': range(1, 41), 'start_date': "2026-01-01", 'end_date': "2026-12-31"})
+    tasks = pd.DataFrame([(1, 5, 50), (1, 3, 0), (1, 0, 33)] +
+                         [(rng.randint(2, 40), rng.choice([None, 0, 1, 3, 5]), rng.choice([None, 0, 25, 33, 50, 100]))
+                          for _ in range(150)],
+                         columns=['project_id', 'effort', 'progress'])
+    frame = logic.progress_frame(tasks, projects)
+    # Sem avanço preenchido o project_kpis devolve 0 (calculate_progress daria NaN)
+    expected = [round(float(logic.calculate_progress(tasks[tasks['project_id'] == pid])), 1) for pid in projects['id']]
+    expected = [0.0 if pd.isna(v) else v for v in expected]
+    assert frame['progress'].tolist() == expected
+    assert frame.loc[0, 'progress'] == 31.2
+    assert frame['time_pct'].tolist() == logic.time_elapsed_pct(projects).tolist()
+
+def test_progress_frame_without_tasks():
+    projects = pd.DataFrame({'id': [1, 2], 'start_date': [None, "2026-01-01"], 'end_date': [None, "2026-01-01"]})
+    frame = logic.progress_frame(pd.DataFrame(columns=['project_id', 'effort', 'progress']), projects)
+    assert frame['progress'].tolist() == [0.0, 0.0]
+    assert frame['time_pct'].tolist() == [0.0, 0.0]
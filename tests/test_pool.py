@@ -0,0 +1,79 @@
+# tests/test_pool.py
+import sqlite3
+import time
+
+import pytest
+
+from utils.db import ConnectionPool, PoolExhausted
+
+class _FlakyConn:
+    """Conexão que para de responder quando `dead` (o health check falha)"""
+    def __init__(self):
+        self.dead = False
+        self.closed = 0
+    def cursor(self):
+        return self
+    def execute(self, sql):
+        if self.dead:
+            raise RuntimeError("server closed the connection")
+    def fetchall(self):
+        return [(1,)]
+    def close(self):
+        pass
+    def rollback(self):
+        pass
+
+def _sqlite_pool(**kwargs):
+    return ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), **kwargs)
+
+def test_recent_connection_skips_health_check():
+    pool = _sqlite_pool(check_idle_after=60)
+    for _ in range(3):
+        with pool.connection() as conn:
+            conn.execute("SELECT 1")
+    assert pool.stats()["health_checks"] == 0
+    assert pool.stats()["created"] == 1
+
+def test_idle_connection_is_checked():
+    pool = _sqlite_pool(check_idle_after=0.01)
+    with pool.connection():
+        pass
+    time.sleep(0.02)
+    with pool.connection():
+        pass
+    assert pool.stats()["health_checks"] == 1
+
+def test_connection_returned_after_error_is_checked():
+    pool = _sqlite_pool(check_idle_after=60)
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("erro da página")
+    with pool.connection():
+        pass
+    assert pool.stats()["health_checks"] == 1
+    with pool.connection():
+        pass
+    assert pool.stats()["health_checks"] == 1
+
+def test_dead_connection_is_replaced():
+    conns = []
+    def connect():
+        conns.append(_FlakyConn())
+        return conns[-1]
+    pool = ConnectionPool(connect, check_idle_after=60)
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError
+    conns[0].dead = True
+    with pool.connection() as conn:
+        assert conn is conns[1]
+    assert pool.stats()["reconnects"] == 1
+
+def test_exhausted_pool_times_out():
+    pool = _sqlite_pool(minconn=0, maxconn=1, timeout=0.01)
+    conn = pool.getconn()
+    with pytest.raises(PoolExhausted):
+        pool.getconn()
+    pool.putconn(conn)
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["in_use"] == 0
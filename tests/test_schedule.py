@@ -0,0 +1,116 @@
+# tests/test_schedule.py
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from utils.schedule import CycleError, Schedule, creates_cycle
+
+TODAY = date(2026, 1, 1)
+
+def _tasks(*rows):
+    """(id, project_id, início, fim[, status])"""
+    return pd.DataFrame([(r + ("A fazer",))[:5] for r in rows],
+                        columns=['id', 'project_id', 'start_date', 'end_date', 'status'])
+
+def _deps(*edges):
+    """(predecessor, sucessor[, lag])"""
+    return pd.DataFrame([(e + (0,))[:3] for e in edges], columns=['predecessor_id', 'successor_id', 'lag_days'])
+
+def _day(s):
+    return pd.Timestamp(s)
+
+@pytest.fixture
+def chain():
+    # 1 (5..7) -> 2 (6..6); 3 (5..6) solta no mesmo projeto
+    tasks = _tasks((1, 10, "2026-01-05", "2026-01-07"), (2, 10, "2026-01-06", "2026-01-06"),
+                   (3, 10, "2026-01-05", "2026-01-06"))
+    return Schedule(tasks, _deps((1, 2)), today=TODAY)
+
+def test_forward_pass(chain):
+    f = chain.frame()
+    assert f.loc[1, 'es'] == _day("2026-01-05") and f.loc[1, 'ef'] == _day("2026-01-07")
+    # A sucessora começa no dia seguinte ao término da predecessora
+    assert f.loc[2, 'es'] == _day("2026-01-08") and f.loc[2, 'ef'] == _day("2026-01-08")
+    assert chain.project_finish()[10] == _day("2026-01-08")
+
+def test_backward_pass_and_critical_path(chain):
+    f = chain.frame()
+    assert f.loc[1, 'slack'] == 0 and f.loc[2, 'slack'] == 0
+    assert f.loc[3, 'slack'] == 2
+    assert f.loc[3, 'lf'] == _day("2026-01-08")
+    assert chain.critical_path(10) == [1, 2]
+
+def test_lag_days():
+    tasks = _tasks((1, 10, "2026-01-05", "2026-01-07"), (2, 10, "2026-01-06", "2026-01-06"))
+    f = Schedule(tasks, _deps((1, 2, 2)), today=TODAY).frame()
+    assert f.loc[2, 'es'] == _day("2026-01-10")
+
+def test_open_overdue_task_is_pushed_to_today_but_done_is_not():
+    tasks = _tasks((1, 10, "2026-01-05", "2026-01-07"), (2, 10, "2026-01-05", "2026-01-07", "Feito"))
+    f = Schedule(tasks, None, today=date(2026, 2, 1)).frame()
+    assert f.loc[1, 'ef'] == _day("2026-02-01")
+    assert f.loc[2, 'ef'] == _day("2026-01-07")
+    assert not f.loc[2, 'critical']
+
+def test_shift_propagates_only_to_successors(chain):
+    changed = chain.shift(1, end="2026-01-09")
+    assert changed == [1, 2]
+    f = chain.frame()
+    assert f.loc[2, 'es'] == _day("2026-01-10")
+    assert f.loc[3, 'slack'] == 4
+    # Sem mudança no fim: ninguém é recalculado além da própria tarefa
+    assert chain.shift(3, start="2026-01-05") == []
+
+def test_shift_matches_full_recompute(chain):
+    chain.shift(1, start="2026-01-06", end="2026-01-10")
+    tasks = _tasks((1, 10, "2026-01-06", "2026-01-10"), (2, 10, "2026-01-06", "2026-01-06"),
+                   (3, 10, "2026-01-05", "2026-01-06"))
+    pd.testing.assert_frame_equal(chain.frame(), Schedule(tasks, _deps((1, 2)), today=TODAY).frame())
+
+def test_cycle_is_reported_with_task_ids():
+    tasks = _tasks((1, 10, "2026-01-05", "2026-01-07"), (2, 10, "2026-01-05", "2026-01-07"),
+                   (3, 10, "2026-01-05", "2026-01-07"))
+    with pytest.raises(CycleError) as err:
+        Schedule(tasks, _deps((1, 2), (2, 3), (3, 2)), today=TODAY)
+    assert sorted(err.value.cycle) == [2, 3]
+
+def test_edges_to_unknown_tasks_are_ignored():
+    tasks = _tasks((1, 10, "2026-01-05", "2026-01-07"))
+    f = Schedule(tasks, _deps((1, 99), (98, 1)), today=TODAY).frame()
+    assert f.loc[1, 'es'] == _day("2026-01-05")
+
+def test_creates_cycle():
+    deps = _deps((1, 2), (2, 3))
+    assert creates_cycle(deps, 3, 1)
+    assert creates_cycle(deps, 2, 2)
+    assert not creates_cycle(deps, 1, 3)
+
+def test_load_schedule_scoped_to_projects(database, add_project, add_task):
+    a, b, c = add_project("A"), add_project("B"), add_project("C")
+    t1, t2 = add_task(a, end_date="2099-01-02"), add_task(a, start_date="2099-01-03", end_date="2099-01-04")
+    add_task(b)
+    add_task(c)
+    database.add_dependency(t1, t2)
+    sched = database.load_schedule(project_ids=[a, b])
+    assert sorted(set(sched.project)) == [a, b]
+    assert sched.critical_path(a) == [t1, t2]
+    assert database.load_schedule(project_ids=[]).ids == []
+    assert sorted(set(database.load_schedule(with_dependencies=True).project)) == [a]
+
+def test_reschedule_tasks(database, add_project, add_task):
+    pid = add_project()
+    tid = add_task(pid)
+    assert database.reschedule_tasks([(tid, "2026-02-02", "2026-02-06")]) == 1
+    row = database.load_schedule_tasks(pid).iloc[0]
+    assert (row['start_date'], row['end_date']) == (pd.Timestamp("2026-02-02"), pd.Timestamp("2026-02-06"))
+
+def _no_connection():
+    raise RuntimeError("sem banco")
+
+def test_reschedule_tasks_reports_errors(database, monkeypatch):
+    errors = []
+    monkeypatch.setattr(database.st, "error", errors.append)
+    monkeypatch.setattr(database, "connection", _no_connection)
+    assert database.reschedule_tasks([(1, "2026-02-02", "2026-02-06")]) is None
+    assert errors == ["Erro na Query: sem banco"]
@@ -0,0 +1,95 @@
+# tests/test_sql.py
+from utils.sql import StatementRegistry, translate
+
+def test_placeholders_postgres():
+    stmt = translate("SELECT * FROM tasks WHERE id = ? AND status = %s", "postgres")
+    assert stmt.text == "SELECT * FROM tasks WHERE id = %s AND status = %s"
+    assert stmt.numbered == "SELECT * FROM tasks WHERE id = $1 AND status = $2"
+    assert stmt.nparams == 2
+
+def test_placeholders_sqlite():
+    stmt = translate("UPDATE tasks SET status = %s WHERE id = ?", "sqlite")
+    assert stmt.text == stmt.numbered == "UPDATE tasks SET status = ? WHERE id = ?"
+    assert stmt.nparams == 2
+
+def test_placeholder_inside_string_literal_is_kept():
+    stmt = translate("SELECT 'why?', 'it''s ?' FROM t WHERE a = ?", "postgres")
+    assert stmt.text == "SELECT 'why?', 'it''s ?' FROM t WHERE a = %s"
+    assert stmt.nparams == 1
+
+def test_placeholder_inside_quoted_identifier_is_kept():
+    stmt = translate('SELECT "col?" FROM t WHERE a = ?', "postgres")
+    assert stmt.text == 'SELECT "col?" FROM t WHERE a = %s'
+
+def test_placeholder_inside_comments_is_kept():
+    stmt = translate("SELECT 1 -- ok?\nFROM t /* a = ? */ WHERE a = ?", "postgres")
+    assert stmt.numbered == "SELECT 1 -- ok?\nFROM t /* a = ? */ WHERE a = $1"
+    assert stmt.nparams == 1
+
+def test_dollar_quoted_block_is_kept():
+    query = "CREATE FUNCTION f() RETURNS void AS $body$ SELECT '?' || ? $body$ LANGUAGE sql"
+    stmt = translate(query, "postgres")
+    assert stmt.text == query
+    assert stmt.nparams == 0
+
+def test_dollar_is_not_special_in_sqlite():
+    stmt = translate("SELECT '$$' || ? FROM t", "sqlite")
+    assert stmt.text == "SELECT '$$' || ? FROM t"
+    assert stmt.nparams == 1
+
+def test_percent_literal_escaped_only_with_params():
+    query = "SELECT * FROM project_notes WHERE category LIKE '%Gap%' AND id = ?"
+    assert translate(query, "postgres").text == "SELECT * FROM project_notes WHERE category LIKE '%%Gap%%' AND id = %s"
+    assert translate(query, "postgres").numbered == "SELECT * FROM project_notes WHERE category LIKE '%Gap%' AND id = $1"
+    # Sem parâmetros o psycopg2 não interpreta '%'
+    assert translate("SELECT '%Gap%'", "postgres", False).text == "SELECT '%Gap%'"
+
+def test_already_escaped_percent():
+    stmt = translate("SELECT a %% 2 FROM t WHERE b = ?", "postgres")
+    assert stmt.text == "SELECT a %% 2 FROM t WHERE b = %s"
+    assert stmt.numbered == "SELECT a % 2 FROM t WHERE b = $1"
+    assert translate("SELECT a %% 2 FROM t WHERE b = ?", "sqlite").text == "SELECT a % 2 FROM t WHERE b = ?"
+
+def test_statement_name_is_stable():
+    a = translate("SELECT * FROM t WHERE id = ?", "postgres")
+    b = translate("SELECT * FROM t WHERE id = %s", "postgres")
+    c = translate("SELECT * FROM t WHERE id <> ?", "postgres")
+    assert a.name == b.name != c.name
+
+class _Conn:
+    def __init__(self):
+        self.prepared = set()
+    def commit(self):
+        pass
+    def rollback(self):
+        pass
+
+class _Cursor:
+    def __init__(self):
+        self.executed = []
+    def execute(self, sql):
+        self.executed.append(sql)
+
+def test_registry_prepares_after_threshold():
+    reg, conn, cur = StatementRegistry(threshold=2), _Conn(), _Cursor()
+    stmt = translate("SELECT * FROM t WHERE id = ?", "postgres")
+    assert reg.execute_sql(conn, cur, stmt) == stmt.text
+    assert reg.execute_sql(conn, cur, stmt) == f"EXECUTE {stmt.name} (%s)"
+    assert cur.executed == [f"PREPARE {stmt.name} AS SELECT * FROM t WHERE id = $1"]
+    assert reg.execute_sql(conn, cur, stmt) == f"EXECUTE {stmt.name} (%s)"
+    assert len(cur.executed) == 1
+    assert reg.stats()["prepares"] == 1 and reg.stats()["prepared_executes"] == 2
+
+def test_registry_forget_turns_preparing_off():
+    reg, conn, cur = StatementRegistry(threshold=1), _Conn(), _Cursor()
+    stmt = translate("SELECT * FROM t WHERE id = ?", "postgres")
+    reg.execute_sql(conn, cur, stmt)
+    reg.forget(conn, stmt)
+    assert stmt.name not in conn.prepared
+    assert reg.execute_sql(conn, cur, stmt) == stmt.text
+    assert reg.stats()["lost"] == 1 and reg.stats()["threshold"] == 0
+
+def test_registry_ignores_connections_without_prepared():
+    reg = StatementRegistry(threshold=1)
+    stmt = translate("SELECT * FROM t WHERE id = ?", "postgres")
+    assert reg.execute_sql(object(), _Cursor(), stmt) == stmt.text
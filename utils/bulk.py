@@ -0,0 +1,249 @@
+# utils/bulk.py
+"""
+Importação/exportação em massa (CSV ou Parquet).
+
+Importação: lê o arquivo em blocos, valida, resolve o projeto pelo nome ou
+código e grava tudo numa única transação (COPY no Postgres, executemany no
+SQLite). Qualquer erro de validação cancela a importação inteira.
+Exportação: percorre cada tabela com cursor e escreve direto num ZIP em
+disco, sem montar o portfólio inteiro em memória.
+"""
+import csv
+import io
+import tempfile
+import zipfile
+import pandas as pd
+from utils import db
+
+CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+
+PROJECT_STATUS = ["Backlog", "Em andamento", "Em Risco", "Concluído", "Cancelado"]
+TASK_STATUS = ["A fazer", "Fazendo", "Bloqueado", "Feito"]
+PROBABILITY = ["Baixa", "Média", "Alta"]
+IMPACT = ["Baixo", "Médio", "Alto"]
+
+ENTITIES = {
+    "projects": {
+        "label": "Projetos",
+        "columns": ["name", "code", "sponsor", "manager", "start_date", "end_date", "status", "priority", "scope", "results_text", "notes"],
+        "required": ["name"],
+        "dates": ["start_date", "end_date"],
+        "ints": [],
+        "enums": {"status": PROJECT_STATUS},
+        "defaults": {"status": "Backlog"},
+        "fixed": {"date_changes": 0, "archived": 0},
+    },
+    "tasks": {
+        "label": "Tarefas",
+        "columns": ["project_id", "title", "owner", "start_date", "end_date", "status", "priority", "effort", "progress"],
+        "required": ["title"],
+        "dates": ["start_date", "end_date"],
+        "ints": ["effort", "progress"],
+        "enums": {"status": TASK_STATUS},
+        "defaults": {"status": "A fazer", "progress": 0},
+        "fixed": {},
+    },
+    "risks": {
+        "label": "Riscos",
+        "columns": ["project_id", "description", "probability", "impact", "mitigation_plan", "owner", "status"],
+        "required": ["description"],
+        "dates": [],
+        "ints": [],
+        "enums": {"probability": PROBABILITY, "impact": IMPACT},
+        "defaults": {"status": "Ativo"},
+        "fixed": {},
+    },
+}
+
+EXPORT_TABLES = ["projects", "tasks", "task_dependencies", "risks", "project_notes", "team_members", "sponsors"]
+# Colunas derivadas que não fazem sentido no CSV (tsvector da busca)
+EXPORT_SKIP = {"search_tsv"}
+
+def iter_file_chunks(file, filename, chunksize=CHUNK_SIZE):
+    """Lê CSV ou Parquet em blocos de DataFrame (colunas em minúsculo)"""
+    name = filename.lower()
+    if name.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Importar Parquet requer o pacote 'pyarrow'.")
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+            yield chunk
+    elif name.endswith(".csv"):
+        for chunk in pd.read_csv(file, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=[""]):
+            chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+            yield chunk
+    else:
+        raise ValueError("Formato não suportado (use .csv ou .parquet).")
+
+def project_lookup(cursor):
+    """
+    (nome -> id, código -> id, ids existentes) para resolver a coluna 'project'
+    (código tem prioridade) e validar 'project_id' informado direto
+    """
+    cursor.execute("SELECT id, name, code FROM projects")
+    by_name, by_code, ids = {}, {}, set()
+    for pid, name, code in cursor.fetchall():
+        ids.add(pid)
+        if name:
+            by_name.setdefault(str(name).strip().lower(), pid)
+        if code:
+            by_code.setdefault(str(code).strip().lower(), pid)
+    return by_name, by_code, ids
+
+def validate_chunk(chunk, entity, lookup=None, first_row=0):
+    """
+    Normaliza um bloco para as colunas da tabela.
+    Retorna (DataFrame pronto para gravar, lista de erros "linha N: ...").
+    """
+    spec = ENTITIES[entity]
+    errors = []
+    out = pd.DataFrame(index=chunk.index)
+    # Linha do arquivo (1 = cabeçalho)
+    line_no = pd.Series(range(first_row + 2, first_row + 2 + len(chunk)), index=chunk.index)
+
+    def report(mask, msg):
+        mask = mask.fillna(False).astype(bool)
+        for n in line_no[mask].head(MAX_REPORTED_ERRORS):
+            errors.append(f"linha {n}: {msg}")
+
+    # Projeto (FK): project_id direto, ou 'project' por código/nome
+    if "project_id" in spec["columns"]:
+        if "project_id" in chunk.columns:
+            out["project_id"] = pd.to_numeric(chunk["project_id"], errors="coerce").astype("Int64")
+            if lookup is not None:
+                # id inexistente vira erro da linha, não violação de FK no meio do COPY
+                out["project_id"] = out["project_id"].where(out["project_id"].isin(lookup[2]))
+        elif "project" in chunk.columns and lookup is not None:
+            by_name, by_code, _ = lookup
+            key = chunk["project"].astype(str).str.strip().str.lower()
+            out["project_id"] = key.map(by_code).fillna(key.map(by_name)).astype("Int64")
+        else:
+            out["project_id"] = pd.Series(pd.NA, index=chunk.index, dtype="Int64")
+            errors.append("coluna 'project' (nome ou código) ou 'project_id' obrigatória")
+            return out, errors
+        report(out["project_id"].isna(), "projeto não encontrado")
+
+    for col in spec["columns"]:
+        if col == "project_id":
+            continue
+        values = chunk[col] if col in chunk.columns else pd.Series(None, index=chunk.index, dtype=object)
+        if col in spec["defaults"]:
+            values = values.where(values.notna() & (values.astype(str).str.strip() != ""), spec["defaults"][col])
+        if col in spec["dates"]:
+            parsed = pd.to_datetime(values, errors="coerce")
+            report(values.notna() & parsed.isna(), f"data inválida em '{col}'")
+            values = parsed.dt.strftime("%Y-%m-%d").astype(object).where(parsed.notna(), None)
+        elif col in spec["ints"]:
+            parsed = pd.to_numeric(values, errors="coerce")
+            report(values.notna() & parsed.isna(), f"número inválido em '{col}'")
+            values = parsed.round().astype("Int64")
+        elif col in spec["enums"]:
+            allowed = spec["enums"][col]
+            report(values.notna() & ~values.isin(allowed), f"'{col}' deve ser um de {allowed}")
+        out[col] = values
+
+    for col in spec["required"]:
+        report(out[col].isna() | (out[col].astype(str).str.strip() == ""), f"'{col}' obrigatório")
+    if "progress" in out.columns:
+        report(out["progress"].notna() & ~out["progress"].between(0, 100), "'progress' deve estar entre 0 e 100")
+    if "start_date" in out.columns and "end_date" in out.columns:
+        bad = out["start_date"].notna() & out["end_date"].notna() & (out["start_date"] > out["end_date"])
+        report(bad, "'start_date' depois de 'end_date'")
+
+    for col, value in spec["fixed"].items():
+        out[col] = value
+    return out, errors
+
+def _copy_rows(cursor, table, df):
+    """COPY ... FROM STDIN (Postgres): um round-trip por bloco"""
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, na_rep="")
+    buf.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+def _insert_rows(cursor, table, df):
+    """executemany (SQLite)"""
+    cols = ", ".join(df.columns)
+    marks = ", ".join("?" for _ in df.columns)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    cursor.executemany(f"INSERT INTO {table} ({cols}) VALUES ({marks})", rows)
+
+def write_frame(cursor, table, df):
+    """Grava o DataFrame na tabela pelo caminho mais rápido do backend (sem commit)"""
+    if db.is_sqlite():
+        _insert_rows(cursor, table, df)
+    else:
+        _copy_rows(cursor, table, df)
+
+def import_file(file, filename, entity, dry_run=False):
+    """
+    Importa o arquivo para a tabela `entity` (projects/tasks/risks).
+    Retorna {"rows": n, "errors": [...], "imported": bool}. Tudo ou nada.
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Entidade desconhecida: {entity}")
+    total, errors = 0, []
+    with db.connection() as conn:
+        c = conn.cursor()
+        try:
+            lookup = project_lookup(c) if entity != "projects" else None
+            for chunk in iter_file_chunks(file, filename):
+                clean, chunk_errors = validate_chunk(chunk, entity, lookup, first_row=total)
+                total += len(chunk)
+                errors.extend(chunk_errors)
+                if errors:
+                    # Continua só validando para devolver um relatório útil
+                    if len(errors) >= MAX_REPORTED_ERRORS:
+                        break
+                    continue
+                if not dry_run and not clean.empty:
+                    write_frame(c, entity, clean)
+            if errors or dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            c.close()
+    imported = not errors and not dry_run
+    if imported:
+        db.invalidate_cache(entity)
+    return {"rows": total, "errors": errors[:MAX_REPORTED_ERRORS], "imported": imported}
+
+def export_portfolio(tables=EXPORT_TABLES, batch_size=CHUNK_SIZE):
+    """
+    Exporta as tabelas para um ZIP (um CSV por tabela) num arquivo temporário.
+    As linhas vêm do banco em lotes (cursor nomeado no Postgres) e vão direto
+    para o disco. Retorna o arquivo aberto para leitura, posicionado no início.
+    """
+    out = tempfile.TemporaryFile(suffix=".zip")
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf, db.connection() as conn:
+        for table in tables:
+            c = conn.cursor() if db.is_sqlite() else conn.cursor(name=f"export_{table}")
+            try:
+                c.execute(f"SELECT * FROM {table}")
+                rows = c.fetchmany(batch_size)
+                # Cursor nomeado só preenche description depois do primeiro fetch
+                header = [d[0] for d in c.description]
+                keep = [i for i, col in enumerate(header) if col not in EXPORT_SKIP]
+                with zf.open(f"{table}.csv", "w") as raw:
+                    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                    writer = csv.writer(text)
+                    writer.writerow([header[i] for i in keep])
+                    while rows:
+                        if len(keep) < len(header):
+                            rows = [[r[i] for i in keep] for r in rows]
+                        writer.writerows(rows)
+                        rows = c.fetchmany(batch_size)
+                    text.flush()
+                    text.detach()
+            finally:
+                c.close()
+    out.seek(0)
+    return out
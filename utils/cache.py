@@ -0,0 +1,111 @@
+# utils/cache.py
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Tabelas lidas/escritas por um comando SQL (FROM/JOIN/INTO/UPDATE/DELETE FROM)
+_TABLE_RE = re.compile(r'\b(?:from|join|into|update|table(?:\s+if\s+(?:not\s+)?exists)?)\s+"?([a-zA-Z_][a-zA-Z0-9_]*)"?', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+# IN (?, ?, ...) montado com um placeholder por id (load_gantt_tasks, move_tasks no SQLite)
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)', re.IGNORECASE)
+
+def normalize_sql(query):
+    """
+    Remove espaços redundantes para que variações de formatação usem a mesma
+    chave, e reduz listas IN de placeholders a 'IN (...)': o tamanho da lista
+    não cria uma série de métricas nova (os valores continuam nos parâmetros).
+    """
+    return _IN_LIST_RE.sub('IN (...)', _WS_RE.sub(' ', query)).strip().rstrip(';')
+
+def tables_in(query):
+    """Conjunto (minúsculo) de tabelas referenciadas pelo comando"""
+    return {t.lower() for t in _TABLE_RE.findall(query)}
+
+class QueryCache:
+    """
+    Cache LRU com TTL para resultados de SELECT.
+    Chave = SQL normalizado + parâmetros. Cada entrada lembra as tabelas lidas,
+    e `invalidate_tables` descarta tudo que depende de uma tabela escrita.
+    Cada tabela tem um contador de versão (incrementado na invalidação) para
+    quem cacheia derivados dos dados fora daqui, ex: figuras.
+    """
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._versions = {}
+        self._epoch = 0
+
+    @staticmethod
+    def make_key(query, params=()):
+        frozen = tuple(tuple(p) if isinstance(p, (list, set)) else p for p in params) if params else ()
+        return (normalize_sql(query), frozen)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, tables, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tables=None, version=None):
+        """
+        Guarda o resultado. `version` = self.version(tables) lido ANTES de rodar
+        a consulta: se uma escrita nessas tabelas aconteceu no meio, o
+        resultado pode ser anterior a ela e não é guardado.
+        """
+        if tables is None:
+            tables = tables_in(key[0])
+        with self._lock:
+            if version is not None and version != self._version_locked(tables):
+                return False
+            self._data[key] = (value, frozenset(tables), time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+    def invalidate_tables(self, tables):
+        """Remove as entradas que leem qualquer uma das tabelas"""
+        tables = {t.lower() for t in tables}
+        if not tables:
+            return 0
+        with self._lock:
+            for t in tables:
+                self._versions[t] = self._versions.get(t, 0) + 1
+            stale = [k for k, (_, deps, _) in self._data.items() if deps & tables]
+            for k in stale:
+                del self._data[k]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._epoch += 1
+
+    def _version_locked(self, tables):
+        return (self._epoch,) + tuple(self._versions.get(t.lower(), 0) for t in sorted(tables))
+
+    def version(self, tables):
+        """Versão dos dados das tabelas: muda a cada escrita/invalidação que as atinge"""
+        with self._lock:
+            return self._version_locked(tables)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                    "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
@@ -2,134 +2,921 @@
 import streamlit as st
 import pandas as pd
 import psycopg2
+import sqlite3
 import os
+import re
+import threading
+import time
+from datetime import date
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from utils.cache import QueryCache, normalize_sql, tables_in
+from utils import logic, migrations, metrics, schedule, sql
 
-# Função para conectar ao banco
-def get_connection():
+# =========================================================
+# POOL DE CONEXÕES
+# =========================================================
+class PoolExhausted(Exception):
+    """Nenhuma conexão livre dentro do tempo limite."""
+
+class ConnectionPool:
+    """
+    Pool de conexões compartilhado pelo processo (todas as sessões do Streamlit).
+    - Mantém entre `minconn` e `maxconn` conexões abertas
+    - Testa a conexão na retirada (health check) só se ficou ociosa mais de
+      `check_idle_after` segundos ou voltou de um erro; reconecta se estiver morta
+    - Guarda métricas de uso/saturação em `stats()`
+    """
+    def __init__(self, connect, minconn=1, maxconn=10, timeout=10.0, health_check="SELECT 1", check_idle_after=30.0):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Configuração de pool inválida (min/max)")
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check = health_check
+        self.check_idle_after = check_idle_after
+        # (conexão, devolvida em, suspeita): só as ociosas há muito ou suspeitas são testadas
+        self._idle = deque()
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {"created": 0, "checkouts": 0, "waits": 0, "timeouts": 0, "health_checks": 0,
+                       "reconnects": 0, "discarded": 0, "peak_in_use": 0, "wait_time_s": 0.0}
+        for _ in range(minconn):
+            self._idle.append((self._new_conn(), time.monotonic(), False))
+
+    def _new_conn(self):
+        conn = self._connect()
+        self._stats["created"] += 1
+        return conn
+
+    def _is_alive(self, conn, returned_at, suspect):
+        if getattr(conn, "closed", 0):
+            return False
+        if not self.health_check:
+            return True
+        if not suspect and time.monotonic() - returned_at < self.check_idle_after:
+            # Usada há pouco sem erro: o round-trip extra não compensa
+            return True
+        self._stats["health_checks"] += 1
+        try:
+            c = conn.cursor()
+            c.execute(self.health_check)
+            c.fetchall()
+            c.close()
+            # Não deixa transação aberta por causa do health check
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self):
+        """Retira uma conexão saudável do pool (bloqueia até `timeout` se saturado)"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            waited = False
+            t0 = time.monotonic()
+            while not self._idle and self._in_use >= self.maxconn:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolExhausted(f"Pool saturado ({self.maxconn} conexões em uso)")
+                waited = True
+                self._cond.wait(remaining)
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time_s"] += time.monotonic() - t0
+            conn, returned_at, suspect = self._idle.pop() if self._idle else (None, 0.0, False)
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+
+        # Abre/testa fora do lock para não travar as outras sessões
+        try:
+            if conn is not None and not self._is_alive(conn, returned_at, suspect):
+                self._close(conn)
+                self._stats["reconnects"] += 1
+                conn = None
+            if conn is None:
+                conn = self._new_conn()
+            return conn
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn, discard=False, suspect=False):
+        """
+        Devolve a conexão ao pool. `discard=True` fecha (ex: conexão quebrada);
+        `suspect=True` (erro no uso) força o health check na próxima retirada.
+        """
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard or getattr(conn, "closed", 0) or len(self._idle) >= self.maxconn:
+                self._stats["discarded"] += 1
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.monotonic(), suspect))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        except (psycopg2.InterfaceError, psycopg2.OperationalError, sqlite3.ProgrammingError):
+            self.putconn(conn, discard=True)
+            raise
+        except Exception:
+            self.putconn(conn, suspect=True)
+            raise
+        else:
+            self.putconn(conn)
+
+    def stats(self):
+        """Métricas de saturação do pool"""
+        with self._cond:
+            s = dict(self._stats)
+            s.update({"in_use": self._in_use, "idle": len(self._idle),
+                      "minconn": self.minconn, "maxconn": self.maxconn,
+                      "saturation": self._in_use / self.maxconn})
+            return s
+
+    def closeall(self):
+        with self._cond:
+            while self._idle:
+                self._close(self._idle.pop()[0])
+
+def _db_config():
+    """Segredos do Streamlit; fora do app (scripts, benchmark) usa DATABASE_URL"""
     try:
-        # Pega a URL dos segredos
-        db_url = st.secrets["connections"]["supabase"]["url"]
-        # Conecta diretamente usando psycopg2
-        return psycopg2.connect(db_url)
+        return st.secrets["connections"]["supabase"]
+    except Exception:
+        if os.environ.get("DATABASE_URL"):
+            return {"url": os.environ["DATABASE_URL"]}
+        raise
+
+def is_sqlite():
+    """Backend local (SQLite) em vez do Postgres/Supabase"""
+    return str(_db_config()["url"]).startswith("sqlite:///")
+
+class _PgConnection(psycopg2.extensions.connection):
+    """Conexão Postgres que lembra os statements já preparados nela"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def _connect_factory(db_url):
+    if db_url.startswith("sqlite:///"):
+        path = db_url[len("sqlite:///"):]
+        # O sqlite3 já reaproveita statements compilados: só aumenta o cache
+        return lambda: sqlite3.connect(path, check_same_thread=False, cached_statements=512)
+    return lambda: psycopg2.connect(db_url, connection_factory=_PgConnection)
+
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    """Pool único por processo, compartilhado entre sessões"""
+    cfg = _db_config()
+    return ConnectionPool(
+        _connect_factory(str(cfg["url"])),
+        minconn=int(cfg.get("pool_min", 1)),
+        maxconn=int(cfg.get("pool_max", 10)),
+        timeout=float(cfg.get("pool_timeout", 10)),
+        check_idle_after=float(cfg.get("pool_check_idle_after", 30)),
+    )
+
+@contextmanager
+def connection():
+    """Empresta uma conexão do pool e devolve ao final do bloco"""
+    with get_pool().connection() as conn:
+        yield conn
+
+# Porta do pooler do Supabase em modo transação: cada transação pode cair em
+# outro backend, que não conhece os statements preparados nos anteriores
+TRANSACTION_POOLER_PORTS = {6543}
+
+@st.cache_resource(show_spinner=False)
+def get_statement_registry():
+    """
+    Statements preparados no servidor. Desligado por padrão; ligue com
+    prepare_threshold > 0 só em conexão direta (ignorado atrás do pooler).
+    """
+    cfg = _db_config()
+    threshold = int(cfg.get("prepare_threshold", 0))
+    try:
+        if urlsplit(str(cfg["url"])).port in TRANSACTION_POOLER_PORTS:
+            threshold = 0
+    except ValueError:
+        pass
+    return sql.StatementRegistry(threshold=threshold)
+
+def pool_stats():
+    try:
+        return get_pool().stats()
+    except Exception:
+        return {}
+
+# =========================================================
+# SCHEMA (migrações em utils/migrations.py)
+# =========================================================
+# Tabelas base de cada view/snapshot (para o cache saber o que invalidar)
+VIEW_DEPENDENCIES = {
+    "project_kpis": {"projects", "tasks", "risks", "project_notes"},
+    "project_health": {"projects", "tasks", "risks", "project_notes"},
+    "search_fts": {"projects", "tasks", "risks", "project_notes"},
+}
+
+def migrate():
+    """Aplica as migrações pendentes (inclui os dados iniciais). Propaga erros"""
+    with connection() as conn:
+        applied = migrations.run_migrations(conn, "sqlite" if is_sqlite() else "postgres")
+    if applied:
+        # Estrutura mudou: nada do cache é confiável
+        invalidate_cache()
+    return applied
+
+def init_db():
+    """Cria/atualiza as tabelas (mostra o erro na tela em vez de propagar)"""
+    try:
+        migrate()
+        return True
     except Exception as e:
+        st.error(f"Erro ao criar tabelas: {e}")
+        return False
+
+@st.cache_resource(show_spinner=False)
+def bootstrap():
+    """
+    Schema + seed uma vez por processo. As sessões seguintes não fazem nenhum
+    round-trip; a marca durável entre deploys é a tabela schema_migrations.
+    Em caso de erro nada fica em cache e a próxima sessão tenta de novo.
+    """
+    return migrate()
+
+# =========================================================
+# TIPOS DAS COLUNAS (APLICADOS UMA VEZ, NA CARGA)
+# =========================================================
+# Mesmo nome de coluna = mesmo tipo em qualquer tabela/join. Datas viram
+# datetime64 (NaT se vazio), enums de baixa cardinalidade viram category e
+# esforço/avanço/flags viram inteiro anulável. O resto do app pode usar .dt e
+# comparar direto, sem pd.to_datetime por linha.
+DATE_COLUMNS = ['start_date', 'end_date', 'created_at']
+CATEGORY_COLUMNS = ['status', 'priority', 'probability', 'impact', 'category']
+INT_COLUMNS = ['project_id', 'effort', 'progress', 'date_changes', 'archived', 'weekly_capacity', 'lag_days']
+# Flags com DEFAULT no banco: nulo vira 0 (bool(pd.NA) quebraria a tela)
+INT_DEFAULTS = {'date_changes': 0, 'archived': 0, 'weekly_capacity': 40}
+# Colunas que só são inteiras na tabela: agregadas (avanço ponderado) vêm com casas decimais
+AGGREGATE_FLOATS = ('progress',)
+
+def coerce_types(df, floats=()):
+    """
+    Converte as colunas conhecidas para os tipos compactos (in place e devolve).
+    `floats`: colunas de INT_COLUMNS que vêm de agregação e ficam float64.
+    """
+    if df.empty and len(df.columns) == 0:
+        return df
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in floats:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in INT_COLUMNS:
+        if col in df.columns and col not in floats and df[col].dtype != 'Int64':
+            values = pd.to_numeric(df[col], errors='coerce').round()
+            if col in INT_DEFAULTS:
+                values = values.fillna(INT_DEFAULTS[col])
+            df[col] = values.astype('Int64')
+    return df
+
+# =========================================================
+# CACHE DE CONSULTAS
+# =========================================================
+@st.cache_resource(show_spinner=False)
+def get_query_cache():
+    """Cache de SELECTs compartilhado pelo processo (invalidado a cada escrita)"""
+    cfg = _db_config()
+    return QueryCache(maxsize=int(cfg.get("cache_size", 256)), ttl=float(cfg.get("cache_ttl", 300)))
+
+def invalidate_cache(*tables):
+    """Descarta o cache das tabelas informadas (ou todo o cache se nenhuma)"""
+    cache = get_query_cache()
+    if tables:
+        cache.invalidate_tables(tables)
+    else:
+        cache.clear()
+
+def data_version(*tables):
+    """Chave de versão dos dados (views expandidas nas tabelas base) para caches derivados"""
+    deps = set()
+    for t in tables:
+        deps |= VIEW_DEPENDENCIES.get(t, {t})
+    return get_query_cache().version(deps)
+
+def _read_tables(query):
+    """Tabelas lidas pela query, expandindo views nas suas tabelas base"""
+    tables = set(tables_in(query))
+    for view, deps in VIEW_DEPENDENCIES.items():
+        if view in tables:
+            tables |= deps
+    return tables
+
+def _statement_sql(conn, stmt, cursor=None):
+    """Texto a executar: EXECUTE do statement preparado quando ele é 'quente'"""
+    if is_sqlite():
+        return stmt.text
+    own = cursor is None
+    c = conn.cursor() if own else cursor
+    try:
+        return get_statement_registry().execute_sql(conn, c, stmt)
+    finally:
+        if own:
+            c.close()
+
+# SQLSTATE invalid_sql_statement_name: "prepared statement ... does not exist"
+_UNKNOWN_STATEMENT = "26000"
+
+def _execute(conn, stmt, run, cursor=None):
+    """
+    run(sql) com o EXECUTE do statement preparado quando ele é quente. Se o
+    backend não conhece o statement (pooler em modo transação), esquece o nome
+    nesta conexão e repete uma vez com o SQL puro.
+    """
+    text = _statement_sql(conn, stmt, cursor)
+    try:
+        return run(text)
+    except Exception as e:
+        code = getattr(e, "pgcode", None) or getattr(e.__cause__, "pgcode", None)
+        if text == stmt.text or code != _UNKNOWN_STATEMENT:
+            raise
+        conn.rollback()
+        get_statement_registry().forget(conn, stmt)
+        return run(stmt.text)
+
+def run_query(query, params=(), fetch=True, cache=True, typed=True, floats=()):
+    """
+    Roda query SQL traduzindo os placeholders (? ou %s) para o banco em uso.
+    `typed` aplica coerce_types no resultado; `floats` vai para ele (colunas agregadas).
+    """
+    # O app usa '?' (padrão SQLite) e '%s' (Postgres) misturados.
+    # sql.translate converte uma vez por texto, sem mexer em literais.
+    try:
+        dialect = "sqlite" if is_sqlite() else "postgres"
+    except Exception as e:
+        # Segredos/DATABASE_URL ausentes ou inválidos: mesmo aviso de antes do pool
         st.error(f"Erro de Conexão com o Banco: {e}")
-        return None
+        return pd.DataFrame() if fetch else None
+    stmt = sql.translate(query, dialect, bool(params))
+    # Sem parâmetros o psycopg2 não deve interpretar '%' (None); o sqlite3 exige sequência
+    db_params = params if params else (() if dialect == "sqlite" else None)
 
-def init_db():
-    """Cria as tabelas se não existirem"""
-    conn = get_connection()
-    if not conn: return
+    key = None
+    if fetch and cache:
+        key = QueryCache.make_key(query, params)
+        hit = get_query_cache().get(key)
+        if hit is not None:
+            if metrics.enabled():
+                metrics.record_cache_hit("query", key[0])
+            # Cópia: as páginas alteram os DataFrames localmente
+            return hit.copy()
+        # Versão antes de ler: se uma escrita terminar durante a leitura, o
+        # resultado (talvez anterior a ela) não entra no cache
+        read_tables = _read_tables(query)
+        read_version = get_query_cache().version(read_tables)
     
+    t0 = time.perf_counter()
     try:
+        with connection() as conn:
+            if fetch:
+                # Para SELECT (Ler dados)
+                df = _execute(conn, stmt, lambda text: pd.read_sql(text, conn, params=db_params))
+                if typed:
+                    coerce_types(df, floats)
+                if key is not None:
+                    get_query_cache().set(key, df.copy(), read_tables, read_version)
+                if metrics.enabled():
+                    metrics.record("query", normalize_sql(query), time.perf_counter() - t0,
+                                   rows=len(df), nbytes=int(df.memory_usage(index=False).sum()))
+                return df
+            else:
+                # Para INSERT/UPDATE/DELETE (Escrever dados)
+                c = conn.cursor()
+                _execute(conn, stmt, lambda text: c.execute(text, db_params), c)
+                rowcount = c.rowcount
+                conn.commit()
+                c.close()
+                # Quem escreveu (e as outras sessões) enxerga o dado novo na hora
+                get_query_cache().invalidate_tables(tables_in(query))
+                if metrics.enabled():
+                    metrics.record("query", normalize_sql(query), time.perf_counter() - t0, rows=max(rowcount, 0))
+                return max(rowcount, 0)
+    except Exception as e:
+        st.error(f"Erro na Query: {e}")
+        return pd.DataFrame() if fetch else None
+
+def execute_command(query, params=()):
+    """Escrita: devolve o nº de linhas afetadas, ou None se falhou (erro já exibido)"""
+    return run_query(query, params, fetch=False)
+
+def move_tasks(task_ids, status, progress=None):
+    """
+    Move várias tarefas para `status` num único UPDATE/transação.
+    `progress=None` mantém o avanço atual de cada tarefa. Devolve como
+    `execute_command` (linhas afetadas ou None).
+    """
+    ids = [int(i) for i in task_ids]
+    if not ids:
+        return None
+    if is_sqlite():
+        # SQLite não tem ANY(array): IN com um placeholder por id
+        where = f"id IN ({', '.join('?' for _ in ids)})"
+        params = (status, progress, *ids)
+    else:
+        where = "id = ANY(%s)"
+        params = (status, progress, ids)
+    return execute_command(f"UPDATE tasks SET status = ?, progress = COALESCE(?, progress) WHERE {where}", params)
+
+# =========================================================
+# LEITURAS AGREGADAS
+# =========================================================
+def load_project_kpis(include_archived=False):
+    """
+    Uma linha por projeto com os agregados do dashboard, lidos do snapshot
+    project_health (mantido por triggers), sem varrer tarefas/riscos.
+    O avanço vem exato do banco e é arredondado aqui (logic.round_progress).
+    """
+    ensure_health_fresh()
+    cols = ", ".join(f"COALESCE(h.{c}, 0) AS {c}" for c in migrations.HEALTH_COLUMNS)
+    query = f"""
+        SELECT p.id AS project_id, p.name, p.sponsor, p.manager, p.status,
+               p.start_date, p.end_date, p.archived, {cols}, h.refreshed_at
+        FROM projects p LEFT JOIN project_health h ON h.project_id = p.id
+    """
+    if not include_archived:
+        query += " WHERE p.archived = 0"
+    df = run_query(query, floats=AGGREGATE_FLOATS)
+    if not df.empty:
+        df['progress'] = logic.round_progress(df['progress'])
+    return df
+
+def refresh_project_health():
+    """Recálculo completo do snapshot (corrige atrasos que mudam só com a data)"""
+    dialect = "sqlite" if is_sqlite() else "postgres"
+    with connection() as conn:
         c = conn.cursor()
-        
-        # 1. Projetos
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id SERIAL PRIMARY KEY,
-                name TEXT, code TEXT, sponsor TEXT, manager TEXT,
-                start_date DATE, end_date DATE, status TEXT, priority TEXT,
-                scope TEXT, results_text TEXT, date_changes INTEGER DEFAULT 0,
-                archived INTEGER DEFAULT 0, notes TEXT
-            );
-        """)
-        
-        # 2. Tarefas
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id SERIAL PRIMARY KEY,
-                project_id INTEGER REFERENCES projects(id),
-                title TEXT, owner TEXT, start_date DATE, end_date DATE,
-                status TEXT, priority TEXT, effort INTEGER, progress INTEGER
-            );
-        """)
-        
-        # 3. Riscos
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS risks (
-                id SERIAL PRIMARY KEY,
-                project_id INTEGER REFERENCES projects(id),
-                description TEXT, probability TEXT, impact TEXT,
-                mitigation_plan TEXT, owner TEXT, status TEXT DEFAULT 'Ativo'
-            );
-        """)
-
-        # 4. Gaps/Notas
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS project_notes (
-                id SERIAL PRIMARY KEY,
-                project_id INTEGER REFERENCES projects(id),
-                category TEXT, description TEXT, link_url TEXT, created_at DATE
-            );
-        """)
-
-        # 5. Áreas
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS sponsors (name TEXT PRIMARY KEY);
-        """)
-
-        # 6. Equipe
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS team_members (
-                id SERIAL PRIMARY KEY,
-                name TEXT, role TEXT, area TEXT, email TEXT, phone TEXT
-            );
-        """)
-        
+        c.execute("DELETE FROM project_health")
+        c.execute(migrations.health_refresh_sql(dialect))
         conn.commit()
         c.close()
-        conn.close()
-        
-        check_seed()
-        
+    invalidate_cache("project_health")
+
+@st.cache_resource(show_spinner=False)
+def _daily_health_refresh(day):
+    refresh_project_health()
+    return day
+
+def ensure_health_fresh():
+    """Recálculo 'noturno': a primeira leitura de cada dia (por processo) refaz o snapshot"""
+    try:
+        _daily_health_refresh(date.today().isoformat())
     except Exception as e:
-        st.error(f"Erro ao criar tabelas: {e}")
+        st.error(f"Erro ao atualizar project_health: {e}")
 
-def check_seed():
-    """Insere dados iniciais se o banco estiver vazio"""
-    df = run_query("SELECT count(*) as cnt FROM projects")
-    if not df.empty and df.iloc[0]['cnt'] == 0:
-        from datetime import date, timedelta
-        today = date.today()
-        
-        # Insere Projeto Exemplo
-        execute_command(
-            "INSERT INTO projects (name, manager, start_date, end_date, status, date_changes, archived, notes) VALUES (%s, %s, %s, %s, %s, 0, 0, '')", 
-            ("Exemplo Supabase", "Gerente", today, today+timedelta(30), "Em andamento")
-        )
-        
-        # Insere Áreas
-        areas = ["Geral", "TI", "RH", "Financeiro", "Marketing", "Operações", "Comercial", "Logística"]
-        for area in areas:
-            execute_command("INSERT INTO sponsors (name) VALUES (%s) ON CONFLICT DO NOTHING", (area,))
-
-def run_query(query, params=(), fetch=True):
-    """Roda query SQL e trata conversão de ? para %s"""
-    conn = get_connection()
-    if not conn: return pd.DataFrame() if fetch else None
-    
-    # TRUQUE IMPORTANTE:
-    # O app usa '?' (padrão SQLite) mas Postgres usa '%s'.
-    # Substituímos automaticamente aqui para não precisar reescrever o main.py
-    postgres_query = query.replace('?', '%s')
-    
+# =========================================================
+# LEITURAS CONCORRENTES
+# =========================================================
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Streamlit antigo: threads sem contexto (st.error só vai ao log)
+    add_script_run_ctx = get_script_run_ctx = None
+
+@st.cache_resource(show_spinner=False)
+def _loader_executor():
+    """Threads compartilhadas para leituras independentes (limitadas pelo pool)"""
+    return ThreadPoolExecutor(max_workers=max(1, min(8, get_pool().maxconn)), thread_name_prefix="db-load")
+
+def load_many(**loaders):
+    """
+    Executa leituras independentes em paralelo, cada uma na sua conexão do pool.
+    Uso: load_many(active=load_projects, gaps=load_active_gaps) -> {"active": df, "gaps": df}
+    O tempo total fica perto da leitura mais lenta, não da soma de todas.
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+
+    def call(fn):
+        # Propaga o contexto da sessão para st.error/st.cache funcionarem na thread
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+
+    if len(loaders) <= 1:
+        return {name: fn() for name, fn in loaders.items()}
+    executor = _loader_executor()
+    futures = {name: executor.submit(call, fn) for name, fn in loaders.items()}
+    return {name: f.result() for name, f in futures.items()}
+
+# =========================================================
+# CAMADA DE ACESSO POR PÁGINA
+# =========================================================
+# Cada página pede só as colunas/linhas que mostra. Colunas de texto longo
+# (scope, results_text, notes, mitigation_plan) ficam fora das listagens.
+PROJECT_LIST_COLS = ['id', 'name', 'code', 'sponsor', 'manager', 'start_date', 'end_date', 'status', 'priority', 'date_changes', 'archived']
+TASK_CARD_COLS = ['id', 'project_id', 'title', 'owner', 'status', 'progress']
+RISK_COLS = ['id', 'project_id', 'description', 'probability', 'impact', 'mitigation_plan', 'owner', 'status']
+NOTE_COLS = ['id', 'project_id', 'category', 'description', 'link_url', 'created_at']
+PROJECT_DETAIL_COLS = PROJECT_LIST_COLS + ['scope', 'results_text', 'notes']
+
+def _select(table, columns, where="", params=(), order_by=""):
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    df = run_query(query, params)
+    # Erro na query devolve DataFrame vazio sem colunas: mantém o formato esperado
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_projects(archived=0, columns=None):
+    """Lista de projetos (ativos por padrão) sem as colunas de texto longo"""
+    return _select("projects", columns or PROJECT_LIST_COLS, "archived = ?", (archived,), "id")
+
+def load_project(project_id):
+    """Registro completo de um projeto (inclui scope/results_text/notes)"""
+    df = run_query(f"SELECT {', '.join(PROJECT_DETAIL_COLS)} FROM projects WHERE id = ?", (int(project_id),))
+    return None if df.empty else df.iloc[0]
+
+def load_archived_projects():
+    return load_projects(archived=1, columns=['id', 'name', 'manager', 'end_date', 'results_text'])
+
+def load_tasks(project_id, columns=None):
+    """Tarefas de um único projeto (Kanban)"""
+    return _select("tasks", columns or TASK_CARD_COLS, "project_id = ?", (int(project_id),), "id")
+
+MAX_GANTT_BARS = 200
+# Peso de cada tarefa no avanço do projeto: esforço (mínimo 1)
+_TASK_WEIGHT = "CASE WHEN t.effort > 0 THEN t.effort ELSE 1 END"
+
+def load_gantt_projects(start=None, end=None, limit=MAX_GANTT_BARS, offset=0):
+    """
+    Uma barra por projeto ativo (Cronograma): início = menor início das
+    tarefas, fim = maior fim (datas do projeto se não houver tarefas) e avanço
+    ponderado pelo esforço. Só barras que cruzam [start, end), paginadas.
+    Colunas: project_id, name, status, start_date, end_date, task_count, progress, total
+    """
+    columns = ['project_id', 'name', 'status', 'start_date', 'end_date', 'task_count', 'progress', 'total']
+    where, params = [], []
+    if start is not None:
+        where.append("g.end_date >= ?")
+        params.append(pd.Timestamp(start).date().isoformat())
+    if end is not None:
+        where.append("g.start_date < ?")
+        params.append(pd.Timestamp(end).date().isoformat())
+    df = run_query(f"""
+        SELECT g.*, COUNT(*) OVER () AS total FROM (
+            SELECT p.id AS project_id, p.name, p.status,
+                   COALESCE(MIN(t.start_date), p.start_date) AS start_date,
+                   COALESCE(MAX(t.end_date), p.end_date) AS end_date,
+                   COUNT(t.id) AS task_count,
+                   COALESCE(SUM(t.progress * {_TASK_WEIGHT}) * 1.0 / NULLIF(SUM({_TASK_WEIGHT}), 0), 0) AS progress
+            FROM projects p LEFT JOIN tasks t ON t.project_id = p.id
+            WHERE p.archived = 0
+            GROUP BY p.id, p.name, p.status, p.start_date, p.end_date
+        ) g
+        WHERE {" AND ".join(where) or "1 = 1"}
+        ORDER BY g.start_date, g.project_id
+        LIMIT ? OFFSET ?
+    """, (*params, int(limit), int(offset)), floats=AGGREGATE_FLOATS)
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns), AGGREGATE_FLOATS)
+
+def load_gantt_tasks(project_ids=None, start=None, end=None, limit=MAX_GANTT_BARS):
+    """
+    Tarefas dos projetos ativos já com o nome do projeto (Cronograma).
+    `project_ids` restringe aos projetos expandidos; start/end filtram a janela.
+    """
+    columns = ['id', 'project_id', 'name', 'title', 'start_date', 'end_date', 'status', 'progress']
+    where, params = ["p.archived = 0"], []
+    if project_ids is not None:
+        ids = [int(i) for i in project_ids]
+        if not ids:
+            return coerce_types(pd.DataFrame(columns=columns))
+        where.append(f"t.project_id IN ({', '.join('?' for _ in ids)})")
+        params += ids
+    if start is not None:
+        where.append("t.end_date >= ?")
+        params.append(pd.Timestamp(start).date().isoformat())
+    if end is not None:
+        where.append("t.start_date < ?")
+        params.append(pd.Timestamp(end).date().isoformat())
+    df = run_query(f"""
+        SELECT t.id, t.project_id, p.name, t.title, t.start_date, t.end_date, t.status, t.progress
+        FROM tasks t JOIN projects p ON p.id = t.project_id
+        WHERE {" AND ".join(where)}
+        ORDER BY t.project_id, t.start_date, t.id
+        LIMIT ?
+    """, (*params, int(limit)))
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_risks(project_id, columns=None):
+    return _select("risks", columns or RISK_COLS, "project_id = ?", (int(project_id),), "id")
+
+def load_notes(project_id, columns=None):
+    return _select("project_notes", columns or NOTE_COLS, "project_id = ?", (int(project_id),), "id")
+
+MAX_CALENDAR_EVENTS = 1000
+
+def load_calendar_events(start, end, include_tasks=True, limit=MAX_CALENDAR_EVENTS):
+    """
+    Eventos da agenda que cruzam [start, end): projetos ativos (período) e
+    prazos de tarefas abertas. Consulta por faixa de datas indexada; o cache
+    fica por janela e é invalidado quando projetos/tarefas mudam.
+    Colunas: kind, id, project_id, project_name, title, owner, status, start_date, end_date
+    """
+    columns = ['kind', 'id', 'project_id', 'project_name', 'title', 'owner', 'status', 'start_date', 'end_date']
+    start, end = pd.Timestamp(start).date().isoformat(), pd.Timestamp(end).date().isoformat()
+    query = """
+        SELECT 'project' AS kind, p.id, p.id AS project_id, p.name AS project_name, p.name AS title,
+               p.manager AS owner, p.status, p.start_date, p.end_date
+        FROM projects p
+        WHERE p.archived = 0 AND p.end_date >= ? AND p.start_date < ?
+    """
+    params = [start, end]
+    if include_tasks:
+        query += """
+        UNION ALL
+        SELECT 'task', t.id, t.project_id, p.name, t.title, t.owner, t.status, t.end_date, t.end_date
+        FROM tasks t JOIN projects p ON p.id = t.project_id
+        WHERE p.archived = 0 AND t.end_date >= ? AND t.end_date < ? AND t.status <> 'Feito'
+        """
+        params += [start, end]
+    # Projetos primeiro: se a janela passar do limite, cortam-se prazos de tarefas
+    query += " ORDER BY kind, start_date LIMIT ?"
+    df = run_query(query, (*params, int(limit)))
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_active_gaps():
+    """GAPs (impeditivos) dos projetos ativos: project_id, description"""
+    columns = ['id', 'project_id', 'description']
+    df = run_query("""
+        SELECT n.id, n.project_id, n.description
+        FROM project_notes n JOIN projects p ON p.id = n.project_id
+        WHERE p.archived = 0 AND n.category LIKE ?
+        ORDER BY n.id
+    """, ('%Gap%',))
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_risk_summary():
+    """Quantidade de riscos por projeto/probabilidade (projetos ativos)"""
+    columns = ['project_id', 'probability', 'cnt']
+    df = run_query("""
+        SELECT r.project_id, r.probability, COUNT(*) AS cnt
+        FROM risks r JOIN projects p ON p.id = r.project_id
+        WHERE p.archived = 0
+        GROUP BY r.project_id, r.probability
+    """)
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+# =========================================================
+# DEPENDÊNCIAS E CRONOGRAMA PREVISTO
+# =========================================================
+def _project_scope(col, project_id=None, project_ids=None):
+    """(condição, parâmetros) para um projeto, uma lista de projetos ou todos (None)"""
+    if project_id is not None:
+        return f"{col} = ?", (int(project_id),)
+    if project_ids is not None:
+        ids = [int(i) for i in project_ids]
+        if not ids:
+            return "1 = 0", ()
+        return f"{col} IN ({', '.join('?' for _ in ids)})", tuple(ids)
+    return "", ()
+
+def load_schedule_tasks(project_id=None, with_dependencies=False, project_ids=None):
+    """
+    Tarefas dos projetos ativos para o motor de caminho crítico (um projeto,
+    os da lista `project_ids` ou todos). `with_dependencies`: só projetos com
+    alguma dependência cadastrada.
+    """
+    columns = ['id', 'project_id', 'title', 'owner', 'start_date', 'end_date', 'status']
+    where = "p.archived = 0"
+    scope, params = _project_scope("t.project_id", project_id, project_ids)
+    if scope:
+        where += f" AND {scope}"
+    if with_dependencies:
+        where += " AND t.project_id IN (SELECT project_id FROM task_dependencies)"
+    df = run_query(f"""
+        SELECT t.id, t.project_id, t.title, t.owner, t.start_date, t.end_date, t.status
+        FROM tasks t JOIN projects p ON p.id = t.project_id
+        WHERE {where}
+        ORDER BY t.id
+    """, params)
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_dependencies(project_id=None, project_ids=None):
+    """Arestas término -> início: id, project_id, predecessor_id, successor_id, lag_days"""
+    columns = ['id', 'project_id', 'predecessor_id', 'successor_id', 'lag_days']
+    scope, params = _project_scope("project_id", project_id, project_ids)
+    return _select("task_dependencies", columns, scope, params, "id")
+
+def load_schedule(project_id=None, with_dependencies=False, project_ids=None):
+    """Schedule (utils/schedule.py) das tarefas ativas. Levanta schedule.CycleError"""
+    return schedule.Schedule(load_schedule_tasks(project_id, with_dependencies, project_ids),
+                             load_dependencies(project_id, project_ids))
+
+def add_dependency(predecessor_id, successor_id, lag_days=0):
+    """Cria a aresta predecessor -> successor (mesmo projeto). ValueError/CycleError se inválida"""
+    pred, succ = int(predecessor_id), int(successor_id)
+    owners = run_query("SELECT id, project_id FROM tasks WHERE id IN (?, ?)", (pred, succ), typed=False)
+    projects = dict(zip(owners['id'], owners['project_id'])) if not owners.empty else {}
+    if pred not in projects or succ not in projects:
+        raise ValueError("Tarefa não encontrada.")
+    if projects[pred] != projects[succ]:
+        raise ValueError("Dependências só entre tarefas do mesmo projeto.")
+    deps = load_dependencies(projects[pred])
+    if schedule.creates_cycle(deps, pred, succ):
+        raise schedule.CycleError([pred, succ])
+    return execute_command(
+        "INSERT INTO task_dependencies (project_id, predecessor_id, successor_id, lag_days) VALUES (?, ?, ?, ?)",
+        (int(projects[pred]), pred, succ, int(lag_days)))
+
+def remove_dependency(dependency_id):
+    return execute_command("DELETE FROM task_dependencies WHERE id = ?", (int(dependency_id),))
+
+def reschedule_tasks(changes):
+    """
+    Grava novas datas [(task_id, start, end), ...] numa única transação
+    (ex: deslize propagado por Schedule.shift). Devolve como `execute_command`
+    (nº de tarefas gravadas, ou None se falhou, erro já exibido).
+    """
+    rows = [(pd.Timestamp(s).date().isoformat(), pd.Timestamp(e).date().isoformat(), int(tid)) for tid, s, e in changes]
+    if not rows:
+        return 0
     try:
-        if fetch:
-            # Para SELECT (Ler dados)
-            df = pd.read_sql(postgres_query, conn, params=params)
-            conn.close()
-            return df
-        else:
-            # Para INSERT/UPDATE/DELETE (Escrever dados)
+        stmt = sql.translate("UPDATE tasks SET start_date = ?, end_date = ? WHERE id = ?", "sqlite" if is_sqlite() else "postgres", True)
+        with connection() as conn:
             c = conn.cursor()
-            c.execute(postgres_query, params)
-            conn.commit()
-            conn.close()
-            return None
+            try:
+                c.executemany(stmt.text, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                c.close()
     except Exception as e:
+        # Chamado por on_click: erro na tela, não traceback na página
         st.error(f"Erro na Query: {e}")
-        if conn: conn.close()
-        return pd.DataFrame() if fetch else None
+        return None
+    invalidate_cache("tasks")
+    return len(rows)
 
-def execute_command(query, params=()):
-    return run_query(query, params, fetch=False)
+# Probabilidade/impacto -> nível 1..3 (texto desconhecido conta como médio)
+def _risk_level(col):
+    return f"CASE WHEN {col} IN ('Alta', 'Alto') THEN 3 WHEN {col} IN ('Baixa', 'Baixo') THEN 1 ELSE 2 END"
+
+def _risk_filters(sponsor=None, project_id=None):
+    where, params = ["p.archived = 0"], []
+    if sponsor:
+        where.append("p.sponsor = ?")
+        params.append(sponsor)
+    if project_id is not None:
+        where.append("r.project_id = ?")
+        params.append(int(project_id))
+    return where, params
+
+def load_risk_matrix(sponsor=None, project_id=None):
+    """
+    Riscos dos projetos ativos agregados na matriz 3x3 (GROUP BY no banco):
+    prob_level, impact_level, cnt, projects. Filtros por área (sponsor) ou projeto.
+    """
+    columns = ['prob_level', 'impact_level', 'cnt', 'projects']
+    where, params = _risk_filters(sponsor, project_id)
+    df = run_query(f"""
+        SELECT {_risk_level('r.probability')} AS prob_level, {_risk_level('r.impact')} AS impact_level,
+               COUNT(*) AS cnt, COUNT(DISTINCT r.project_id) AS projects
+        FROM risks r JOIN projects p ON p.id = r.project_id
+        WHERE {" AND ".join(where)}
+        GROUP BY prob_level, impact_level
+    """, params)
+    return df if not df.empty else pd.DataFrame(columns=columns)
+
+def load_risk_cell(prob_level, impact_level, sponsor=None, project_id=None, limit=500):
+    """Riscos de uma célula da matriz (drill-down), com o nome do projeto"""
+    columns = ['id', 'project_id', 'name', 'description', 'probability', 'impact', 'mitigation_plan', 'owner', 'status']
+    where, params = _risk_filters(sponsor, project_id)
+    where += [f"{_risk_level('r.probability')} = ?", f"{_risk_level('r.impact')} = ?"]
+    params += [int(prob_level), int(impact_level)]
+    df = run_query(f"""
+        SELECT r.id, r.project_id, p.name, r.description, r.probability, r.impact,
+               r.mitigation_plan, r.owner, r.status
+        FROM risks r JOIN projects p ON p.id = r.project_id
+        WHERE {" AND ".join(where)}
+        ORDER BY p.name, r.id
+        LIMIT ?
+    """, (*params, int(limit)))
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_team():
+    return _select("team_members", ['id', 'name', 'role', 'area', 'email', 'phone', 'weekly_capacity'], order_by="name")
+
+def load_workload_tasks(start, end):
+    """
+    Tarefas abertas com responsável e esforço que cruzam [start, end), dos
+    projetos ativos: owner, start_date, end_date, effort (motor de carga).
+    """
+    columns = ['owner', 'start_date', 'end_date', 'effort']
+    df = run_query("""
+        SELECT t.owner, t.start_date, t.end_date, t.effort
+        FROM tasks t JOIN projects p ON p.id = t.project_id
+        WHERE p.archived = 0 AND t.status <> 'Feito' AND t.effort > 0 AND t.owner IS NOT NULL
+          AND t.end_date >= ? AND t.start_date < ?
+    """, (pd.Timestamp(start).date().isoformat(), pd.Timestamp(end).date().isoformat()))
+    return df if not df.empty else coerce_types(pd.DataFrame(columns=columns))
+
+def load_sponsors():
+    df = run_query("SELECT name FROM sponsors ORDER BY name ASC")
+    return df['name'].tolist() if not df.empty else []
+
+# =========================================================
+# BUSCA GLOBAL
+# =========================================================
+SEARCH_COLS = ['entity', 'entity_id', 'project_id', 'project_name', 'title', 'snippet', 'rank']
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+def _search_terms(text):
+    """Palavras do texto digitado (sem operadores/aspas), no máximo 8"""
+    return _SEARCH_TERM.findall(text or "")[:8]
+
+def _search_postgres(terms, limit):
+    # 'proj & risc' -> 'proj:* & risc:*': prefixo + stemming português
+    tsquery = " & ".join(f"{t}:*" for t in terms)
+    parts = []
+    for table, (entity, _, pcol, fields) in migrations.SEARCH_SOURCES.items():
+        title, body = fields[0][1], fields[1][1]
+        parts.append(f"""
+            SELECT '{entity}' AS entity, s.id AS entity_id, s.{pcol} AS project_id,
+                   s.{title} AS title, LEFT(COALESCE(s.{body}, ''), 160) AS snippet,
+                   ts_rank(s.search_tsv, q.query) AS rank
+            FROM {table} s, q WHERE s.search_tsv @@ q.query""")
+    query = f"""
+        WITH q AS (SELECT to_tsquery('portuguese', ?) AS query),
+        hits AS ({" UNION ALL ".join(parts)})
+        SELECT h.entity, h.entity_id, h.project_id, p.name AS project_name, h.title, h.snippet, h.rank
+        FROM hits h LEFT JOIN projects p ON p.id = h.project_id
+        ORDER BY h.rank DESC LIMIT ?
+    """
+    return run_query(query, (tsquery, limit), typed=False)
+
+def _has_fts():
+    return not run_query("SELECT name FROM sqlite_master WHERE name = 'search_fts'", typed=False).empty
+
+def _search_sqlite(terms, limit):
+    if not _has_fts():
+        # SQLite sem FTS5: LIKE só nos títulos dos projetos/tarefas
+        like = "%" + "%".join(terms) + "%"
+        return run_query("""
+            SELECT 'project' AS entity, id AS entity_id, id AS project_id, name AS project_name,
+                   name AS title, '' AS snippet, 0 AS rank FROM projects WHERE name LIKE ?
+            UNION ALL
+            SELECT 'task', t.id, t.project_id, p.name, t.title, '', 0
+            FROM tasks t LEFT JOIN projects p ON p.id = t.project_id WHERE t.title LIKE ?
+            LIMIT ?
+        """, (like, like, limit), typed=False)
+    match = " ".join('"' + t.replace('"', '') + '"*' for t in terms)
+    # bm25: menor = mais relevante; título pesa 4x o corpo
+    return run_query("""
+        SELECT f.entity, f.entity_id, f.project_id, p.name AS project_name, f.title,
+               substr(f.body, 1, 160) AS snippet, -bm25(search_fts, 4.0, 1.0) AS rank
+        FROM search_fts f LEFT JOIN projects p ON p.id = f.project_id
+        WHERE search_fts MATCH ?
+        ORDER BY bm25(search_fts, 4.0, 1.0) LIMIT ?
+    """, (match, limit), typed=False)
+
+def search(text, limit=50):
+    """
+    Busca em projetos, tarefas, riscos e notas pelo índice textual do banco
+    (tsvector/GIN no Postgres, FTS5 no SQLite), sem carregar tabelas no pandas.
+    Cada palavra casa por prefixo. Retorna as colunas de SEARCH_COLS por relevância.
+    """
+    terms = _search_terms(text)
+    if not terms:
+        return pd.DataFrame(columns=SEARCH_COLS)
+    with metrics.timer("compute", "search"):
+        df = _search_sqlite(terms, int(limit)) if is_sqlite() else _search_postgres(terms, int(limit))
+    return df if not df.empty else pd.DataFrame(columns=SEARCH_COLS)
@@ -1,4 +1,5 @@
 # utils/logic.py
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 
@@ -7,7 +8,7 @@ def calculate_delay(row):
     if row['status'] in ['Feito', 'Concluído', 'Cancelado']:
         return False
     
-    end_date = pd.to_datetime(row['end_date']).date() if isinstance(row['end_date'], str) else row['end_date']
+    end_date = pd.to_datetime(row['end_date']).date() if isinstance(row['end_date'], (str, pd.Timestamp)) else row['end_date']
     return end_date < date.today()
 
 def calculate_project_health(project, tasks_df, risks_df):
@@ -43,4 +44,310 @@ def calculate_progress(tasks_df):
         return tasks_df['progress'].mean()
         
     weighted_progress = (tasks_df['progress'] * tasks_df['effort']).sum()
-    return round(weighted_progress / total_effort, 1)
\ No newline at end of file
+    return round(weighted_progress / total_effort, 1)
+
+def round_progress(values):
+    """
+    Regra única de arredondamento do avanço (%): uma casa com o round() do
+    Python, o mesmo de calculate_progress (31.25 -> 31.2, empate vai para o
+    par). O banco devolve o valor exato porque o ROUND do SQL arredondaria o
+    empate para cima (31.3). A média simples (sem esforço) também sai com uma casa.
+    """
+    return values.astype('float64').map(lambda v: v if pd.isna(v) else round(v, 1))
+
+# =========================================================
+# VERSÕES VETORIZADAS (PORTFÓLIO INTEIRO DE UMA VEZ)
+# =========================================================
+DONE_STATUSES = ['Feito', 'Concluído', 'Cancelado']
+
+def _to_dates(series):
+    """Converte a coluna para datetime64 (dia), valores inválidos viram NaT"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Já tipada na carga (db.coerce_types): não reprocessa
+        return series.dt.normalize()
+    return pd.to_datetime(series, errors='coerce').dt.normalize()
+
+def fmt_date(value, fmt="%Y-%m-%d"):
+    """Data (Timestamp/date/str) formatada para exibição; vazio se nula"""
+    if value is None or pd.isna(value):
+        return ""
+    return pd.Timestamp(value).strftime(fmt)
+
+def calendar_events(events_df, colors, task_color="#8B5CF6", default_color="#3788d8"):
+    """
+    Lista de eventos do FullCalendar a partir de db.load_calendar_events.
+    Projetos viram barras (fim inclusivo -> exclusivo, +1 dia); tarefas, um dia.
+    """
+    if events_df.empty:
+        return []
+    start = _to_dates(events_df['start_date'])
+    end = _to_dates(events_df['end_date']).fillna(start) + pd.Timedelta(days=1)
+    is_task = events_df['kind'] == 'task'
+    title = events_df['title'].astype(object).fillna('')
+    owner = events_df['owner'].astype(object).fillna('-')
+    project = events_df['project_name'].astype(object).fillna('')
+    label = ("⏰ " + title + " · " + project).where(is_task, title + " (" + owner + ")")
+    color = events_df['status'].astype(object).map(colors).fillna(default_color).where(~is_task, task_color)
+    out = pd.DataFrame({
+        "title": label,
+        "start": start.dt.strftime("%Y-%m-%d"),
+        "end": end.dt.strftime("%Y-%m-%d"),
+        "backgroundColor": color,
+        "borderColor": color,
+        "allDay": True,
+    })
+    return out[start.notna()].to_dict("records")
+
+def late_mask(df):
+    """Equivalente vetorizado de calculate_delay: Series booleana (atrasado?)"""
+    if df.empty:
+        return pd.Series(False, index=df.index, dtype=bool)
+    today = pd.Timestamp(date.today())
+    end = _to_dates(df['end_date'])
+    return (~df['status'].isin(DONE_STATUSES)) & (end < today)
+
+def _health_labels(flags):
+    """Rótulo final a partir das colunas days_late/is_late/has_*"""
+    critical = (flags['days_late'] > 7) | flags['has_high_risk'] | flags['has_gap']
+    attention = flags['is_late'] | flags['has_medium_risk']
+    health = pd.Series("🟢 Saudável", index=flags.index, dtype=object)
+    health[attention] = "🟡 Atenção"
+    health[critical] = "🔴 Crítico"
+    return health
+
+def _health_flags(kpis_df, projected_end=None):
+    """is_late, days_late, has_high_risk, has_medium_risk, has_gap a partir das linhas de KPI"""
+    today = pd.Timestamp(date.today())
+    flags = pd.DataFrame(index=kpis_df.index)
+    flags['is_late'] = late_mask(kpis_df)
+    end = _to_dates(kpis_df['end_date'])
+    flags['days_late'] = (today - end).dt.days.where(flags['is_late'], 0).fillna(0)
+    if projected_end is not None:
+        open_ = ~kpis_df['status'].isin(DONE_STATUSES)
+        slip = (_to_dates(projected_end) - end).dt.days.where(open_).fillna(0).clip(lower=0)
+        flags['is_late'] |= slip > 0
+        flags['days_late'] = flags['days_late'].where(flags['days_late'] >= slip, slip)
+    level = pd.to_numeric(kpis_df['max_risk_level'], errors='coerce').fillna(0)
+    flags['has_high_risk'] = level >= 3
+    flags['has_medium_risk'] = level == 2
+    flags['has_gap'] = pd.to_numeric(kpis_df['has_gap'], errors='coerce').fillna(0) > 0
+    return flags
+
+def health_from_kpis(kpis_df, projected_end=None):
+    """
+    Regras de calculate_project_health (+ GAP ativo = crítico) para todos os
+    projetos de uma vez, a partir das linhas já agregadas de project_kpis /
+    project_health (max_risk_level: 3=Alta, 2=Média, 1=Baixa; has_gap 0/1).
+    `projected_end` (Series alinhada a kpis_df, ex: Schedule.project_finish):
+    término previsto depois do fim planejado conta como atraso.
+    """
+    if kpis_df.empty:
+        return pd.Series(dtype=object, index=kpis_df.index)
+    return _health_labels(_health_flags(kpis_df, projected_end))
+
+def compute_health_frame(projects_df, tasks_df, risks_df, gaps_df=None):
+    """
+    Saúde de todos os projetos a partir dos DataFrames brutos (projects com
+    id/status/end_date, risks e gaps com project_id): agrega riscos e GAPs
+    como a view project_kpis e aplica health_from_kpis. Retorna DataFrame
+    alinhado a projects_df com is_late, days_late, has_high_risk,
+    has_medium_risk, has_gap e health. `tasks_df` não entra na regra (como em
+    calculate_project_health).
+    """
+    if projects_df.empty:
+        return pd.DataFrame(columns=['is_late', 'days_late', 'has_high_risk', 'has_medium_risk', 'has_gap', 'health'],
+                            index=projects_df.index)
+    ids = projects_df['id']
+    kpis = pd.DataFrame({'end_date': projects_df['end_date'], 'status': projects_df['status']}, index=projects_df.index)
+    if risks_df is not None and not risks_df.empty:
+        levels = {label: level for level, label in RISK_PROB_LABELS.items()}
+        level = risks_df['probability'].astype(object).map(levels).fillna(0)
+        kpis['max_risk_level'] = ids.map(level.groupby(risks_df['project_id']).max()).fillna(0)
+    else:
+        kpis['max_risk_level'] = 0
+    has_gaps = gaps_df is not None and not gaps_df.empty
+    kpis['has_gap'] = ids.isin(gaps_df['project_id'].unique()).astype(int) if has_gaps else 0
+    flags = _health_flags(kpis)
+    flags['days_late'] = flags['days_late'].astype('int64')
+    flags['health'] = _health_labels(flags)
+    return flags
+
+def time_elapsed_pct(projects_df):
+    """% do prazo (início -> fim) já consumido, limitado a 0..100"""
+    today = pd.Timestamp(date.today())
+    start = _to_dates(projects_df['start_date'])
+    end = _to_dates(projects_df['end_date'])
+    total_days = (end - start).dt.days
+    elapsed = (today - start).dt.days
+    pct = (elapsed / total_days.where(total_days > 0) * 100).clip(0, 100)
+    return pct.fillna(0)
+
+def progress_frame(tasks_df, projects_df):
+    """
+    Avanço físico e % de tempo decorrido de todos os projetos num único
+    groupby, para DataFrames já carregados. Mesma conta do project_kpis (média
+    ponderada pelo esforço, média simples sem esforço, 0 sem tarefas ou sem
+    avanço preenchido) e mesmo
+    arredondamento (round_progress). Retorna DataFrame alinhado a projects_df
+    com: progress, time_pct
+    """
+    out = pd.DataFrame(index=projects_df.index)
+    progress = pd.Series(0.0, index=projects_df.index)
+    if tasks_df is not None and not tasks_df.empty and not projects_df.empty:
+        t = pd.DataFrame({
+            'project_id': tasks_df['project_id'],
+            'effort': pd.to_numeric(tasks_df['effort'], errors='coerce'),
+            'progress': pd.to_numeric(tasks_df['progress'], errors='coerce'),
+        })
+        t['weighted'] = t['progress'] * t['effort']
+        g = t.groupby('project_id').agg(effort=('effort', 'sum'), weighted=('weighted', 'sum'), mean=('progress', 'mean'))
+        per_proj = (g['weighted'] / g['effort'].where(g['effort'] != 0)).where(g['effort'] != 0, g['mean'])
+        progress = projects_df['id'].map(per_proj).where(projects_df['id'].isin(g.index), 0.0)
+    out['progress'] = round_progress(progress.fillna(0.0))
+    out['time_pct'] = time_elapsed_pct(projects_df) if not projects_df.empty else pd.Series(dtype=float)
+    return out
+
+
+# =========================================================
+# CRONOGRAMA (GANTT)
+# =========================================================
+def gantt_rows(projects_df, tasks_df=None):
+    """
+    Linhas do Gantt: a barra agregada de cada projeto (db.load_gantt_projects)
+    seguida das tarefas dos projetos expandidos. Retorna key (única, eixo y),
+    label, level (0 projeto / 1 tarefa), status, start, end, progress.
+    """
+    cols = ['key', 'label', 'level', 'status', 'start', 'end', 'progress']
+    if projects_df.empty:
+        return pd.DataFrame(columns=cols)
+    order = pd.Series(range(len(projects_df)), index=projects_df['project_id'].astype('int64').values)
+    parts = [pd.DataFrame({
+        'key': 'p' + projects_df['project_id'].astype(str),
+        'label': projects_df['name'].astype(object).fillna(''),
+        'level': 0,
+        'status': projects_df['status'].astype(object),
+        'start': _to_dates(projects_df['start_date']),
+        'end': _to_dates(projects_df['end_date']),
+        'progress': projects_df['progress'].astype('float64').fillna(0),
+        '_order': order.values,
+    })]
+    if tasks_df is not None and not tasks_df.empty:
+        t = tasks_df[tasks_df['project_id'].isin(order.index)]
+        parts.append(pd.DataFrame({
+            'key': 't' + t['id'].astype(str),
+            'label': '↳ ' + t['title'].astype(object).fillna(''),
+            'level': 1,
+            'status': t['status'].astype(object),
+            'start': _to_dates(t['start_date']),
+            'end': _to_dates(t['end_date']),
+            'progress': t['progress'].astype('float64').fillna(0),
+            '_order': order.reindex(t['project_id'].astype('int64').values).values,
+        }))
+    rows = pd.concat(parts, ignore_index=True)
+    rows = rows[rows['start'].notna() & rows['end'].notna()]
+    rows['status'] = rows['status'].fillna('Sem status')
+    rows = rows.sort_values(['_order', 'level', 'start'], kind='stable')
+    return rows[cols].reset_index(drop=True)
+
+# =========================================================
+# MATRIZ DE RISCOS
+# =========================================================
+RISK_PROB_LABELS = {1: 'Baixa', 2: 'Média', 3: 'Alta'}
+RISK_IMPACT_LABELS = {1: 'Baixo', 2: 'Médio', 3: 'Alto'}
+
+def risk_grid(matrix_df):
+    """
+    Matriz 3x3 de contagens a partir de db.load_risk_matrix: linhas =
+    probabilidade (Alta no topo), colunas = impacto (Baixo -> Alto), zeros nas
+    células vazias.
+    """
+    levels = [1, 2, 3]
+    if matrix_df.empty:
+        grid = pd.DataFrame(0, index=levels, columns=levels)
+    else:
+        grid = (matrix_df.astype({'prob_level': 'int64', 'impact_level': 'int64', 'cnt': 'int64'})
+                .pivot_table(index='prob_level', columns='impact_level', values='cnt', aggfunc='sum')
+                .reindex(index=levels, columns=levels).fillna(0).astype('int64'))
+    grid = grid.iloc[::-1]
+    grid.index = grid.index.map(RISK_PROB_LABELS)
+    grid.columns = grid.columns.map(RISK_IMPACT_LABELS)
+    return grid
+
+# =========================================================
+# CARGA DA EQUIPE
+# =========================================================
+def week_start(day):
+    """Segunda-feira da semana de `day`"""
+    day = pd.Timestamp(day).normalize()
+    return day - pd.Timedelta(days=day.weekday())
+
+def workload_matrix(tasks_df, start, n_weeks):
+    """
+    Esforço por responsável por semana (DataFrame owner x segunda-feira).
+    O esforço de cada tarefa é distribuído por igual entre os dias do seu
+    intervalo (início e fim inclusivos). Varredura por diferenças: +taxa no
+    dia inicial, -taxa no dia seguinte ao fim, soma acumulada por dia e soma
+    por semana; O(tarefas + responsáveis x dias), sem laço por tarefa.
+    """
+    origin = week_start(start)
+    weeks = pd.date_range(origin, periods=n_weeks, freq='7D')
+    if tasks_df.empty:
+        return pd.DataFrame(index=pd.Index([], name='owner'), columns=weeks, dtype='float64')
+    n_days = n_weeks * 7
+    s = _to_dates(tasks_df['start_date'])
+    e = _to_dates(tasks_df['end_date'])
+    s = s.fillna(e)
+    e = e.fillna(s)
+    effort = pd.to_numeric(tasks_df['effort'], errors='coerce').to_numpy(dtype='float64', na_value=0)
+    valid = s.notna().to_numpy() & (effort > 0) & (e >= s).to_numpy() & tasks_df['owner'].notna().to_numpy()
+    s_idx = (s - origin).dt.days.to_numpy(dtype='float64', na_value=0)
+    e_idx = (e - origin).dt.days.to_numpy(dtype='float64', na_value=0)
+    valid &= (e_idx >= 0) & (s_idx < n_days)
+    s_idx, e_idx, effort = s_idx[valid].astype('int64'), e_idx[valid].astype('int64'), effort[valid]
+    owners, names = pd.factorize(tasks_df['owner'].astype(object)[valid])
+    rate = effort / (e_idx - s_idx + 1)
+
+    diff = np.zeros((len(names), n_days + 1))
+    np.add.at(diff, (owners, np.clip(s_idx, 0, n_days)), rate)
+    np.add.at(diff, (owners, np.clip(e_idx + 1, 0, n_days)), -rate)
+    daily = np.cumsum(diff[:, :n_days], axis=1)
+    weekly = daily.reshape(len(names), n_weeks, 7).sum(axis=2)
+    return pd.DataFrame(weekly, index=pd.Index(names, name='owner'), columns=weeks)
+
+def utilization(load_df, team_df, default_capacity=40):
+    """
+    Carga / capacidade semanal (1.0 = 100%). Responsáveis fora do cadastro da
+    equipe usam `default_capacity`. Retorna (utilização, capacidade por owner).
+    """
+    capacity = pd.Series(default_capacity, index=load_df.index, dtype='float64')
+    if not team_df.empty:
+        known = team_df.drop_duplicates('name').set_index('name')['weekly_capacity'].astype('float64')
+        capacity = known.reindex(load_df.index).fillna(capacity)
+    util = load_df.div(capacity.where(capacity > 0), axis=0)
+    return util, capacity
+
+# =========================================================
+# ÍNDICE POR PROJETO (CONSULTAS O(1) DURANTE O RERUN)
+# =========================================================
+def build_project_index(projects_df, gaps_df=None, risk_summary_df=None):
+    """
+    Monta uma vez por rerun: project_id -> {"name", "status", "gaps", "risks"}
+      gaps:  descrições dos GAPs ativos (na ordem de cadastro)
+      risks: {probabilidade: quantidade}
+    """
+    index = {}
+    if projects_df.empty:
+        return index
+    for pid, name, status in zip(projects_df['id'], projects_df['name'], projects_df['status']):
+        index[pid] = {"name": name, "status": status, "gaps": [], "risks": {}}
+
+    if gaps_df is not None and not gaps_df.empty:
+        for pid, descs in gaps_df.groupby('project_id', sort=False)['description'].agg(list).items():
+            if pid in index:
+                index[pid]["gaps"] = descs
+
+    if risk_summary_df is not None and not risk_summary_df.empty:
+        for pid, prob, cnt in zip(risk_summary_df['project_id'], risk_summary_df['probability'], risk_summary_df['cnt']):
+            if pid in index:
+                index[pid]["risks"][prob] = int(cnt)
+    return index
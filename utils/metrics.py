@@ -0,0 +1,126 @@
+# utils/metrics.py
+"""
+Instrumentação em memória (por processo).
+
+Cada série (kind, name) guarda as últimas WINDOW amostras de duração para
+calcular p50/p95/p99, mais contadores acumulados (total, soma, linhas, bytes).
+Desligado (APP_METRICS=0 ou set_enabled(False)) o custo é um `if`.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+WINDOW = 1000
+
+_enabled = os.environ.get("APP_METRICS", "1") != "0"
+_lock = threading.Lock()
+_series = {}
+
+def enabled():
+    return _enabled
+
+def set_enabled(value):
+    global _enabled
+    _enabled = bool(value)
+
+class _Series:
+    __slots__ = ("samples", "count", "total_s", "rows", "bytes", "cache_hits")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW)
+        self.count = 0
+        self.total_s = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.cache_hits = 0
+
+def record(kind, name, seconds, rows=0, nbytes=0):
+    """Registra uma amostra (ex: kind='query', name=SQL normalizado)"""
+    if not _enabled:
+        return
+    with _lock:
+        s = _series.get((kind, name))
+        if s is None:
+            s = _series[(kind, name)] = _Series()
+        s.samples.append(seconds)
+        s.count += 1
+        s.total_s += seconds
+        s.rows += rows
+        s.bytes += nbytes
+
+def record_cache_hit(kind, name):
+    if not _enabled:
+        return
+    with _lock:
+        s = _series.get((kind, name))
+        if s is None:
+            s = _series[(kind, name)] = _Series()
+        s.cache_hits += 1
+
+@contextmanager
+def timer(kind, name):
+    """with metrics.timer("compute", "dashboard.health"): ..."""
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, time.perf_counter() - t0)
+
+def _quantile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, max(0, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[idx]
+
+def snapshot(kind=None):
+    """Lista de dicts (uma linha por série) com percentis em ms"""
+    with _lock:
+        items = [(k, n, list(s.samples), s.count, s.total_s, s.rows, s.bytes, s.cache_hits)
+                 for (k, n), s in _series.items() if kind is None or k == kind]
+    rows = []
+    for k, n, samples, count, total_s, nrows, nbytes, hits in items:
+        samples.sort()
+        rows.append({
+            "kind": k, "name": n, "count": count, "cache_hits": hits,
+            "p50_ms": _quantile(samples, 0.50) * 1000,
+            "p95_ms": _quantile(samples, 0.95) * 1000,
+            "p99_ms": _quantile(samples, 0.99) * 1000,
+            "total_s": total_s, "rows": nrows, "bytes": nbytes,
+        })
+    return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)
+
+def reset():
+    with _lock:
+        _series.clear()
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+def prometheus_text(prefix="gestao"):
+    """Exporta no formato texto do Prometheus (summary por série)"""
+    lines = [
+        f"# HELP {prefix}_duration_seconds Duração por consulta/página/cálculo (janela móvel para os quantis).",
+        f"# TYPE {prefix}_duration_seconds summary",
+    ]
+    rows = snapshot()
+    for r in rows:
+        labels = f'kind="{_label(r["kind"])}",name="{_label(r["name"])}"'
+        for q, key in ((0.5, "p50_ms"), (0.95, "p95_ms"), (0.99, "p99_ms")):
+            lines.append(f'{prefix}_duration_seconds{{{labels},quantile="{q}"}} {r[key] / 1000:.6f}')
+        lines.append(f"{prefix}_duration_seconds_sum{{{labels}}} {r['total_s']:.6f}")
+        lines.append(f"{prefix}_duration_seconds_count{{{labels}}} {r['count']}")
+    for metric, key, help_text in (("rows_total", "rows", "Linhas devolvidas."),
+                                   ("bytes_total", "bytes", "Bytes (aprox.) dos DataFrames devolvidos."),
+                                   ("cache_hits_total", "cache_hits", "Leituras servidas pelo cache.")):
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        for r in rows:
+            if r["kind"] == "query":
+                lines.append(f'{prefix}_{metric}{{name="{_label(r["name"])}"}} {r[key]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,459 @@
+# utils/migrations.py
+"""
+Migrações versionadas do schema.
+
+Cada migração tem um número de versão crescente e uma lista de passos
+(SQL ou função que recebe o cursor). As versões aplicadas ficam na tabela
+schema_migrations, então cada DDL roda uma única vez por banco.
+Regra: nunca editar uma migração já publicada, sempre criar uma nova.
+"""
+from datetime import date, datetime, timedelta
+
+# Chave do advisory lock do Postgres (evita duas instâncias migrando juntas)
+_LOCK_KEY = 7281901
+
+def _dialect(sql, dialect):
+    """Ajusta o pouco de DDL que difere entre Postgres e SQLite"""
+    if dialect == "sqlite":
+        sql = sql.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
+    return sql
+
+def _columns(cursor, table):
+    cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+    return {d[0] for d in cursor.description}
+
+def _add_column(table, column, ddl):
+    """Passo idempotente: adiciona a coluna só se ela ainda não existir"""
+    def step(cursor, dialect):
+        if column not in _columns(cursor, table):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return step
+
+# Agregados por projeto para o dashboard. SQL portável (Postgres e SQLite):
+# DROP + CREATE em vez de CREATE OR REPLACE, CAST(... AS FLOAT) para não devolver Decimal.
+KPI_VIEWS_DDL = [
+    "DROP VIEW IF EXISTS project_kpis",
+    """
+    CREATE VIEW project_kpis AS
+    SELECT
+        p.id AS project_id, p.name, p.sponsor, p.manager, p.status,
+        p.start_date, p.end_date, p.archived,
+        COALESCE(t.total_tasks, 0) AS total_tasks,
+        COALESCE(t.tasks_todo, 0) AS tasks_todo,
+        COALESCE(t.tasks_doing, 0) AS tasks_doing,
+        COALESCE(t.tasks_blocked, 0) AS tasks_blocked,
+        COALESCE(t.tasks_done, 0) AS tasks_done,
+        COALESCE(t.late_tasks, 0) AS late_tasks,
+        COALESCE(t.progress, 0) AS progress,
+        COALESCE(r.max_risk_level, 0) AS max_risk_level,
+        CASE WHEN g.project_id IS NULL THEN 0 ELSE 1 END AS has_gap
+    FROM projects p
+    LEFT JOIN (
+        SELECT project_id,
+            COUNT(*) AS total_tasks,
+            SUM(CASE WHEN status = 'A fazer' THEN 1 ELSE 0 END) AS tasks_todo,
+            SUM(CASE WHEN status = 'Fazendo' THEN 1 ELSE 0 END) AS tasks_doing,
+            SUM(CASE WHEN status = 'Bloqueado' THEN 1 ELSE 0 END) AS tasks_blocked,
+            SUM(CASE WHEN status = 'Feito' THEN 1 ELSE 0 END) AS tasks_done,
+            SUM(CASE WHEN status NOT IN ('Feito', 'Concluído', 'Cancelado') AND end_date < CURRENT_DATE THEN 1 ELSE 0 END) AS late_tasks,
+            CAST(CASE WHEN COALESCE(SUM(effort), 0) = 0 THEN AVG(progress)
+                      ELSE ROUND(SUM(progress * effort) * 1.0 / SUM(effort), 1) END AS FLOAT) AS progress
+        FROM tasks GROUP BY project_id
+    ) t ON t.project_id = p.id
+    LEFT JOIN (
+        SELECT project_id,
+            MAX(CASE probability WHEN 'Alta' THEN 3 WHEN 'Média' THEN 2 WHEN 'Baixa' THEN 1 ELSE 0 END) AS max_risk_level
+        FROM risks GROUP BY project_id
+    ) r ON r.project_id = p.id
+    LEFT JOIN (
+        SELECT DISTINCT project_id FROM project_notes WHERE category LIKE '%Gap%'
+    ) g ON g.project_id = p.id
+    """,
+]
+# ---------------------------------------------------------
+# project_health: snapshot dos agregados de project_kpis
+# ---------------------------------------------------------
+# Mantido por triggers em tasks/risks/project_notes: cada escrita recalcula
+# só os projetos afetados. O recálculo completo (db.refresh_project_health)
+# corrige o que depende da data, como tarefas que ficaram atrasadas.
+HEALTH_COLUMNS = ["total_tasks", "tasks_todo", "tasks_doing", "tasks_blocked", "tasks_done",
+                  "late_tasks", "progress", "max_risk_level", "has_gap"]
+HEALTH_SOURCES = ["tasks", "risks", "project_notes"]
+
+def _health_select(where):
+    return f"SELECT project_id, {', '.join(HEALTH_COLUMNS)}, CURRENT_TIMESTAMP FROM project_kpis WHERE {where}"
+
+def health_upsert_sql(dialect, where):
+    """UPSERT de project_health a partir da view para os projetos do WHERE"""
+    cols = f"project_id, {', '.join(HEALTH_COLUMNS)}, refreshed_at"
+    if dialect == "sqlite":
+        return f"INSERT OR REPLACE INTO project_health ({cols}) {_health_select(where)}"
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in HEALTH_COLUMNS + ["refreshed_at"])
+    return f"INSERT INTO project_health ({cols}) {_health_select(where)} ON CONFLICT (project_id) DO UPDATE SET {updates}"
+
+def _health_table(cursor, dialect):
+    cursor.execute(_dialect("""
+        CREATE TABLE IF NOT EXISTS project_health (
+            project_id INTEGER PRIMARY KEY REFERENCES projects(id),
+            total_tasks INTEGER, tasks_todo INTEGER, tasks_doing INTEGER,
+            tasks_blocked INTEGER, tasks_done INTEGER, late_tasks INTEGER,
+            progress FLOAT, max_risk_level INTEGER, has_gap INTEGER,
+            refreshed_at TIMESTAMP
+        )
+    """, dialect))
+    cursor.execute(health_upsert_sql(dialect, "1 = 1"))
+
+def _health_triggers(cursor, dialect):
+    if dialect == "sqlite":
+        # SQLite só tem trigger por linha
+        for table in HEALTH_SOURCES:
+            for event, refs in (("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])):
+                where = " OR ".join(f"project_id = {r}.project_id" for r in refs)
+                cursor.execute(f"DROP TRIGGER IF EXISTS trg_health_{table}_{event.lower()}")
+                cursor.execute(f"""
+                    CREATE TRIGGER trg_health_{table}_{event.lower()} AFTER {event} ON {table}
+                    BEGIN {health_upsert_sql(dialect, where)}; END
+                """)
+        return
+
+    # Postgres: trigger por comando com transition tables, um recálculo por
+    # projeto afetado mesmo em UPDATE/COPY de milhares de linhas
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION refresh_project_health(pids INTEGER[]) RETURNS void AS $$
+            {health_upsert_sql(dialect, "project_id = ANY(pids)")}
+        $$ LANGUAGE sql
+    """)
+    cursor.execute("""
+        CREATE OR REPLACE FUNCTION project_health_stmt_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM refresh_project_health(ARRAY(SELECT DISTINCT project_id FROM new_rows WHERE project_id IS NOT NULL));
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM refresh_project_health(ARRAY(SELECT DISTINCT project_id FROM old_rows WHERE project_id IS NOT NULL));
+            ELSE
+                PERFORM refresh_project_health(ARRAY(
+                    SELECT project_id FROM new_rows WHERE project_id IS NOT NULL
+                    UNION SELECT project_id FROM old_rows WHERE project_id IS NOT NULL));
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in HEALTH_SOURCES:
+        for event, refs in (("INSERT", "NEW TABLE AS new_rows"),
+                            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+                            ("DELETE", "OLD TABLE AS old_rows")):
+            name = f"trg_health_{table}_{event.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+            cursor.execute(f"""
+                CREATE TRIGGER {name} AFTER {event} ON {table}
+                REFERENCING {refs} FOR EACH STATEMENT
+                EXECUTE FUNCTION project_health_stmt_trigger()
+            """)
+
+# ---------------------------------------------------------
+# project_health direto das tabelas (migração 11)
+# ---------------------------------------------------------
+# Pela view, recalcular um projeto agregava tasks/risks/notas de todos os
+# projetos antes de filtrar. Aqui o filtro entra em cada subconsulta e usa
+# os índices por project_id. Mesmas colunas e resultado da view da migração 4.
+def kpi_select(where="1 = 1"):
+    """
+    SELECT dos agregados por projeto. `where` usa {col} no lugar da coluna do
+    projeto e é aplicado dentro de cada subconsulta. O avanço sai sem
+    arredondar (desde a migração 12): arredonda-se em logic.round_progress,
+    com a mesma regra de calculate_progress.
+    """
+    on_child, on_project = where.format(col="project_id"), where.format(col="p.id")
+    return f"""
+    SELECT
+        p.id AS project_id, p.name, p.sponsor, p.manager, p.status,
+        p.start_date, p.end_date, p.archived,
+        COALESCE(t.total_tasks, 0) AS total_tasks,
+        COALESCE(t.tasks_todo, 0) AS tasks_todo,
+        COALESCE(t.tasks_doing, 0) AS tasks_doing,
+        COALESCE(t.tasks_blocked, 0) AS tasks_blocked,
+        COALESCE(t.tasks_done, 0) AS tasks_done,
+        COALESCE(t.late_tasks, 0) AS late_tasks,
+        COALESCE(t.progress, 0) AS progress,
+        COALESCE(r.max_risk_level, 0) AS max_risk_level,
+        CASE WHEN g.project_id IS NULL THEN 0 ELSE 1 END AS has_gap
+    FROM projects p
+    LEFT JOIN (
+        SELECT project_id,
+            COUNT(*) AS total_tasks,
+            SUM(CASE WHEN status = 'A fazer' THEN 1 ELSE 0 END) AS tasks_todo,
+            SUM(CASE WHEN status = 'Fazendo' THEN 1 ELSE 0 END) AS tasks_doing,
+            SUM(CASE WHEN status = 'Bloqueado' THEN 1 ELSE 0 END) AS tasks_blocked,
+            SUM(CASE WHEN status = 'Feito' THEN 1 ELSE 0 END) AS tasks_done,
+            SUM(CASE WHEN status NOT IN ('Feito', 'Concluído', 'Cancelado') AND end_date < CURRENT_DATE THEN 1 ELSE 0 END) AS late_tasks,
+            CAST(CASE WHEN COALESCE(SUM(effort), 0) = 0 THEN AVG(progress)
+                      ELSE SUM(progress * effort) * 1.0 / SUM(effort) END AS FLOAT) AS progress
+        FROM tasks WHERE {on_child} GROUP BY project_id
+    ) t ON t.project_id = p.id
+    LEFT JOIN (
+        SELECT project_id,
+            MAX(CASE probability WHEN 'Alta' THEN 3 WHEN 'Média' THEN 2 WHEN 'Baixa' THEN 1 ELSE 0 END) AS max_risk_level
+        FROM risks WHERE {on_child} GROUP BY project_id
+    ) r ON r.project_id = p.id
+    LEFT JOIN (
+        SELECT DISTINCT project_id FROM project_notes WHERE category LIKE '%Gap%' AND {on_child}
+    ) g ON g.project_id = p.id
+    WHERE {on_project}
+    """
+
+def health_refresh_sql(dialect, where="1 = 1"):
+    """UPSERT de project_health para os projetos do WHERE (em termos de {col})"""
+    cols = f"project_id, {', '.join(HEALTH_COLUMNS)}, refreshed_at"
+    select = f"SELECT project_id, {', '.join(HEALTH_COLUMNS)}, CURRENT_TIMESTAMP FROM ({kpi_select(where)}) k"
+    if dialect == "sqlite":
+        return f"INSERT OR REPLACE INTO project_health ({cols}) {select}"
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in HEALTH_COLUMNS + ["refreshed_at"])
+    return f"INSERT INTO project_health ({cols}) {select} ON CONFLICT (project_id) DO UPDATE SET {updates}"
+
+def _kpi_pushdown(cursor, dialect):
+    """Troca a view, a função de recálculo e os triggers pela versão com filtro empurrado"""
+    if dialect == "sqlite":
+        # SQLite não tem CREATE OR REPLACE VIEW, e o SQL do recálculo fica dentro de cada trigger
+        cursor.execute("DROP VIEW IF EXISTS project_kpis")
+        cursor.execute("CREATE VIEW project_kpis AS" + kpi_select())
+        for table in HEALTH_SOURCES:
+            for event, refs in (("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])):
+                where = " OR ".join(f"{{col}} = {r}.project_id" for r in refs)
+                cursor.execute(f"DROP TRIGGER IF EXISTS trg_health_{table}_{event.lower()}")
+                cursor.execute(f"""
+                    CREATE TRIGGER trg_health_{table}_{event.lower()} AFTER {event} ON {table}
+                    BEGIN {health_refresh_sql(dialect, where)}; END
+                """)
+        return
+
+    cursor.execute("CREATE OR REPLACE VIEW project_kpis AS" + kpi_select())
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION refresh_project_health(pids INTEGER[]) RETURNS void AS $$
+            {health_refresh_sql(dialect, "{col} = ANY(pids)")}
+        $$ LANGUAGE sql
+    """)
+    # Mesmos triggers por comando da migração 6 (chamam a função pelo nome)
+    for table in HEALTH_SOURCES:
+        for event, refs in (("INSERT", "NEW TABLE AS new_rows"),
+                            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+                            ("DELETE", "OLD TABLE AS old_rows")):
+            name = f"trg_health_{table}_{event.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+            cursor.execute(f"""
+                CREATE TRIGGER {name} AFTER {event} ON {table}
+                REFERENCING {refs} FOR EACH STATEMENT
+                EXECUTE FUNCTION project_health_stmt_trigger()
+            """)
+
+def _kpi_exact_progress(cursor, dialect):
+    """Recria view/função/triggers com o avanço sem ROUND e refaz o snapshot já gravado"""
+    _kpi_pushdown(cursor, dialect)
+    cursor.execute(health_refresh_sql(dialect))
+
+# ---------------------------------------------------------
+# Busca textual
+# ---------------------------------------------------------
+# Postgres: coluna tsvector GERADA (mantida pelo próprio banco a cada escrita)
+# com dicionário português + índice GIN. SQLite: tabela FTS5 única mantida
+# por triggers; rowid = id * 4 + código da entidade para apagar/atualizar
+# sem varrer a tabela.
+SEARCH_SOURCES = {
+    # tabela: (entidade, código, coluna do projeto, [(peso, expressão)])
+    "projects": ("project", 0, "id", [("A", "name"), ("A", "code"), ("B", "scope"), ("B", "notes"), ("C", "results_text")]),
+    "tasks": ("task", 1, "project_id", [("A", "title"), ("C", "owner")]),
+    "risks": ("risk", 2, "project_id", [("A", "description"), ("B", "mitigation_plan"), ("C", "owner")]),
+    "project_notes": ("note", 3, "project_id", [("A", "description"), ("C", "category")]),
+}
+
+def _search_pg(cursor):
+    for table, (_, _, _, fields) in SEARCH_SOURCES.items():
+        expr = " || ".join(f"setweight(to_tsvector('portuguese', coalesce({col}, '')), '{w}')" for w, col in fields)
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS ({expr}) STORED")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_tsv)")
+
+def _search_sqlite(cursor):
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                entity UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED,
+                title, body, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+    except Exception:
+        # SQLite compilado sem FTS5: a busca cai no LIKE (db.search)
+        return
+    for table, (entity, code, pcol, fields) in SEARCH_SOURCES.items():
+        title_col = fields[0][1]
+        def values(ref):
+            body = " || ' ' || ".join(f"coalesce({ref}.{col}, '')" for _, col in fields[1:])
+            return (f"{ref}.id * 4 + {code}, '{entity}', {ref}.id, {ref}.{pcol}, "
+                    f"coalesce({ref}.{title_col}, ''), {body}")
+        insert = f"INSERT INTO search_fts (rowid, entity, entity_id, project_id, title, body) SELECT {values('NEW')};"
+        delete = f"DELETE FROM search_fts WHERE rowid = OLD.id * 4 + {code};"
+        for event, actions in (("INSERT", insert), ("UPDATE", delete + " " + insert), ("DELETE", delete)):
+            name = f"trg_search_{table}_{event.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"CREATE TRIGGER {name} AFTER {event} ON {table} BEGIN {actions} END")
+        cursor.execute(f"INSERT INTO search_fts (rowid, entity, entity_id, project_id, title, body) SELECT {values(table)} FROM {table}")
+
+def _search_index(cursor, dialect):
+    (_search_sqlite if dialect == "sqlite" else _search_pg)(cursor)
+
+def _ph(dialect):
+    return "%s" if dialect == "postgres" else "?"
+
+def _seed(cursor, dialect):
+    """Dados iniciais (projeto exemplo + áreas) apenas em banco vazio"""
+    ph = _ph(dialect)
+    cursor.execute("SELECT count(*) FROM projects")
+    if cursor.fetchone()[0] == 0:
+        today = date.today()
+        cursor.execute(
+            f"INSERT INTO projects (name, manager, start_date, end_date, status, date_changes, archived, notes) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, 0, 0, '')",
+            ("Exemplo Supabase", "Gerente", today.isoformat(), (today + timedelta(30)).isoformat(), "Em andamento"),
+        )
+    areas = ["Geral", "TI", "RH", "Financeiro", "Marketing", "Operações", "Comercial", "Logística"]
+    for area in areas:
+        cursor.execute(f"INSERT INTO sponsors (name) VALUES ({ph}) ON CONFLICT DO NOTHING", (area,))
+
+MIGRATIONS = [
+    (1, "Tabelas base", [
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            id SERIAL PRIMARY KEY,
+            name TEXT, code TEXT, sponsor TEXT, manager TEXT,
+            start_date DATE, end_date DATE, status TEXT, priority TEXT,
+            scope TEXT, results_text TEXT, date_changes INTEGER DEFAULT 0,
+            archived INTEGER DEFAULT 0, notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id SERIAL PRIMARY KEY,
+            project_id INTEGER REFERENCES projects(id),
+            title TEXT, owner TEXT, start_date DATE, end_date DATE,
+            status TEXT, priority TEXT, effort INTEGER, progress INTEGER
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS risks (
+            id SERIAL PRIMARY KEY,
+            project_id INTEGER REFERENCES projects(id),
+            description TEXT, probability TEXT, impact TEXT,
+            mitigation_plan TEXT, owner TEXT, status TEXT DEFAULT 'Ativo'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS project_notes (
+            id SERIAL PRIMARY KEY,
+            project_id INTEGER REFERENCES projects(id),
+            category TEXT, description TEXT, link_url TEXT, created_at DATE
+        )
+        """,
+        "CREATE TABLE IF NOT EXISTS sponsors (name TEXT PRIMARY KEY)",
+        """
+        CREATE TABLE IF NOT EXISTS team_members (
+            id SERIAL PRIMARY KEY,
+            name TEXT, role TEXT, area TEXT, email TEXT, phone TEXT
+        )
+        """,
+    ]),
+    # Bancos antigos foram criados antes das colunas abaixo existirem
+    (2, "Colunas tardias em projects", [
+        _add_column("projects", "notes", "TEXT"),
+        _add_column("projects", "date_changes", "INTEGER DEFAULT 0"),
+        _add_column("projects", "archived", "INTEGER DEFAULT 0"),
+    ]),
+    (3, "Índices dos caminhos de acesso", [
+        "CREATE INDEX IF NOT EXISTS ix_tasks_project_status ON tasks (project_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_status ON tasks (status)",
+        "CREATE INDEX IF NOT EXISTS ix_risks_project ON risks (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_notes_project ON project_notes (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_notes_gaps ON project_notes (project_id) WHERE category LIKE '%Gap%'",
+        "CREATE INDEX IF NOT EXISTS ix_projects_archived ON projects (archived)",
+    ]),
+    (4, "View project_kpis", KPI_VIEWS_DDL),
+    # Antes rodava um count(*) a cada sessão (check_seed); agora uma vez por banco
+    (5, "Dados iniciais", [_seed]),
+    (6, "Snapshot project_health + triggers", [_health_table, _health_triggers]),
+    (7, "Busca textual (tsvector/GIN ou FTS5)", [_search_index]),
+    # Agenda: eventos que cruzam a janela visível (end >= início AND start < fim)
+    (8, "Índices por data da agenda", [
+        "CREATE INDEX IF NOT EXISTS ix_projects_archived_end ON projects (archived, end_date, start_date)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_end_date ON tasks (end_date)",
+    ]),
+    # Capacidade semanal de cada membro, na mesma unidade de tasks.effort
+    (9, "Capacidade da equipe", [
+        _add_column("team_members", "weekly_capacity", "INTEGER DEFAULT 40"),
+        "CREATE INDEX IF NOT EXISTS ix_tasks_owner ON tasks (owner)",
+    ]),
+    # Dependências término -> início entre tarefas (utils/schedule.py)
+    (10, "Dependências entre tarefas", [
+        """
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            id SERIAL PRIMARY KEY,
+            project_id INTEGER REFERENCES projects(id),
+            predecessor_id INTEGER REFERENCES tasks(id) ON DELETE CASCADE,
+            successor_id INTEGER REFERENCES tasks(id) ON DELETE CASCADE,
+            lag_days INTEGER DEFAULT 0,
+            UNIQUE (predecessor_id, successor_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_task_deps_project ON task_dependencies (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_task_deps_successor ON task_dependencies (successor_id)",
+    ]),
+    (11, "project_health com filtro por projeto nas subconsultas", [_kpi_pushdown]),
+    (12, "project_health com avanço sem arredondar (arredonda em logic)", [_kpi_exact_progress]),
+]
+
+def current_version(cursor):
+    cursor.execute("SELECT MAX(version) FROM schema_migrations")
+    row = cursor.fetchone()
+    return (row[0] or 0) if row else 0
+
+def run_migrations(conn, dialect="postgres"):
+    """
+    Aplica, em ordem, as migrações com versão maior que a registrada.
+    Retorna a lista de versões aplicadas (vazia se o banco já está em dia).
+    """
+    c = conn.cursor()
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT
+        )
+    """)
+    conn.commit()
+
+    latest = MIGRATIONS[-1][0]
+    if current_version(c) >= latest:
+        c.close()
+        return []
+
+    if dialect == "postgres":
+        # Lock vale até o commit; a versão é relida depois de obtê-lo
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (_LOCK_KEY,))
+
+    applied = []
+    try:
+        done = current_version(c)
+        for version, description, steps in MIGRATIONS:
+            if version <= done:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(c, dialect)
+                else:
+                    c.execute(_dialect(step, dialect))
+            c.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES ({0}, {0}, {0})".format(_ph(dialect)),
+                (version, description, datetime.now().isoformat(timespec="seconds")),
+            )
+            applied.append(version)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        c.close()
+    return applied
@@ -0,0 +1,206 @@
+# utils/schedule.py
+"""
+Dependências entre tarefas e caminho crítico (CPM).
+
+Arestas término -> início: a sucessora começa no dia seguinte ao término da
+predecessora (+ lag_days). A ordem topológica (Kahn) é O(V+E) e acusa ciclos.
+Passada para frente: início/término mais cedo, com tarefas abertas já
+vencidas empurradas para hoje (previsão). Passada para trás: término mais
+tarde pelo fim previsto do projeto, folga e caminho crítico.
+`Schedule.shift` propaga um deslize só pelos sucessores afetados.
+Internamente as datas são ordinais (int) para não criar Timestamps no laço.
+"""
+import heapq
+from collections import deque
+from datetime import date
+import numpy as np
+import pandas as pd
+from utils.logic import DONE_STATUSES, _to_dates
+
+_EPOCH = pd.Timestamp("1970-01-01")
+_EPOCH_ORD = _EPOCH.toordinal()
+
+class CycleError(ValueError):
+    """Dependências circulares; `cycle` = ids das tarefas do ciclo, em ordem"""
+    def __init__(self, cycle):
+        self.cycle = list(cycle)
+        super().__init__("Dependência circular entre as tarefas " + " → ".join(map(str, self.cycle)))
+
+def _ordinals(series, default):
+    days = (_to_dates(series) - _EPOCH).dt.days
+    return (days + _EPOCH_ORD).fillna(default).astype("int64").tolist()
+
+def _timestamps(ordinals):
+    return pd.to_datetime(np.asarray(ordinals, dtype="int64") - _EPOCH_ORD, unit="D")
+
+def _find_cycle(remaining, pred):
+    """Nós que sobraram no Kahn sempre têm predecessor que também sobrou: anda para trás até repetir"""
+    node, seen = next(iter(remaining)), {}
+    path = []
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = next(p for p, _ in pred[node] if p in remaining)
+    return list(reversed(path[seen[node]:]))
+
+def topological_order(succ, pred):
+    """Kahn: ordem dos nós 0..n-1 (succ/pred = listas de (nó, lag)). CycleError com os índices do ciclo"""
+    n = len(succ)
+    indeg = [len(p) for p in pred]
+    queue = deque(i for i in range(n) if indeg[i] == 0)
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for j, _ in succ[i]:
+            indeg[j] -= 1
+            if indeg[j] == 0:
+                queue.append(j)
+    if len(order) < n:
+        raise CycleError(_find_cycle({i for i in range(n) if indeg[i] > 0}, pred))
+    return order
+
+def creates_cycle(deps_df, predecessor_id, successor_id):
+    """True se a aresta predecessor -> successor fecharia um ciclo (successor já alcança predecessor)"""
+    if predecessor_id == successor_id:
+        return True
+    adj = {}
+    for p, s in zip(deps_df['predecessor_id'].tolist(), deps_df['successor_id'].tolist()):
+        adj.setdefault(p, []).append(s)
+    stack, seen = [successor_id], {successor_id}
+    while stack:
+        node = stack.pop()
+        for nxt in adj.get(node, ()):
+            if nxt == predecessor_id:
+                return True
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return False
+
+class Schedule:
+    """
+    CPM sobre tarefas (id, project_id, start_date, end_date, status) e
+    dependências (predecessor_id, successor_id, lag_days). Arestas para
+    tarefas fora de `tasks_df` são ignoradas. Levanta CycleError (ids).
+    """
+    def __init__(self, tasks_df, deps_df, today=None):
+        self.today = (today or date.today()).toordinal()
+        self.ids = tasks_df['id'].astype("int64").tolist()
+        self.index = {tid: i for i, tid in enumerate(self.ids)}
+        self.project = tasks_df['project_id'].tolist()
+        start = _ordinals(tasks_df['start_date'].fillna(tasks_df['end_date']), self.today)
+        end = _ordinals(tasks_df['end_date'].fillna(tasks_df['start_date']), self.today)
+        self.start = start
+        self.duration = [max(1, e - s + 1) for s, e in zip(start, end)]
+        self.done = tasks_df['status'].isin(DONE_STATUSES).tolist()
+
+        n = len(self.ids)
+        self.succ = [[] for _ in range(n)]
+        self.pred = [[] for _ in range(n)]
+        if deps_df is not None and not deps_df.empty:
+            ids = pd.Series(range(n), index=self.ids)
+            p = deps_df['predecessor_id'].map(ids)
+            s = deps_df['successor_id'].map(ids)
+            lag = pd.to_numeric(deps_df.get('lag_days', 0), errors='coerce')
+            lag = pd.Series(0, index=deps_df.index) if np.isscalar(lag) else lag.fillna(0)
+            ok = p.notna() & s.notna()
+            for a, b, l in zip(p[ok].astype("int64").tolist(), s[ok].astype("int64").tolist(), lag[ok].astype("int64").tolist()):
+                self.succ[a].append((b, l))
+                self.pred[b].append((a, l))
+        try:
+            self.order = topological_order(self.succ, self.pred)
+        except CycleError as e:
+            raise CycleError([self.ids[i] for i in e.cycle]) from None
+        self.pos = [0] * n
+        for k, i in enumerate(self.order):
+            self.pos[i] = k
+
+        self.es = [0] * n
+        self.ef = [0] * n
+        self.lf = [0] * n
+        for i in self.order:
+            self._relax(i)
+        self._backward(None)
+
+    def _relax(self, i):
+        """Início/término mais cedo de um nó a partir dos predecessores"""
+        if self.done[i]:
+            es = self.start[i]
+            ef = es + self.duration[i] - 1
+        else:
+            es = self.start[i]
+            for p, lag in self.pred[i]:
+                es = max(es, self.ef[p] + 1 + lag)
+            ef = es + self.duration[i] - 1
+            # Aberta e vencida: no mínimo termina hoje
+            ef = max(ef, self.today)
+        self.es[i], self.ef[i] = es, ef
+
+    def _backward(self, projects):
+        """Término mais tarde (fim previsto do projeto como limite). `projects=None` = todos"""
+        finish = {}
+        for i, pid in enumerate(self.project):
+            if projects is None or pid in projects:
+                finish[pid] = max(finish.get(pid, self.ef[i]), self.ef[i])
+        for i in reversed(self.order):
+            pid = self.project[i]
+            if pid not in finish:
+                continue
+            lf = finish[pid]
+            for s, lag in self.succ[i]:
+                if not self.done[s]:
+                    lf = min(lf, self.lf[s] - self.duration[s] - lag)
+            self.lf[i] = lf
+
+    def shift(self, task_id, start=None, end=None):
+        """
+        Altera as datas planejadas de uma tarefa e propaga só pelos sucessores
+        cujo início/término muda (fila por posição topológica). Retorna os ids
+        das tarefas com datas previstas alteradas.
+        """
+        i = self.index[task_id]
+        s = self.start[i] if start is None else pd.Timestamp(start).toordinal()
+        e = (self.start[i] + self.duration[i] - 1) if end is None else pd.Timestamp(end).toordinal()
+        self.start[i], self.duration[i] = s, max(1, e - s + 1)
+        heap, queued, changed = [(self.pos[i], i)], {i}, []
+        while heap:
+            _, k = heapq.heappop(heap)
+            old = (self.es[k], self.ef[k])
+            self._relax(k)
+            if (self.es[k], self.ef[k]) == old:
+                continue
+            changed.append(k)
+            for nxt, _ in self.succ[k]:
+                if nxt not in queued:
+                    queued.add(nxt)
+                    heapq.heappush(heap, (self.pos[nxt], nxt))
+        self._backward({self.project[k] for k in changed} | {self.project[i]})
+        return [self.ids[k] for k in changed]
+
+    def frame(self):
+        """DataFrame por id: es, ef, ls, lf (Timestamps), slack (dias), critical, projected_end"""
+        es, ef, lf = np.array(self.es), np.array(self.ef), np.array(self.lf)
+        dur = np.array(self.duration)
+        slack = lf - ef
+        return pd.DataFrame({
+            'project_id': self.project,
+            'es': _timestamps(es), 'ef': _timestamps(ef),
+            'ls': _timestamps(lf - dur + 1), 'lf': _timestamps(lf),
+            'slack': slack,
+            'critical': (slack <= 0) & ~np.array(self.done, dtype=bool),
+            'projected_end': _timestamps(ef),
+        }, index=pd.Index(self.ids, name='id'))
+
+    def project_finish(self):
+        """Término previsto por projeto (maior término mais cedo das tarefas)"""
+        if not self.ids:
+            return pd.Series(dtype='datetime64[ns]')
+        finish = pd.Series(self.ef, index=self.project).groupby(level=0).max()
+        return pd.Series(_timestamps(finish.to_numpy()), index=finish.index)
+
+    def critical_path(self, project_id):
+        """Ids das tarefas críticas (folga zero, abertas) do projeto, por início mais cedo"""
+        nodes = [i for i in self.order if self.project[i] == project_id
+                 and not self.done[i] and self.lf[i] - self.ef[i] <= 0]
+        return [self.ids[i] for i in sorted(nodes, key=lambda i: (self.es[i], self.pos[i]))]
@@ -0,0 +1,165 @@
+# utils/sql.py
+"""
+Tradução de placeholders e registro de statements preparados.
+
+O app escreve SQL com '?' (estilo SQLite) ou '%s'. `translate` faz a
+conversão uma única vez por texto (cache LRU), respeitando strings,
+identificadores entre aspas, comentários e blocos $$...$$, ou seja, um '?'
+dentro de um literal não é mais trocado. No Postgres também gera a versão
+numerada ($1, $2...) usada no PREPARE.
+"""
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import NamedTuple
+
+_DOLLAR_TAG = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)?\$")
+
+class Statement(NamedTuple):
+    text: str       # SQL pronto para o driver (%s no Postgres, ? no SQLite)
+    numbered: str   # SQL com $1..$n (para PREPARE); igual a text no SQLite
+    nparams: int
+    name: str       # nome estável para PREPARE
+
+@lru_cache(maxsize=1024)
+def translate(query, dialect="postgres", escape_percent=True):
+    """
+    Converte os placeholders de `query` para o dialeto.
+    `escape_percent`: no Postgres com parâmetros o psycopg2 interpreta '%',
+    então '%' literais viram '%%' no texto do driver.
+    """
+    pg = dialect == "postgres"
+    out, numbered = [], []
+    n = 0
+    i, size = 0, len(query)
+
+    def emit(chunk, literal=False):
+        out.append(chunk.replace("%", "%%") if (pg and escape_percent and literal) else chunk)
+        numbered.append(chunk)
+
+    while i < size:
+        ch = query[i]
+        nxt = query[i + 1] if i + 1 < size else ""
+        if ch == "'":
+            # String: '' é aspas escapada
+            j = i + 1
+            while j < size:
+                if query[j] == "'":
+                    if j + 1 < size and query[j + 1] == "'":
+                        j += 2
+                        continue
+                    break
+                j += 1
+            emit(query[i:j + 1], literal=True)
+            i = j + 1
+        elif ch == '"':
+            j = query.find('"', i + 1)
+            j = size - 1 if j < 0 else j
+            emit(query[i:j + 1], literal=True)
+            i = j + 1
+        elif ch == "-" and nxt == "-":
+            j = query.find("\n", i)
+            j = size if j < 0 else j
+            emit(query[i:j], literal=True)
+            i = j
+        elif ch == "/" and nxt == "*":
+            j = query.find("*/", i + 2)
+            j = size if j < 0 else j + 2
+            emit(query[i:j], literal=True)
+            i = j
+        elif ch == "$" and pg and _DOLLAR_TAG.match(query, i):
+            tag = _DOLLAR_TAG.match(query, i).group(0)
+            j = query.find(tag, i + len(tag))
+            j = size if j < 0 else j + len(tag)
+            emit(query[i:j], literal=True)
+            i = j
+        elif ch == "?" or (ch == "%" and nxt == "s"):
+            n += 1
+            out.append("%s" if pg else "?")
+            numbered.append(f"${n}" if pg else "?")
+            i += 1 if ch == "?" else 2
+        elif ch == "%" and nxt == "%":
+            # Já escapado pelo autor: mantém para o driver, vira '%' no PREPARE
+            out.append("%%" if (pg and escape_percent) else "%")
+            numbered.append("%")
+            i += 2
+        else:
+            emit(ch, literal=(ch == "%"))
+            i += 1
+
+    text, num = "".join(out), "".join(numbered)
+    name = "s_" + hashlib.md5(num.encode("utf-8")).hexdigest()[:16]
+    return Statement(text, num if pg else text, n, name)
+
+class StatementRegistry:
+    """
+    Decide quando preparar um statement no servidor (Postgres).
+    Depois de `threshold` execuções no processo, o statement é preparado em
+    cada conexão do pool na primeira vez que ela o executa; as próximas
+    execuções viram EXECUTE nome(...), sem parse/planejamento.
+    `threshold=0` desliga (necessário atrás de pgbouncer em modo transação).
+    Se um EXECUTE acusa statement inexistente no backend (`forget`), a
+    preparação é desligada no processo: o pooler está trocando de backend.
+    """
+    MAX_PER_CONNECTION = 256
+
+    def __init__(self, threshold=5):
+        self.threshold = threshold
+        self._counts = {}
+        self._broken = set()
+        self._lock = threading.Lock()
+        self.prepares = 0
+        self.executes = 0
+        self.lost = 0
+
+    def execute_sql(self, conn, cursor, stmt):
+        """
+        Devolve o SQL a executar com os mesmos parâmetros: 'EXECUTE nome(...)'
+        se o statement estiver (ou puder ser) preparado nesta conexão, senão
+        o próprio texto traduzido.
+        """
+        if self.threshold <= 0:
+            return stmt.text
+        prepared = getattr(conn, "prepared", None)
+        if prepared is None:
+            return stmt.text
+        with self._lock:
+            count = self._counts.get(stmt.name, 0) + 1
+            self._counts[stmt.name] = count
+            hot = count >= self.threshold and stmt.name not in self._broken
+        if stmt.name not in prepared:
+            if not hot or len(prepared) >= self.MAX_PER_CONNECTION:
+                return stmt.text
+            try:
+                cursor.execute(f"PREPARE {stmt.name} AS {stmt.numbered}")
+                conn.commit()
+            except Exception:
+                # Tipo não inferível, DDL etc: nunca mais tenta este statement
+                conn.rollback()
+                with self._lock:
+                    self._broken.add(stmt.name)
+                return stmt.text
+            prepared.add(stmt.name)
+            with self._lock:
+                self.prepares += 1
+        with self._lock:
+            self.executes += 1
+        if stmt.nparams:
+            return f"EXECUTE {stmt.name} ({', '.join(['%s'] * stmt.nparams)})"
+        return f"EXECUTE {stmt.name}"
+
+    def forget(self, conn, stmt):
+        """O backend não conhece `stmt`: tira da conexão e para de preparar"""
+        prepared = getattr(conn, "prepared", None)
+        if prepared is not None:
+            prepared.discard(stmt.name)
+        with self._lock:
+            self.lost += 1
+            self.threshold = 0
+
+    def stats(self):
+        with self._lock:
+            return {"threshold": self.threshold, "statements": len(self._counts),
+                    "prepares": self.prepares, "prepared_executes": self.executes,
+                    "unpreparable": len(self._broken), "lost": self.lost}
@@ -1,96 +1,29 @@
 # utils/styles.py
+import hashlib
+import os
+from functools import lru_cache
 import streamlit as st
 
-def apply_magalog_style():
-    # Cores
-    PRIMARY_COLOR = "#0B2D5C"
-    SECONDARY_COLOR = "#00B7C2"
-    BG_COLOR = "#F5F7FA"
-    CARD_BG = "#FFFFFF"
-    
-    css = f"""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-        
-        html, body, [class*="css"] {{
-            font-family: 'Inter', sans-serif;
-            background-color: {BG_COLOR};
-            color: #2E2E2E;
-        }}
-        
-        /* =============================================
-           BARRA LATERAL (SIDEBAR)
-           ============================================= */
-        section[data-testid="stSidebar"] {{
-            background-color: {PRIMARY_COLOR};
-            border-right: 1px solid #E5E7EB;
-        }}
-
-        /* FORÇA BRUTA: Tudo na sidebar fica branco */
-        section[data-testid="stSidebar"] * {{
-            color: #FFFFFF !important;
-        }}
-        
-        /* Correção específica para o Menu de Navegação (Radio) */
-        section[data-testid="stSidebar"] .stRadio label p {{
-            font-size: 16px !important;
-            font-weight: 500 !important;
-        }}
-
-        /* Títulos na Sidebar em Ciano */
-        section[data-testid="stSidebar"] h1, 
-        section[data-testid="stSidebar"] h2, 
-        section[data-testid="stSidebar"] h3 {{
-            color: {SECONDARY_COLOR} !important;
-        }}
+# O tema fica em app/static/magalog.css. Com server.enableStaticServing
+# (.streamlit/config.toml) o navegador baixa e guarda o arquivo uma vez e cada
+# rerun só envia um <link>; sem static serving o CSS é lido do disco uma vez
+# por processo e injetado inline.
+CSS_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'static', 'magalog.css')
+CSS_URL = "app/static/magalog.css"
 
-        /* =============================================
-           ÁREA PRINCIPAL (MAIN)
-           ============================================= */
-        
-        /* Garante que os textos da área principal NÃO sejam afetados pela sidebar */
-        .main p, .main span, .main label, .main div {{
-            color: #2E2E2E;
-        }}
+@lru_cache(maxsize=1)
+def _stylesheet():
+    """(conteúdo, versão) do CSS; a versão (hash) invalida o cache do navegador quando o arquivo muda"""
+    with open(CSS_PATH, encoding="utf-8") as f:
+        css = f.read()
+    return css, hashlib.md5(css.encode("utf-8")).hexdigest()[:8]
 
-        /* Filtros e Inputs (Selectbox, DateInput, etc) */
-        .stSelectbox label, .stDateInput label, .stTextInput label {{
-            color: {PRIMARY_COLOR} !important;
-            font-weight: 600;
-        }}
-        
-        /* Topbar decoration */
-        .stAppHeader {{
-            background-color: {CARD_BG};
-            border-bottom: 1px solid #E5E7EB;
-        }}
-
-        /* Cards */
-        .magalog-card {{
-            background-color: {CARD_BG};
-            padding: 20px;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-            margin-bottom: 20px;
-            border-left: 5px solid {SECONDARY_COLOR};
-        }}
-        
-        /* KPIs */
-        div[data-testid="metric-container"] {{
-            background-color: {CARD_BG};
-            padding: 15px;
-            border-radius: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            border: 1px solid #E5E7EB;
-        }}
-        
-        /* Títulos Principais */
-        .main h1, .main h2, .main h3 {{
-            color: {PRIMARY_COLOR} !important;
-        }}
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
+def apply_magalog_style():
+    css, version = _stylesheet()
+    if st.get_option("server.enableStaticServing"):
+        st.markdown(f'<link rel="stylesheet" href="{CSS_URL}?v={version}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 # utils/styles.py (Apenas a parte final)
 